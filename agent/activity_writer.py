@@ -0,0 +1,163 @@
+"""
+Buffered, background-flushed activity_log writer.
+
+Activity rows are queued in memory and written by a daemon thread as
+multi-row inserts, so logging no longer adds a database round-trip to the
+send path.  The buffer is bounded: when it fills up, the caller flushes
+inline (backpressure) instead of growing without limit or dropping rows.
+
+Rows still buffered at shutdown are written by `close()`, which is
+registered with atexit when the writer starts.  `install_sigterm_exit()`
+turns SIGTERM (pm2 stop, GitHub Actions cancel) into a normal interpreter
+exit so the atexit flush runs there too.
+
+The writer is pure Python and has no Supabase dependency: the agent wires
+in the insert callable.
+"""
+
+import atexit
+import signal
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_MAX_BUFFERED = 5000
+# Failed batches are retried on the next flush, at most this many times
+MAX_INSERT_ATTEMPTS = 3
+
+
+class ActivityWriter:
+    """Queue activity rows and insert them in batches from a background thread.
+
+    Args:
+        insert: Callable taking a list of row dicts and inserting them in one
+            call (e.g. `supabase.table('activity_log').insert(rows).execute()`).
+        flush_interval: Seconds between background flushes.
+        batch_size: Max rows per insert call.
+        max_buffered: Max rows held in memory; reaching it flushes inline.
+        on_error: Called with (exception, rows) when an insert fails.
+    """
+
+    def __init__(self, insert: Callable[[List[Dict]], None],
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_buffered: int = DEFAULT_MAX_BUFFERED,
+                 on_error: Optional[Callable[[Exception, List[Dict]], None]] = None):
+        self._insert = insert
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.max_buffered = max(self.batch_size, max_buffered)
+        self._on_error = on_error
+        # (failed attempts so far, row) pairs
+        self._buffer: List[Tuple[int, Dict]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def log(self, row: Dict):
+        """Queue one row. `created_at` is stamped now unless already set."""
+        self.log_many([row])
+
+    def log_many(self, rows: List[Dict]):
+        """Queue several rows, flushing inline if the buffer is full."""
+        if not rows:
+            return
+        now_iso = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            for row in rows:
+                self._buffer.append((0, {'created_at': now_iso, **row}))
+            full = len(self._buffer) >= self.max_buffered
+        if self._thread is None:
+            self.start()
+        if full:
+            self.flush()
+        elif len(self) >= self.batch_size:
+            self._wake.set()
+
+    def start(self):
+        """Start the background flush thread and register the exit flush."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='activity-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything buffered so far. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._buffer = self._buffer, []
+            written = 0
+            failed: List[Tuple[int, Dict]] = []
+            for start in range(0, len(pending), self.batch_size):
+                entries = pending[start:start + self.batch_size]
+                batch = [row for _, row in entries]
+                try:
+                    self._insert(batch)
+                    written += len(batch)
+                except Exception as e:
+                    if self._on_error:
+                        self._on_error(e, batch)
+                    failed.extend((attempts + 1, row) for attempts, row in entries)
+            self.written += written
+            self._requeue(failed)
+            return written
+
+    def _requeue(self, entries: List[Tuple[int, Dict]]):
+        """Put failed rows back at the front, dropping ones out of attempts."""
+        retry = [entry for entry in entries if entry[0] < MAX_INSERT_ATTEMPTS]
+        self.dropped += len(entries) - len(retry)
+        with self._lock:
+            room = max(0, self.max_buffered - len(self._buffer))
+            self.dropped += max(0, len(retry) - room)
+            self._buffer[:0] = retry[:room]
+
+    def close(self, timeout: float = 10.0):
+        """Stop the background thread and write any remaining rows."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout)
+            try:
+                atexit.unregister(self.close)
+            except Exception:
+                pass
+        # Failed rows get their remaining attempts now rather than being lost
+        for _ in range(MAX_INSERT_ATTEMPTS):
+            if not len(self):
+                break
+            self.flush()
+
+
+def install_sigterm_exit():
+    """Make SIGTERM exit through SystemExit so atexit flushes still run.
+
+    Only installs when called from the main thread and SIGTERM still has its
+    default handler, so an embedding process keeps its own handling.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    if signal.getsignal(signal.SIGTERM) is not signal.SIG_DFL:
+        return
+
+    def _exit(signum, frame):
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, _exit)
@@ -0,0 +1,77 @@
+"""
+Deadline-aware admission control for the autonomous run.
+
+Work used to be checked against the run's hard deadline only between
+units, so a lead's verification + generation + send, a follow-up or a
+reply-check pass could start seconds before the GitHub Actions kill and
+die half way — after Gmail accepted a message but before its outreach_log
+row was written.
+
+`AdmissionControl.admit(*phases, deadline=...)` estimates a unit's cost as
+the sum of its phases' rolling p95 latencies (a conservative default until
+a phase has MIN_PHASE_SAMPLES samples) and refuses it unless it would
+finish, plus a safety margin, before the deadline.  The first refusal
+marks the controller `draining`: the run stops starting new work and
+winds down (flushing logs, final heartbeat) while it still can.
+
+Pure Python with no Supabase dependency.
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+from latency import (FOLLOWUP_PHASE, REPLY_CHECK_PHASE, SEND_PHASE, SETUP_PHASE,
+                     LatencyStats)
+
+# Headroom kept between the estimated finish and the deadline
+DEADLINE_SAFETY_SECONDS = 60
+# Below this many samples a phase is costed at its default
+MIN_PHASE_SAMPLES = 5
+# Conservative per-phase costs used until there are enough samples
+DEFAULT_PHASE_SECONDS = {
+    SETUP_PHASE: 30,
+    SEND_PHASE: 120,
+    FOLLOWUP_PHASE: 60,
+    REPLY_CHECK_PHASE: 180,
+}
+UNKNOWN_PHASE_SECONDS = 120
+
+
+class AdmissionControl:
+    """Refuse units of work whose p95 cost would overrun the deadline."""
+
+    def __init__(self, stats: LatencyStats, margin: float = DEADLINE_SAFETY_SECONDS,
+                 defaults: Optional[Dict[str, float]] = None,
+                 now: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self.stats = stats
+        self.margin = margin
+        self.defaults = dict(DEFAULT_PHASE_SECONDS, **(defaults or {}))
+        self._now = now
+        self.draining = False
+        self.refused = 0
+        self.last_refusal: Optional[str] = None
+
+    def estimate(self, *phases: str) -> float:
+        """Seconds the phases are expected to take (sum of p95s or defaults)."""
+        total = 0.0
+        for phase in phases:
+            default = self.defaults.get(phase, UNKNOWN_PHASE_SECONDS)
+            if self.stats.count(phase) < MIN_PHASE_SAMPLES:
+                total += default
+            else:
+                total += self.stats.p95(phase, default)
+        return total
+
+    def admit(self, *phases: str, deadline: Optional[datetime] = None) -> bool:
+        """True if the phases can finish before deadline (always True without one)."""
+        if deadline is None:
+            return True
+        seconds_left = (deadline - self._now()).total_seconds()
+        cost = self.estimate(*phases)
+        if cost + self.margin <= seconds_left:
+            return True
+        self.refused += 1
+        self.draining = True
+        self.last_refusal = (f"{' + '.join(phases)} needs ~{cost:.0f}s + {self.margin:.0f}s margin, "
+                             f"{max(0.0, seconds_left):.0f}s left")
+        return False
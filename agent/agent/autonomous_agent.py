@@ -16,6 +16,17 @@ from supabase import create_client, Client
 from dotenv import load_dotenv
 import logging
 
+# Shared helpers live one level up in agent/; fall back to direct inserts
+# when this file is deployed on its own.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from activity_writer import ActivityWriter, install_sigterm_exit
+    from heartbeat import Heartbeat
+except ImportError:
+    ActivityWriter = None
+    install_sigterm_exit = None
+    Heartbeat = None
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -49,12 +60,22 @@ class AutonomousSDRAgent:
         self.running = False
         self.heartbeat_interval = 60  # seconds
         self.last_heartbeat = None
+        self.activity_writer = ActivityWriter(
+            lambda rows: supabase.table('activity_log').insert(rows).execute(),
+            on_error=lambda e, rows: logger.error(f"❌ Failed to log {len(rows)} activities: {e}"),
+        ) if ActivityWriter else None
+        self.heartbeat = Heartbeat(
+            self.publish_heartbeat,
+            interval=self.heartbeat_interval,
+            on_error=lambda e: logger.error(f"❌ Heartbeat failed: {e}"),
+        ) if Heartbeat else None
+        self.heartbeat_status_column = True
         
     def log_activity(self, activity_type: str, lead_id: str = None, contact_id: str = None,
                      email_id: str = None, summary: str = "", details: dict = None, status: str = "success"):
-        """Log activity to Supabase"""
+        """Log activity to Supabase (buffered when activity_writer is available)"""
         try:
-            supabase.table('activity_log').insert({
+            row = {
                 'activity_type': activity_type,
                 'lead_id': lead_id,
                 'contact_id': contact_id,
@@ -62,7 +83,11 @@ class AutonomousSDRAgent:
                 'summary': summary,
                 'details': details or {},
                 'status': status
-            }).execute()
+            }
+            if self.activity_writer:
+                self.activity_writer.log(row)
+            else:
+                supabase.table('activity_log').insert(row).execute()
             logger.info(f"✅ {summary}")
         except Exception as e:
             logger.error(f"❌ Failed to log activity: {e}")
@@ -77,6 +102,28 @@ class AutonomousSDRAgent:
             logger.debug("💓 Heartbeat sent")
         except Exception as e:
             logger.error(f"❌ Heartbeat failed: {e}")
+
+    def publish_heartbeat(self, beat_iso: str, status: dict):
+        """Heartbeat thread callback: last_heartbeat plus agent_status snapshot"""
+        row = {'last_heartbeat': beat_iso}
+        if self.heartbeat_status_column:
+            row['agent_status'] = status
+        try:
+            supabase.table('agent_settings').update(row).eq(
+                'id', '00000000-0000-0000-0000-000000000001').execute()
+        except Exception as e:
+            # Only a missing agent_status column (PGRST204 / 42703) disables it;
+            # transient errors are retried by the next beat
+            text = str(e)
+            missing = 'agent_status' in text and any(
+                marker in text for marker in ('PGRST204', '42703', 'Could not find the', 'does not exist'))
+            if not self.heartbeat_status_column or not missing:
+                raise
+            # agent_status column not migrated yet
+            self.heartbeat_status_column = False
+            self.publish_heartbeat(beat_iso, status)
+        self.last_heartbeat = datetime.utcnow()
+        logger.debug("💓 Heartbeat sent")
     
     def load_settings(self) -> bool:
         """Load agent settings from Supabase"""
@@ -450,6 +497,8 @@ TONE: Conversational, direct, no fluff."""
             # Process each lead
             for lead in leads:
                 self.process_lead(lead)
+                if self.heartbeat:
+                    self.heartbeat.incr('leads_processed')
                 
                 # Check if we hit limits
                 if not self.can_send_more_emails():
@@ -457,6 +506,8 @@ TONE: Conversational, direct, no fluff."""
                     break
                 
                 # Pause between leads
+                if self.heartbeat:
+                    self.heartbeat.update(phase='waiting_between_leads')
                 time.sleep(self.settings.get('min_minutes_between_emails', 15) * 60)
         
         except Exception as e:
@@ -469,6 +520,9 @@ TONE: Conversational, direct, no fluff."""
         logger.info(f"📍 Using contacts DB: {CONTACTS_CSV_PATH}")
         
         cycle_count = 0
+        if self.heartbeat:
+            self.heartbeat.update(phase='starting', loop_count=0, leads_processed=0)
+            self.heartbeat.start()
         
         while self.running:
             try:
@@ -477,13 +531,18 @@ TONE: Conversational, direct, no fluff."""
                 logger.info(f"🔄 Cycle #{cycle_count} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
                 logger.info(f"{'#'*60}\n")
                 
-                # Send heartbeat
-                self.send_heartbeat()
+                # Send heartbeat (the heartbeat thread does this when available)
+                if self.heartbeat:
+                    self.heartbeat.update(phase='cycle', loop_count=cycle_count)
+                else:
+                    self.send_heartbeat()
                 
                 # Run processing cycle
                 self.run_cycle()
                 
                 # Wait before next cycle (5 minutes)
+                if self.heartbeat:
+                    self.heartbeat.update(phase='waiting')
                 logger.info(f"\n⏳ Waiting 5 minutes before next cycle...")
                 time.sleep(300)
                 
@@ -495,9 +554,15 @@ TONE: Conversational, direct, no fluff."""
                 logger.error(f"❌ Unexpected error in main loop: {e}")
                 time.sleep(60)  # Wait 1 minute before retry
         
+        if self.heartbeat:
+            self.heartbeat.stop(final_phase='stopped')
+        if self.activity_writer:
+            self.activity_writer.close()
         logger.info("👋 AI SDR Agent stopped")
 
 def main():
+    if install_sigterm_exit:
+        install_sigterm_exit()
     agent = AutonomousSDRAgent()
     agent.run()
 
@@ -24,15 +24,37 @@ import time
 import random
 import re
 import base64
+import signal
+import threading
 import urllib.request
 import urllib.parse
 import urllib.error
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional
-from supabase import create_client, Client
-from anthropic import Anthropic
+from typing import Callable, Dict, Iterator, List, Optional
 from dotenv import load_dotenv
 
+from followup_due import FOLLOWUP_1_DELAY_DAYS, FOLLOWUP_2_DELAY_DAYS, compute_due_followups
+from suppression_index import SuppressionIndex
+from activity_writer import ActivityWriter, install_sigterm_exit
+from heartbeat import Heartbeat
+from settings_watcher import SettingsWatcher
+from work_queue import (CONTACTED_LEAD, CONTACTED_PROSPECT, ENRICHED_LEAD, FOLLOWUP, PROSPECT,
+                        WorkQueue, resolve_priorities)
+from recipient_tz import infer_timezone
+from send_scheduler import Scheduler, SendWindow, is_within_send_window, next_send_window_start, next_utc_midnight, send_tz
+from latency import FOLLOWUP_PHASE, REPLY_CHECK_PHASE, SEND_PHASE, SETUP_PHASE, LatencyStats
+from spans import (APOLLO_VERIFY_SPAN, BOUNCE_SCAN_SPAN, CONTACT_LOOKUP_SPAN, DB_WRITE_SPAN, ELV_VERIFY_SPAN,
+                   FOLLOWUP_SCAN_SPAN, GMAIL_SEND_SPAN, HEADER_FETCH_SPAN, LLM_SPAN, REPLY_SCAN_SPAN,
+                   SpanHistograms)
+from batch_sizer import BatchSizer
+from admission import AdmissionControl
+from outbox import Outbox
+from leases import LeaseManager
+from fair_share import FairShare
+from checkpoint import RunCheckpoint
+from backend import create_supabase_backend
+from control_server import DEFAULT_CONTROL_PORT, ControlServer
+
 load_dotenv()
 
 # Configuration
@@ -45,22 +67,83 @@ GMAIL_FROM_EMAIL = os.getenv("GMAIL_FROM_EMAIL")
 ELV_API_KEY = os.getenv("EMAILLISTVERIFY_API_KEY")
 ORG_ID = os.getenv("ORG_ID")
 
-# Initialize clients (defer crash to runtime with clear error messages)
-try:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-except Exception as _init_err:
-    print(f"❌ Supabase init failed (check SUPABASE_URL and SUPABASE_SERVICE_KEY): {_init_err}")
-    raise SystemExit(1)
+# External API endpoints; point them at local stand-ins (agent/standins.py) for load tests
+GMAIL_API_BASE = os.getenv("GMAIL_API_BASE", "https://gmail.googleapis.com").rstrip('/')
+GOOGLE_TOKEN_URL = os.getenv("GOOGLE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+APOLLO_API_BASE = os.getenv("APOLLO_API_BASE", "https://api.apollo.io").rstrip('/')
+ELV_API_BASE = os.getenv("ELV_API_BASE", "https://apps.emaillistverify.com").rstrip('/')
+
+
+class LazyClient:
+    """Builds a client on first attribute access.
+
+    The supabase and anthropic SDKs take most of a second or two to import
+    and construct. Behind this stand-in, importing the module, `status`
+    before its first query and `verify-gmail` don't pay for a client they
+    never use, and tools and tests can import the module without
+    credentials. Call sites keep using `supabase.table(...)` unchanged.
+    """
+
+    def __init__(self, factory: Callable[[], object]):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return getattr(self._client, name)
+
+
+def _create_supabase():
+    try:
+        return create_supabase_backend(SUPABASE_URL, SUPABASE_KEY)
+    except Exception as e:
+        raise RuntimeError(f"Supabase init failed (check SUPABASE_URL and SUPABASE_SERVICE_KEY): {e}") from e
+
+
+def _create_anthropic():
+    from anthropic import Anthropic
+    try:
+        return Anthropic(api_key=ANTHROPIC_API_KEY)
+    except Exception as e:
+        raise RuntimeError(f"Anthropic init failed (check ANTHROPIC_API_KEY): {e}") from e
+
 
-try:
-    anthropic_client = Anthropic(api_key=ANTHROPIC_API_KEY)
-except Exception as _init_err:
-    print(f"❌ Anthropic init failed (check ANTHROPIC_API_KEY): {_init_err}")
-    raise SystemExit(1)
+# Created on first use (see LazyClient); a config error surfaces there.
+# Benchmarks and tests swap in backend.InMemoryBackend (same query API).
+supabase = LazyClient(_create_supabase)
+anthropic_client = LazyClient(_create_anthropic)
+
+# Whole-run timing histograms (spans.py), process-wide like the clients above;
+# reported at the end of a run and written to agent_metrics
+spans = SpanHistograms()
 
 # GitHub Actions timeout buffer — stop 10 min before the hard limit
 GH_ACTIONS_TIMEOUT_MINUTES = 350
 
+# run_autonomous: reply scan cadence, and how long to wait before looking for
+# new leads again when a batch found nothing to send
+REPLY_CHECK_INTERVAL_MINUTES = 30
+IDLE_RECHECK_MINUTES = 5
+# Max time between follow-up passes (the next due time usually comes sooner)
+FOLLOWUP_RECHECK_MINUTES = 30
+# Candidate leads/prospects fetched per stage when recipient timezone lanes are
+# on, so recipients in open windows can fill the batch while others wait
+LANE_CANDIDATE_LIMIT = 200
+# Resumed bounce scans re-read this far before the last completed scan
+BOUNCE_SCAN_OVERLAP_MINUTES = 60
+# Reply scans open only threads Gmail history says changed, but every thread
+# is re-checked at least this often (catches transient thread-check errors)
+REPLY_FULL_SCAN_HOURS = 24
+# `daemon`: localhost control port (0 = any free port) and optional bearer token,
+# and the wait before retrying a cycle that could not start (e.g. Gmail auth)
+DAEMON_CONTROL_PORT = int(os.getenv("SDR_CONTROL_PORT", str(DEFAULT_CONTROL_PORT)))
+DAEMON_CONTROL_TOKEN = os.getenv("SDR_CONTROL_TOKEN")
+DAEMON_RETRY_MINUTES = 5
+
 # Safe email statuses from EmailListVerify
 SAFE_STATUSES = ['ok', 'ok_for_all', 'accept_all']
 BAD_STATUSES = ['invalid', 'email_disabled', 'dead_server', 'syntax_error']
@@ -68,6 +151,136 @@ BAD_STATUSES = ['invalid', 'email_disabled', 'dead_server', 'syntax_error']
 # Verification is valid for 30 days
 VERIFICATION_MAX_AGE_DAYS = 30
 
+# Prospect pipeline values shown by `status`
+PROSPECT_STATUSES = ['new', 'enriching', 'enriched', 'qualified', 'contacted', 'engaged', 'disqualified']
+PROSPECT_STAGE_VALUES = [
+    ("crawl_status", ["pending", "crawled", "failed"]),
+    ("analysis_status", ["pending", "analyzed", "failed"]),
+    ("enrichment_status", ["pending", "ready_for_gold", "gold_enriched"]),
+]
+
+# Incremental outreach_log refreshes read rows past the newest created_at
+# seen (server-assigned; see supabase/add_outreach_log_created_at.sql),
+# re-reading this many seconds before it so rows from transactions that
+# committed slightly out of order are not missed. Re-reads are harmless:
+# the cached structures are sets.
+OUTREACH_WATERMARK_OVERLAP_SECONDS = 300
+
+# Write the end-of-run span histograms to agent_metrics (SDR_WRITE_METRICS=0 turns it off)
+WRITE_AGENT_METRICS = os.getenv("SDR_WRITE_METRICS", "1") != "0"
+
+# Local directory for caches that outlive a run (suppression indexes).
+SDR_CACHE_DIR = os.getenv("SDR_CACHE_DIR", ".sdr_cache")
+# agent_settings row of the single-org agent (the orchestrator uses one per org)
+AGENT_SETTINGS_ID = "00000000-0000-0000-0000-000000000001"
+# Post-send DB writes are queued here before a send is reported (see outbox.py)
+OUTBOX_PATH = os.path.join(SDR_CACHE_DIR, "outbox.sqlite3")
+
+# Suppression indexes are sized to 2x the current row count, never below this.
+SUPPRESSION_INDEX_MIN_CAPACITY = 100_000
+
+# Max values per in_() filter, keeps PostgREST query strings well under URL limits.
+IN_FILTER_CHUNK_SIZE = 100
+
+# Rows fetched per page by stream_rows(). Must not exceed the PostgREST
+# max-rows setting of the project (Supabase default: 1000), otherwise a
+# capped page looks like the last page and the stream ends early.
+SUPABASE_PAGE_SIZE = int(os.getenv("SUPABASE_PAGE_SIZE", "1000"))
+
+
+# ═══════════════════════════════════════════════════════════
+# PAGINATED READS
+# ═══════════════════════════════════════════════════════════
+
+def chunked(items: List, size: int = IN_FILTER_CHUNK_SIZE) -> Iterator[List]:
+    """Split `items` into lists of at most `size` (for in_() filters)."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def stream_rows(table: str, columns: str, filters: Callable = None,
+                key: str = 'id', page_size: int = None) -> Iterator[Dict]:
+    """Yield every row of `table` matching `filters`, one keyset page at a time.
+
+    Unranged selects are silently truncated at PostgREST's max-rows, so any
+    read that must see the whole table goes through here.  Pages are ordered
+    by `key` and each page starts after the last key of the previous one
+    (no OFFSET scans), so memory stays at one page regardless of table size.
+
+    Args:
+        table: Table name.
+        columns: Comma-separated select list. `key` is added if missing.
+        filters: Optional callable that takes a query builder and returns it
+            with extra filters applied (e.g. ``lambda q: q.eq('org_id', x)``).
+            It is re-applied to a fresh builder for every page.
+        key: Unique, sortable column used as the keyset cursor.
+        page_size: Rows per page (defaults to SUPABASE_PAGE_SIZE).
+    """
+    page_size = page_size or SUPABASE_PAGE_SIZE
+    selected = [c.strip() for c in columns.split(',')]
+    if key not in selected and '*' not in selected:
+        columns = f"{columns}, {key}"
+
+    last_key = None
+    while True:
+        query = supabase.table(table).select(columns)
+        if filters:
+            query = filters(query)
+        if last_key is not None:
+            query = query.gt(key, last_key)
+        rows = query.order(key).limit(page_size).execute().data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_key = rows[-1][key]
+
+
+# PostgREST / Postgres codes for a column that doesn't exist (not migrated yet)
+_MISSING_COLUMN_MARKERS = ('PGRST204', '42703', 'Could not find the', 'does not exist')
+
+
+def missing_column(error: Exception, column: str) -> bool:
+    """True if `error` says `column` doesn't exist, as opposed to a network or server error."""
+    text = str(error)
+    return column in text and any(marker in text for marker in _MISSING_COLUMN_MARKERS)
+
+
+# RPCs found missing (not migrated yet); their fallback query is used for the rest of the run
+_MISSING_RPCS = set()
+_MISSING_RPC_MARKERS = ('PGRST202', 'Could not find the function')
+
+
+def match_addresses(table: str, column: str, emails: List[str], rpc: str, params: Dict = None,
+                    filters: Callable = None) -> set:
+    """Lowercased addresses from `emails` stored in table.column, in any casing.
+
+    Goes through the `rpc` function, which compares lower(column) on an
+    expression index (supabase/add_case_insensitive_address_match.sql).
+    Until it is deployed, falls back to ilike() matches, filtered
+    client-side because `_` is a LIKE wildcard.
+    """
+    wanted = {e.strip().lower() for e in emails if e and e.strip()}
+    if not wanted:
+        return set()
+    if rpc not in _MISSING_RPCS:
+        try:
+            rows = supabase.rpc(rpc, dict(params or {}, p_emails=sorted(wanted))).execute().data or []
+            # SETOF TEXT comes back as bare strings or {rpc: value} rows
+            found = {(next(iter(r.values()), None) if isinstance(r, dict) else r) for r in rows}
+            return {e.lower() for e in found if e} & wanted
+        except Exception as e:
+            if not any(marker in str(e) for marker in _MISSING_RPC_MARKERS):
+                raise
+            _MISSING_RPCS.add(rpc)
+            print(f"  ⚠️ {rpc} RPC not deployed, matching {table}.{column} with ilike")
+    found = set()
+    for chunk in chunked(sorted(wanted)):
+        query = supabase.table(table).select(column).or_(','.join(f"{column}.ilike.{e}" for e in chunk))
+        if filters:
+            query = filters(query)
+        found.update(r[column].lower() for r in query.execute().data or [] if r.get(column))
+    return found & wanted
+
 
 def _save_verification(email: str, status: str):
     """Cache verification result on both contacts and contact_database tables."""
@@ -140,9 +353,9 @@ def verify_email(email: str, save_result: bool = True) -> Dict:
         return {'email': email, 'status': 'skipped', 'safe': True}
 
     try:
-        url = f"https://apps.emaillistverify.com/api/verifyEmail?secret={urllib.parse.quote(ELV_API_KEY)}&email={urllib.parse.quote(email)}&timeout=15"
+        url = f"{ELV_API_BASE}/api/verifyEmail?secret={urllib.parse.quote(ELV_API_KEY)}&email={urllib.parse.quote(email)}&timeout=15"
         req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=20) as resp:
+        with spans.span(ELV_VERIFY_SPAN), urllib.request.urlopen(req, timeout=20) as resp:
             status = resp.read().decode().strip().lower()
 
         print(f"    📧 Verify {email}: {status}")
@@ -275,14 +488,14 @@ def verify_via_apollo(email: str, first_name: str = None, last_name: str = None,
 
         req_data = json.dumps(payload).encode()
         req = urllib.request.Request(
-            'https://api.apollo.io/v1/people/match',
+            f'{APOLLO_API_BASE}/v1/people/match',
             data=req_data,
             method='POST',
         )
         req.add_header('Content-Type', 'application/json')
         req.add_header('x-api-key', APOLLO_API_KEY)
 
-        with urllib.request.urlopen(req, timeout=20) as resp:
+        with spans.span(APOLLO_VERIFY_SPAN), urllib.request.urlopen(req, timeout=20) as resp:
             data = json.loads(resp.read().decode())
 
         person = data.get('person') or {}
@@ -339,7 +552,7 @@ class GmailService:
             'grant_type': 'refresh_token',
         }).encode()
 
-        req = urllib.request.Request('https://oauth2.googleapis.com/token', data=data)
+        req = urllib.request.Request(GOOGLE_TOKEN_URL, data=data)
         req.add_header('Content-Type', 'application/x-www-form-urlencoded')
 
         with urllib.request.urlopen(req, timeout=30) as resp:
@@ -357,7 +570,7 @@ class GmailService:
         return self._access_token
 
     def _gmail_request(self, method, endpoint, body=None, retry=True):
-        url = f"https://gmail.googleapis.com/gmail/v1/users/me/{endpoint}"
+        url = f"{GMAIL_API_BASE}/gmail/v1/users/me/{endpoint}"
         token = self._get_token()
 
         req = urllib.request.Request(url, method=method)
@@ -430,6 +643,7 @@ class GmailService:
         }
 
 
+    @spans.timed(GMAIL_SEND_SPAN)
     def send_email(self, to: str, subject: str, body: str, bcc: List[str] = None, from_email: str = None, from_name: str = 'Sam Reid') -> Dict:
         lines = [
             f"From: {from_name} <{from_email or self.get_from_email()}>",
@@ -449,6 +663,7 @@ class GmailService:
 
         return self._gmail_request('POST', 'messages/send', {'raw': raw_b64})
 
+    @spans.timed(GMAIL_SEND_SPAN)
     def send_reply(self, to: str, subject: str, body: str, thread_id: str,
                    original_message_id: str, from_email: str = None, from_name: str = 'Sam Reid') -> Dict:
         """Send a reply that threads under the original email."""
@@ -473,6 +688,7 @@ class GmailService:
             'threadId': thread_id,
         })
 
+    @spans.timed(HEADER_FETCH_SPAN)
     def get_message_headers(self, message_id: str) -> Dict:
         """Get headers from a sent message (Message-ID, threadId, etc.)."""
         detail = self._gmail_request('GET', f"messages/{message_id}?format=metadata"
@@ -539,8 +755,41 @@ class GmailService:
         except Exception:
             return False
 
-    def check_bounces(self, days=7) -> List[str]:
-        query = urllib.parse.quote(f'from:mailer-daemon@googlemail.com newer_than:{days}d')
+    def history_id(self) -> Optional[str]:
+        """The mailbox's current history id (a cursor for history_threads())."""
+        return self._gmail_request('GET', 'profile').get('historyId')
+
+    def history_threads(self, start_history_id: str) -> Optional[set]:
+        """Thread ids that received a message since `start_history_id`.
+
+        Returns None when Gmail no longer has history that far back (404),
+        in which case the caller has to scan everything.
+        """
+        threads = set()
+        page_token = None
+        while True:
+            endpoint = f"history?startHistoryId={start_history_id}&historyTypes=messageAdded&maxResults=500"
+            if page_token:
+                endpoint += f"&pageToken={page_token}"
+            try:
+                data = self._gmail_request('GET', endpoint)
+            except urllib.error.HTTPError as e:
+                if e.code == 404:
+                    return None
+                raise
+            for record in data.get('history', []):
+                for added in record.get('messagesAdded', []):
+                    thread_id = added.get('message', {}).get('threadId')
+                    if thread_id:
+                        threads.add(thread_id)
+            page_token = data.get('nextPageToken')
+            if not page_token:
+                return threads
+
+    def check_bounces(self, days=7, since: Optional[datetime] = None) -> List[str]:
+        """Bounced addresses from the last `days` days, or only since `since` when given."""
+        window = f'after:{int(since.timestamp())}' if since else f'newer_than:{days}d'
+        query = urllib.parse.quote(f'from:mailer-daemon@googlemail.com {window}')
         search = self._gmail_request('GET', f'messages?q={query}&maxResults=50')
         messages = search.get('messages', [])
 
@@ -563,7 +812,7 @@ class GmailService:
 
                 for pattern in patterns:
                     for match in re.finditer(pattern, body_text, re.IGNORECASE):
-                        email = re.sub(r'[<>.,;\'\"()]', '', match.group(1)).lower()
+                        email = match.group(1).strip('<>.,;\'"()').lower()
                         if '@' in email and 'mailer-daemon' not in email and 'googlemail' not in email:
                             bounced_emails.append(email)
             except Exception as e:
@@ -653,13 +902,14 @@ Subject: [subject]
 
 [body]"""
 
-    response = anthropic_client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=500,
-        system=SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": prompt}],
-        timeout=30.0,
-    )
+    with spans.span(LLM_SPAN):
+        response = anthropic_client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=500,
+            system=SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": prompt}],
+            timeout=30.0,
+        )
 
     email_text = response.content[0].text
 
@@ -720,13 +970,14 @@ Subject: [subject]
 
 [body]"""
 
-    response = anthropic_client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=500,
-        system=SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": prompt}],
-        timeout=30.0,
-    )
+    with spans.span(LLM_SPAN):
+        response = anthropic_client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=500,
+            system=SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": prompt}],
+            timeout=30.0,
+        )
 
     email_text = response.content[0].text
 
@@ -855,13 +1106,14 @@ Requirements:
 Format:
 [body only, no subject line]"""
 
-    response = anthropic_client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=400,
-        system=system,
-        messages=[{"role": "user", "content": prompt}],
-        timeout=30.0,
-    )
+    with spans.span(LLM_SPAN):
+        response = anthropic_client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=400,
+            system=system,
+            messages=[{"role": "user", "content": prompt}],
+            timeout=30.0,
+        )
 
     body = response.content[0].text.strip()
 
@@ -897,9 +1149,10 @@ def score_contact(title: str) -> int:
 def find_best_contact(website: str) -> Optional[Dict]:
     domain = website.lower().replace('https://', '').replace('http://', '').replace('www.', '').rstrip('/')
 
-    result = supabase.table('contact_database').select('*').or_(
-        f"website.eq.{domain},website.eq.www.{domain},email_domain.eq.{domain}"
-    ).limit(50).execute()
+    with spans.span(CONTACT_LOOKUP_SPAN):
+        result = supabase.table('contact_database').select('*').or_(
+            f"website.eq.{domain},website.eq.www.{domain},email_domain.eq.{domain}"
+        ).limit(50).execute()
 
     contacts = result.data or []
     if not contacts:
@@ -920,11 +1173,105 @@ def find_best_contact(website: str) -> Optional[Dict]:
 # AI SDR AGENT
 # ═══════════════════════════════════════════════════════════
 
-class AISDRAgent:
+class AgentResources:
+    """Process-wide pieces shared by every AISDRAgent in one process.
+
+    A standalone agent creates its own; the multi-org orchestrator creates
+    one and hands it to each org's agent, so there is a single outbox
+    replay thread per SQLite file, one activity writer, one lease holder
+    id, shared latency samples and one copy of the org-independent
+    outreach cache.
+    """
 
     def __init__(self):
-        self.gmail = GmailService()
-        self._settings = None
+        self.activity = ActivityWriter(
+            spans.timed(DB_WRITE_SPAN)(lambda rows: supabase.table("activity_log").insert(rows).execute()),
+            on_error=lambda e, rows: print(f"  ⚠️ Log error ({len(rows)} rows): {e}"),
+        )
+        # Post-send writes; entries left by an earlier run are replayed too
+        self.outbox = Outbox(
+            OUTBOX_PATH, lambda op, retry: AISDRAgent._apply_outbox_op(op, retry),
+            on_error=lambda e, op: print(f"  ⚠️ Outbox write to {op.get('table')} failed (will retry): {e}"),
+        )
+        self.outbox.start()
+        # Leases let several workers share an org (see leases.py)
+        self.leases = LeaseManager(
+            lambda name, params: supabase.rpc(name, params).execute().data,
+            on_error=lambda e, name: print(f"  ⚠️ Lease RPC {name} failed: {e}"),
+        )
+        # Rolling phase latencies; batch sizes and admission are derived from them
+        self.latency = LatencyStats()
+        # outreach_log is read across orgs, so its cache is shared
+        self.outreach_state = None
+        # False once agent_metrics turns out not to be migrated
+        self.metrics_table = WRITE_AGENT_METRICS
+
+    def report_spans(self, run_start: datetime, org_id: Optional[str] = None):
+        """Print where the run's time went (spans.py) and write it to agent_metrics."""
+        run_seconds = (datetime.now(timezone.utc) - run_start).total_seconds()
+        lines = spans.report(run_seconds)
+        if not lines:
+            return
+        print(f"⏱️  Where the time went ({run_seconds / 60:.0f} min run):")
+        for line in lines:
+            print(line)
+        if not self.metrics_table:
+            return
+        try:
+            supabase.table('agent_metrics').insert(
+                spans.rows(run_start, run_seconds, org_id=org_id, run_id=self.leases.holder)).execute()
+        except Exception as e:
+            # agent_metrics not migrated yet (supabase/add_agent_metrics.sql) — print only
+            if any(marker in str(e) for marker in ('PGRST205', 'Could not find the table', 'does not exist')):
+                self.metrics_table = False
+            print(f"  ⚠️ Could not write agent_metrics: {e}")
+
+    def close(self):
+        self.outbox.close()
+        self.leases.release()
+        self.activity.close()
+
+
+class AISDRAgent:
+
+    def __init__(self, settings_id: str = AGENT_SETTINGS_ID, gmail: Optional[GmailService] = None,
+                 resources: Optional[AgentResources] = None):
+        self.settings_id = settings_id
+        self.gmail = gmail or GmailService()
+        self._owns_resources = resources is None
+        self._resources = resources or AgentResources()
+        self._settings = SettingsWatcher(self._fetch_settings_row, self._fetch_settings_version)
+        self._settings_version_column = True
+        # Sleeps in run_autonomous end early when the dashboard changes settings
+        self._scheduler = Scheduler()
+        self._settings.subscribe(lambda settings: self._scheduler.wake('settings changed'))
+        self._bounced_index = None
+        self._checkpoint: Optional[RunCheckpoint] = None
+        self._activity = self._resources.activity
+        self._heartbeat = Heartbeat(
+            self._publish_heartbeat,
+            on_error=lambda e: print(f"  ⚠️ Heartbeat error: {e}"),
+        )
+        self._heartbeat_status_column = True
+        self._latency = self._resources.latency
+        self._batch_sizer = BatchSizer(self._latency)
+        self._admission = AdmissionControl(self._latency)
+        self._outbox = self._resources.outbox
+        self._leases = self._resources.leases
+        # Send spacing spans batches, so small batches don't skip the gap
+        self._next_send_at = 0.0
+        # Local pause / drain requests (daemon control socket, SIGTERM)
+        self._control_paused = False
+        self._drain_requested = threading.Event()
+
+    def close(self):
+        """Stop background threads and flush buffered activity rows. Safe to call more than once."""
+        self._settings.stop()
+        self._heartbeat.stop(final_phase='stopped')
+        if self._checkpoint is not None:
+            self._save_checkpoint()
+        if self._owns_resources:
+            self._resources.close()
 
     @staticmethod
     def _parse_send_days(raw) -> List[int]:
@@ -942,51 +1289,137 @@ class AISDRAgent:
         return default
 
     def _get_settings(self, refresh=False) -> Dict:
-        if not self._settings or refresh:
-            result = supabase.table("agent_settings").select("*").eq(
-                "id", "00000000-0000-0000-0000-000000000001"
+        """Settings from memory; refresh=True re-reads only if settings_version changed."""
+        return self._settings.get(refresh=refresh)
+
+    def _fetch_settings_row(self) -> Dict:
+        result = supabase.table("agent_settings").select("*").eq(
+            "id", self.settings_id
+        ).single().execute()
+        return result.data or {}
+
+    def _fetch_settings_version(self) -> Optional[int]:
+        """Cheap change check; None until add_settings_version.sql is applied."""
+        if not self._settings_version_column:
+            return None
+        try:
+            result = supabase.table("agent_settings").select("settings_version").eq(
+                "id", self.settings_id
             ).single().execute()
-            self._settings = result.data or {}
-        return self._settings
+            return (result.data or {}).get("settings_version")
+        except Exception as e:
+            if missing_column(e, "settings_version"):
+                # Not migrated yet — refetch the row on each check from now on
+                self._settings_version_column = False
+            else:
+                print(f"  ⚠️ settings_version check failed: {e}")
+            return None
+
+    def _activity_row(self, activity_type, lead_id=None, summary="", status="success",
+                      prospect_id=None, **extra) -> Dict:
+        row = {"activity_type": activity_type, "summary": summary, "status": status, **extra}
+        if lead_id:
+            row["lead_id"] = lead_id
+        if prospect_id:
+            row["prospect_id"] = prospect_id
+        org_id = self._resolve_org_id()
+        if org_id:
+            row["org_id"] = org_id
+        return row
 
     def _log(self, activity_type, lead_id=None, summary="", status="success", prospect_id=None):
+        """Queue one activity_log row; the background writer inserts it."""
         try:
-            row = {"activity_type": activity_type, "summary": summary, "status": status}
-            if lead_id:
-                row["lead_id"] = lead_id
-            if prospect_id:
-                row["prospect_id"] = prospect_id
-            org_id = self._resolve_org_id()
-            if org_id:
-                row["org_id"] = org_id
-            supabase.table("activity_log").insert(row).execute()
+            self._activity.log(self._activity_row(activity_type, lead_id, summary, status, prospect_id))
         except Exception as e:
             print(f"  ⚠️ Log error: {e}")
 
-    def _update_heartbeat(self):
-        supabase.table("agent_settings").update({
-            "last_heartbeat": datetime.now(timezone.utc).isoformat(),
-        }).eq("id", "00000000-0000-0000-0000-000000000001").execute()
+    def _log_many(self, rows: List[Dict]):
+        """Queue activity rows built by _activity_row() for multi-row insert."""
+        self._activity.log_many(rows)
 
-    def _is_within_send_hours(self, settings) -> bool:
-        send_start = settings.get('send_hour_start', 9)
-        send_end = settings.get('send_hour_end', 17)
-        send_days = self._parse_send_days(settings.get('send_days'))
+    # ─── POST-SEND OUTBOX ──────────────────────────
+
+    @staticmethod
+    @spans.timed(DB_WRITE_SPAN)
+    def _apply_outbox_op(op: Dict, retry: bool):
+        """Outbox callback: perform one queued insert/update against Supabase.
+
+        Inserts with a `unique` column are skipped on retry when the row is
+        already there (the earlier attempt landed but its response was lost).
+        """
+        values = op['values']
+        if op['action'] == 'insert':
+            unique = op.get('unique')
+            if retry and unique and values.get(unique):
+                existing = supabase.table(op['table']).select('id').eq(unique, values[unique]).limit(1).execute()
+                if existing.data:
+                    return
+            supabase.table(op['table']).insert(values).execute()
+        elif op['action'] == 'update':
+            query = supabase.table(op['table']).update(values)
+            for column, value in op['match'].items():
+                query = query.eq(column, value)
+            query.execute()
+        else:
+            raise ValueError(f"Unknown outbox action: {op['action']}")
+
+    def _record_send_writes(self, key: str, ops: List[Dict], ref: str):
+        """Queue a sent email's DB writes in the outbox (applied in the background).
 
+        If the outbox itself can't be written, fall back to writing inline.
+        """
+        try:
+            self._outbox.record(key, ops, ref=ref)
+            return
+        except Exception as e:
+            print(f"  ⚠️ Outbox unavailable, writing inline: {e}")
+        for op in ops:
+            try:
+                self._apply_outbox_op(op, retry=False)
+            except Exception as e:
+                print(f"  ❌ CRITICAL: {op['table']} {op['action']} failed for sent email to {ref}: {e}")
+                self._log('outreach_log_write_failed', summary=f"CRITICAL: sent to {ref} but {op['table']} write failed: {e}",
+                          status='failed')
+
+    def _publish_heartbeat(self, beat_iso: str, status: Dict):
+        """Heartbeat thread callback: renew leases, write last_heartbeat (+ agent_status)."""
+        self._leases.renew()
+        row = {"last_heartbeat": beat_iso}
+        if self._heartbeat_status_column:
+            row["agent_status"] = status
         try:
-            import pytz
-            now_est = datetime.now(pytz.timezone('US/Eastern'))
-        except ImportError:
-            now_est = datetime.now(timezone.utc) - timedelta(hours=5)
+            supabase.table("agent_settings").update(row).eq(
+                "id", self.settings_id).execute()
+        except Exception as e:
+            if not self._heartbeat_status_column or not missing_column(e, "agent_status"):
+                # Transient errors are retried by the next beat
+                raise
+            # agent_status column not migrated yet — keep the plain heartbeat
+            self._heartbeat_status_column = False
+            self._publish_heartbeat(beat_iso, status)
 
-        current_hour = now_est.hour
-        current_dow = now_est.isoweekday()
+    def _is_within_send_hours(self, settings) -> bool:
+        return is_within_send_window(
+            datetime.now(timezone.utc),
+            settings.get('send_hour_start', 9),
+            settings.get('send_hour_end', 17),
+            self._parse_send_days(settings.get('send_days')),
+        )
 
-        if current_dow not in send_days:
-            return False
-        if current_hour < send_start or current_hour > send_end:
-            return False
-        return True
+    def _next_eligible_at(self, settings: Dict, now: datetime) -> Optional[datetime]:
+        """When this org may next send by its own settings and send gap (None = paused / never)."""
+        if not settings.get('agent_enabled', False):
+            return None
+        at = now + timedelta(seconds=max(0.0, self._next_send_at - time.monotonic()))
+        if not settings.get('use_recipient_timezones', True):
+            window_start = next_send_window_start(
+                now, settings.get('send_hour_start', 9), settings.get('send_hour_end', 17),
+                self._parse_send_days(settings.get('send_days')))
+            if window_start is None:
+                return None
+            at = max(at, window_start)
+        return at
 
     def _get_remaining_today(self, max_per_day: int) -> int:
         """Return remaining global daily capacity from outreach_log (single source of truth)."""
@@ -1002,6 +1435,11 @@ class AISDRAgent:
         sent_today = today_count.count or 0
         return max_per_day - sent_today
 
+    def _queued_sends(self, org_id: Optional[str]) -> int:
+        """Sends of this org whose outreach_log rows are still in the outbox (not counted by the DB yet)."""
+        ops = self._outbox.pending_ops(kind='outreach_log.insert')
+        return sum(1 for op in ops if not org_id or op['values'].get('org_id') == org_id)
+
     def _resolve_org_id(self, settings: Optional[Dict] = None) -> Optional[str]:
         cfg = settings or self._get_settings()
         return cfg.get('org_id') or ORG_ID
@@ -1009,14 +1447,13 @@ class AISDRAgent:
     def _get_sender_sent_today(self, org_id: Optional[str]) -> Dict[str, int]:
         """Get per-sender sent counts for today from outreach_log (single source of truth)."""
         today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-        query = supabase.table('outreach_log').select(
-            'sender_email'
-        ).not_.is_('sender_email', 'null').gte('sent_at', f'{today}T00:00:00Z')
-        if org_id:
-            query = query.eq('org_id', org_id)
+
+        def _filters(query):
+            query = query.not_.is_('sender_email', 'null').gte('sent_at', f'{today}T00:00:00Z')
+            return query.eq('org_id', org_id) if org_id else query
 
         try:
-            rows = query.execute().data or []
+            rows = list(stream_rows('outreach_log', 'sender_email', filters=_filters))
         except Exception as e:
             print(f"  ⚠️ Could not query outreach_log for sender counts: {e}")
             return {}
@@ -1076,11 +1513,11 @@ class AISDRAgent:
                 'daily_send_limit': limit,
                 'current_daily_sent': sent_today,
                 'remaining': remaining,
-                'sent_in_run': 0,
+                'sent_in_run': self._run_checkpoint().sender_sent(email),
             })
 
         if pool:
-            return pool
+            return self._leased_senders(pool, org_id)
 
         if rows:
             print("  ⚠️ Sender accounts found, but none currently have accepted aliases and remaining daily capacity.")
@@ -1088,15 +1525,59 @@ class AISDRAgent:
 
         fallback_email = self.gmail.get_from_email()
         fallback_sent = sender_sent_today.get(fallback_email, 0)
-        return [{
+        return self._leased_senders([{
             'id': None,
             'email_address': fallback_email,
             'from_name': 'Sam Reid',
             'daily_send_limit': max_per_day,
             'current_daily_sent': fallback_sent,
             'remaining': max(0, max_per_day - fallback_sent),
-            'sent_in_run': 0,
-        }]
+            'sent_in_run': self._run_checkpoint().sender_sent(fallback_email),
+        }], org_id)
+
+    def _leased_senders(self, pool: List[Dict], org_id: Optional[str]) -> List[Dict]:
+        """Senders this worker holds (or just took) a lease on; others belong to another worker."""
+        leased = self._leases.acquire([f"sender:{s['email_address']}" for s in pool], org_id)
+        kept = [s for s in pool if f"sender:{s['email_address']}" in leased]
+        if len(kept) < len(pool):
+            print(f"  🔒 {len(pool) - len(kept)} sender(s) leased by another worker")
+        return kept
+
+    def _hold_org_lease(self) -> bool:
+        """Take or keep the org's maintenance lease (bounce and reply scans run on one worker)."""
+        org_id = self._resolve_org_id()
+        return bool(self._leases.acquire([f"org:{org_id or 'default'}"], org_id))
+
+    def _claimed_items(self, queue: WorkQueue, wanted: Callable[[], int], org_id: Optional[str],
+                       accept: Optional[Callable] = None) -> Iterator:
+        """Drain `queue` in chunks of `wanted()` items, yielding only the ones this worker claimed.
+
+        Items `accept` rejects are dropped without being claimed.  When the
+        caller stops early (close() on the generator), claims on items not
+        yet yielded are released so other workers can take them right away.
+        """
+        unyielded = []
+        try:
+            while queue:
+                n = wanted()
+                if n <= 0:
+                    return
+                chunk = []
+                while queue and len(chunk) < n:
+                    item = queue.pop()
+                    if accept is None or accept(item):
+                        chunk.append(item)
+                if not chunk:
+                    continue
+                claimed = self._leases.claim([item.key for item in chunk], org_id)
+                if len(claimed) < len(chunk):
+                    print(f"  🔒 {len(chunk) - len(claimed)} item(s) claimed by another worker")
+                unyielded = [item for item in chunk if item.key in claimed]
+                while unyielded:
+                    yield unyielded.pop(0)
+        finally:
+            if unyielded:
+                self._leases.release([item.key for item in unyielded])
 
     @staticmethod
     def _pick_sender(sender_pool: List[Dict]) -> Optional[Dict]:
@@ -1111,77 +1592,214 @@ class AISDRAgent:
 
         Per-sender daily counts are derived from outreach_log (the single
         source of truth), so there is no need to update email_accounts here.
-        We only update the in-memory pool for within-run round-robin fairness.
+        We only update the in-memory pool (and the run checkpoint) for round-robin
+        fairness across batches and runs.
         """
         if not sender:
             return
 
         sender['remaining'] = max(0, int(sender.get('remaining', 0)) - 1)
         sender['sent_in_run'] = int(sender.get('sent_in_run', 0)) + 1
+        # Rotation resumes from here in the next batch and the next run
+        self._run_checkpoint().record_sender_send(sender['email_address'])
         sender['current_daily_sent'] = int(sender.get('current_daily_sent', 0)) + 1
 
     def _get_sender_capacity_remaining(self, settings: Dict) -> int:
         pool = self._load_sender_pool(settings)
         return sum(int(s.get('remaining', 0)) for s in pool)
 
+    # ─── RUN CHECKPOINT ────────────────────────────
+
+    def _run_checkpoint(self) -> RunCheckpoint:
+        """This org's checkpoint in SDR_CACHE_DIR, loaded on first use (see checkpoint.py)."""
+        if self._checkpoint is None:
+            org_id = self._resolve_org_id()
+            self._checkpoint = RunCheckpoint(
+                os.path.join(SDR_CACHE_DIR, f"checkpoint-{org_id or 'default'}.json"))
+            if self._checkpoint.resumed:
+                print(f"💾 Resuming from checkpoint saved {self._checkpoint.get('saved_at')}")
+        return self._checkpoint
+
+    def _save_checkpoint(self):
+        try:
+            self._run_checkpoint().save()
+        except Exception as e:
+            print(f"  ⚠️ Could not save run checkpoint: {e}")
+
+    def _checkpointed_scan(self, key: str, scan: Callable[[], object], force: bool = False) -> bool:
+        """Run a bounce/reply scan unless an earlier run completed it recently.
+
+        A scan that completed within REPLY_CHECK_INTERVAL_MINUTES (possibly in
+        the previous run) is skipped unless `force`. Completion is recorded
+        only when `scan` returns, so a failed scan is retried. Returns whether
+        the scan ran.
+        """
+        checkpoint = self._run_checkpoint()
+        if not force and not checkpoint.due(key, REPLY_CHECK_INTERVAL_MINUTES * 60):
+            print(f"  ⏩ Skipped: last completed {checkpoint.time(key).strftime('%H:%M UTC')} (checkpoint)")
+            return False
+        started = datetime.now(timezone.utc)
+        scan()
+        checkpoint.mark(key, started)
+        self._save_checkpoint()
+        return True
+
+    def _resumed_followup_at(self, now: datetime) -> datetime:
+        """When follow-ups are next due per the checkpoint, or `now` to run a pass right away."""
+        saved = self._run_checkpoint().time('next_followup_at')
+        if saved and saved > now:
+            print(f"  ⏩ Follow-ups next due {saved.strftime('%H:%M UTC')} (checkpoint)")
+            return saved
+        return now
+
+    def _checkpoint_followup_at(self, next_followup_at: datetime):
+        self._run_checkpoint().mark('next_followup_at', next_followup_at)
+        self._save_checkpoint()
 
     # ─── STATUS ────────────────────────────────────
 
+    def _fetch_pipeline_stats(self, org_id: Optional[str]) -> Dict:
+        """Pipeline counts for `status` in one round-trip via agent_pipeline_stats.
+
+        Prospect stats are included when `org_id` is given.  Falls back to
+        per-count queries if the RPC is not deployed yet
+        (supabase/add_pipeline_stats_rpc.sql).
+        """
+        try:
+            stats = supabase.rpc('agent_pipeline_stats', {'p_org_id': org_id}).execute().data
+            if isinstance(stats, dict):
+                return stats
+            raise ValueError(f"unexpected RPC result: {stats!r}")
+        except Exception as e:
+            print(f"  ⚠️ agent_pipeline_stats RPC unavailable, using per-count queries: {e}")
+            return self._fetch_pipeline_stats_legacy(org_id)
+
+    def _fetch_pipeline_stats_legacy(self, org_id: Optional[str]) -> Dict:
+        """Same shape as the agent_pipeline_stats RPC, built from count queries."""
+        def count(table, build=lambda q: q):
+            return build(supabase.table(table).select("*", count="exact", head=True)).execute().count or 0
+
+        leads = {
+            'total': count("leads"),
+            'by_status': {st: count("leads", lambda q, st=st: q.eq("status", st))
+                          for st in ('enriched', 'contacted', 'replied')},
+            'by_icp_fit': {'HIGH': count("leads", lambda q: q.eq("icp_fit", "HIGH"))},
+            'high_with_contacts': count("leads", lambda q: q.eq("icp_fit", "HIGH").eq("has_contacts", True)),
+            'high_ready': count("leads", lambda q: q.eq("icp_fit", "HIGH").eq("has_contacts", True).eq("status", "enriched")),
+        }
+        outreach = {'total': count("outreach_log"), 'by_followup_number': {}}
+        # Follow-up stats (may fail if columns not yet migrated)
+        try:
+            for n in (1, 2):
+                outreach['by_followup_number'][str(n)] = count("outreach_log", lambda q, n=n: q.eq("followup_number", n))
+        except Exception:
+            pass
+        stats = {'leads': leads, 'outreach': outreach, 'prospects': None}
+        if not org_id:
+            return stats
+
+        def pcount(build):
+            return count("prospects", lambda q: build(q.eq("org_id", org_id)))
+
+        prospects = {
+            'by_status': {st: pcount(lambda q, st=st: q.eq("status", st)) for st in PROSPECT_STATUSES},
+            'icp_fit': {fit: pcount(lambda q, fit=fit: q.eq("icp_fit", fit)) for fit in ('HIGH', 'MEDIUM', 'LOW')},
+        }
+        for stage_field, stage_values in PROSPECT_STAGE_VALUES:
+            prospects[stage_field] = {
+                val: pcount(lambda q, f=stage_field, v=val: q.eq(f, v)) for val in stage_values
+            }
+
+        try:
+            scores = [r['confidence_score'] for r in stream_rows(
+                'prospects', 'confidence_score',
+                filters=lambda q: q.eq("org_id", org_id).not_.is_("confidence_score", "null"),
+            ) if r.get('confidence_score') is not None]
+            prospects['avg_confidence'] = sum(scores) / len(scores) if scores else 0
+        except Exception:
+            prospects['avg_confidence'] = None
+
+        try:
+            ninety_days_ago = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
+            prospects['stale'] = (pcount(lambda q: q.lt("last_enriched_at", ninety_days_ago))
+                                  + pcount(lambda q: q.is_("last_enriched_at", "null")))
+        except Exception:
+            prospects['stale'] = None
+
+        # Under-crawled (< 3 pages): one grouped read per chunk of prospects,
+        # not one count query per prospect.
+        try:
+            prospect_ids = [p['id'] for p in stream_rows('prospects', 'id', filters=lambda q: q.eq("org_id", org_id))]
+            crawl_counts: Dict[str, int] = {}
+            for chunk in chunked(prospect_ids):
+                for row in stream_rows('company_crawls', 'prospect_id',
+                                       filters=lambda q, chunk=chunk: q.in_("prospect_id", chunk)):
+                    crawl_counts[row['prospect_id']] = crawl_counts.get(row['prospect_id'], 0) + 1
+            prospects['under_crawled'] = sum(1 for pid in prospect_ids if crawl_counts.get(pid, 0) < 3)
+        except Exception:
+            prospects['under_crawled'] = None
+
+        stats['prospects'] = prospects
+        return stats
+
     def show_status(self):
         print(f"\n{'=' * 60}")
         print("📊 PIPELINE STATUS")
         print(f"{'=' * 60}")
 
-        total = supabase.table("leads").select("*", count="exact", head=True).execute().count
-        enriched = supabase.table("leads").select("*", count="exact", head=True).eq("status", "enriched").execute().count
-        contacted = supabase.table("leads").select("*", count="exact", head=True).eq("status", "contacted").execute().count
-        replied = supabase.table("leads").select("*", count="exact", head=True).eq("status", "replied").execute().count
-        high = supabase.table("leads").select("*", count="exact", head=True).eq("icp_fit", "HIGH").execute().count
-        high_contacts = supabase.table("leads").select("*", count="exact", head=True).eq("icp_fit", "HIGH").eq("has_contacts", True).execute().count
-        high_ready = supabase.table("leads").select("*", count="exact", head=True).eq("icp_fit", "HIGH").eq("has_contacts", True).eq("status", "enriched").execute().count
-        outreach = supabase.table("outreach_log").select("*", count="exact", head=True).execute().count
-
-        # Follow-up stats (may fail if columns not yet migrated)
-        try:
-            fu1_count = supabase.table("outreach_log").select("*", count="exact", head=True).eq("followup_number", 1).execute().count
-            fu2_count = supabase.table("outreach_log").select("*", count="exact", head=True).eq("followup_number", 2).execute().count
-        except Exception:
-            fu1_count = 0
-            fu2_count = 0
-
-        print(f"  Total leads:        {total}")
-        print(f"  Enriched:           {enriched}")
-        print(f"  Contacted:          {contacted}")
-        print(f"  Replied:            {replied}")
-        print(f"  HIGH fit:           {high}")
-        print(f"  HIGH + contacts:    {high_contacts}")
-        print(f"  HIGH ready to send: {high_ready}")
-        print(f"  Outreach emails:    {outreach}")
-        print(f"    Follow-up #1:     {fu1_count}")
-        print(f"    Follow-up #2:     {fu2_count}")
+        settings = self._get_settings()
+        use_prospects = settings.get('use_prospect_db', False)
+        stats = self._fetch_pipeline_stats(self._resolve_org_id(settings) if use_prospects else None)
+
+        leads = stats.get('leads') or {}
+        by_status = leads.get('by_status') or {}
+        fu_counts = (stats.get('outreach') or {}).get('by_followup_number') or {}
+
+        print(f"  Total leads:        {leads.get('total', 0)}")
+        print(f"  Enriched:           {by_status.get('enriched', 0)}")
+        print(f"  Contacted:          {by_status.get('contacted', 0)}")
+        print(f"  Replied:            {by_status.get('replied', 0)}")
+        print(f"  HIGH fit:           {(leads.get('by_icp_fit') or {}).get('HIGH', 0)}")
+        print(f"  HIGH + contacts:    {leads.get('high_with_contacts', 0)}")
+        print(f"  HIGH ready to send: {leads.get('high_ready', 0)}")
+        print(f"  Outreach emails:    {(stats.get('outreach') or {}).get('total', 0)}")
+        print(f"    Follow-up #1:     {fu_counts.get('1', 0)}")
+        print(f"    Follow-up #2:     {fu_counts.get('2', 0)}")
         print(f"{'=' * 60}\n")
 
         # Show prospect stats if use_prospect_db is enabled
-        settings = self._get_settings()
-        if settings.get('use_prospect_db', False):
-            self._show_prospect_stats()
+        if use_prospects and stats.get('prospects') is not None:
+            self._show_prospect_stats(stats['prospects'])
 
     # ─── SEND ONE EMAIL ────────────────────────────
 
-    def _send_one(self, lead, all_emailed, today_by_website, settings, sender: Dict, bounced_set: set = None) -> str:
+    @staticmethod
+    def _filter_suppressed(contacts: List[Dict], all_emailed: SuppressionIndex,
+                           bounced_set: SuppressionIndex = None) -> List[Dict]:
+        """Drop contacts without an email or whose address is emailed/bounced."""
+        contacts = [c for c in contacts if c.get('email')]
+        emails = [c['email'] for c in contacts]
+        suppressed = all_emailed.suppressed_among(emails)
+        if bounced_set is not None:
+            suppressed |= bounced_set.suppressed_among(emails)
+        return [c for c in contacts if c['email'].lower() not in suppressed]
+
+    def _send_one(self, lead, all_emailed: SuppressionIndex, today_by_website, settings, sender: Dict,
+                  bounced_set: SuppressionIndex = None) -> str:
         """Try to send one email for a lead. Returns: 'sent', 'skipped', 'failed'."""
         max_contacts_per_lead_per_day = settings.get('max_contacts_per_lead_per_day', 1)
 
         # Check per-lead daily limit
-        today_contacts = today_by_website.get(lead['website'], [])
+        today_contacts = today_by_website.get(lead['website'], set())
         if len(today_contacts) >= max_contacts_per_lead_per_day:
             return 'skipped'
 
         # Find contacts — use exact matches so B-tree indexes are used
         domain = lead['website'].lower().replace('https://', '').replace('http://', '').replace('www.', '').rstrip('/')
-        result = supabase.table('contact_database').select('*').or_(
-            f"website.eq.{domain},website.eq.www.{domain},email_domain.eq.{domain}"
-        ).limit(50).execute()
+        with spans.span(CONTACT_LOOKUP_SPAN):
+            result = supabase.table('contact_database').select('*').or_(
+                f"website.eq.{domain},website.eq.www.{domain},email_domain.eq.{domain}"
+            ).limit(50).execute()
 
         contacts = result.data or []
         if not contacts:
@@ -1195,10 +1813,7 @@ class AISDRAgent:
 
         # Score and filter already emailed + bounced
         scored = sorted(contacts, key=lambda c: score_contact(c.get('title', '')), reverse=True)
-        _bounced = bounced_set or set()
-        available = [c for c in scored if c.get('email')
-                     and c['email'].lower() not in all_emailed
-                     and c['email'].lower() not in _bounced]
+        available = self._filter_suppressed(scored, all_emailed, bounced_set)
 
         if not available:
             print(f"  ⏭️  All {len(scored)} contacts already emailed for {lead['website']}")
@@ -1265,6 +1880,11 @@ class AISDRAgent:
         # Pre-send dedup: verify outreach_log one more time right before sending.
         # Catches edge cases where a previous run sent the email but the
         # in-memory all_emailed set was lost (process crash, restart, etc.).
+        if self._outbox.pending(ref=contact['email'].lower()):
+            # Sent earlier; its outreach_log row is still queued in the outbox
+            print(f"  ⏭️  Dedup: {contact['email']} has a send still queued in the outbox — skipping")
+            all_emailed.add(contact['email'].lower())
+            return 'skipped'
         try:
             dedup_check = supabase.table('outreach_log').select(
                 'id', count='exact', head=True
@@ -1305,8 +1925,8 @@ class AISDRAgent:
 
         # Log outreach — sender_email is written so outreach_log is the single
         # source of truth for per-sender daily capacity.
-        # CRITICAL: If this insert fails, the email WAS already sent by Gmail.
-        # Retry to avoid a "ghost send" with no record (which could cause double-sends).
+        # The email WAS already sent by Gmail, so the writes go through the
+        # durable outbox: they are retried until they land, even across runs.
         org_id = self._resolve_org_id()
         outreach_row_data = {
             "lead_id": lead['id'],
@@ -1325,51 +1945,156 @@ class AISDRAgent:
         if org_id:
             outreach_row_data["org_id"] = org_id
 
-        for attempt in range(3):
-            try:
-                supabase.table("outreach_log").insert(outreach_row_data).execute()
-                break
-            except Exception as e:
-                if attempt < 2:
-                    print(f"  ⚠️ outreach_log insert failed (attempt {attempt + 1}/3), retrying: {e}")
-                    time.sleep(1)
-                else:
-                    print(f"  ❌ CRITICAL: outreach_log insert failed after 3 attempts for gmail_message_id={gmail_msg_id}. "
-                          f"Email WAS sent but has no DB record. Manual reconciliation needed.")
-                    self._log('outreach_log_write_failed', lead['id'],
-                              f"CRITICAL: Sent email {gmail_msg_id} to {contact['email']} but DB write failed: {e}",
-                              'failed')
-
-        # Mark contacted
-        supabase.table("leads").update({
-            "status": "contacted",
-            "has_contacts": True,
-            "contact_name": contact['name'],
-            "contact_email": contact['email'],
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-        }).eq("id", lead['id']).execute()
+        self._record_send_writes(
+            f"send:{gmail_msg_id or lead['id'] + ':' + contact['email'].lower()}",
+            [
+                {'table': 'outreach_log', 'action': 'insert', 'values': outreach_row_data,
+                 'unique': 'gmail_message_id'},
+                # Mark contacted
+                {'table': 'leads', 'action': 'update', 'match': {'id': lead['id']}, 'values': {
+                    "status": "contacted",
+                    "has_contacts": True,
+                    "contact_name": contact['name'],
+                    "contact_email": contact['email'],
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                }},
+            ],
+            ref=contact['email'].lower(),
+        )
 
         # Track
         all_emailed.add(contact['email'].lower())
-        today_by_website.setdefault(lead['website'], []).append(contact['email'])
+        today_by_website.setdefault(lead['website'], set()).add(contact['email'].lower())
 
         self._log('email_sent', lead['id'],
                    f"Sent from {sender.get('email_address')} to {contact['name']} <{contact['email']}> at {lead['website']}")
 
         return 'sent'
 
-    # ─── SEND BATCH ────────────────────────────────
+    # ─── OUTREACH HISTORY ──────────────────────────
 
-    def send_batch(self, count: int = 10, deadline: datetime = None, sender_pool: list = None):
-        print(f"\n{'=' * 60}")
-        print(f"📤 SENDING BATCH: up to {count} emails")
-        print(f"{'=' * 60}\n")
+    @staticmethod
+    def _parse_ts(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
 
-        settings = self._get_settings(refresh=True)
-        if not settings.get('agent_enabled', False):
-            print("⏸️  Agent is PAUSED.")
-            return 0
+    @staticmethod
+    def _index_path(name: str) -> str:
+        return os.path.join(SDR_CACHE_DIR, f"{name}.bloom")
+
+    def _open_index(self, name: str, lookup, count_query) -> SuppressionIndex:
+        """Load a suppression index from SDR_CACHE_DIR, or create an empty one.
+
+        A fresh index has no watermark, which makes the caller do a full load.
+        """
+        path = self._index_path(name)
+        if os.path.exists(path):
+            try:
+                index = SuppressionIndex.load(path, lookup)
+                if not index.saturated:
+                    print(f"💾 Loaded {name} index from disk ({len(index)} addresses, watermark {index.watermark})")
+                    return index
+                print(f"  ⚠️ {name} index on disk is over capacity — rebuilding")
+            except Exception as e:
+                print(f"  ⚠️ Could not load {name} index ({e}) — rebuilding")
+
+        try:
+            total = count_query().execute().count or 0
+        except Exception:
+            total = 0
+        return SuppressionIndex(lookup, capacity=max(SUPPRESSION_INDEX_MIN_CAPACITY, total * 2))
+
+    def _save_index(self, name: str, index: SuppressionIndex):
+        try:
+            index.save(self._index_path(name))
+        except Exception as e:
+            print(f"  ⚠️ Could not save {name} index: {e}")
+
+    @staticmethod
+    def _lookup_emailed(emails: List[str]) -> set:
+        """Exact, case-insensitive check for emailed-index Bloom hits."""
+        return match_addresses('outreach_log', 'contact_email', emails, 'match_emailed_addresses')
+
+    def _get_outreach_state(self):
+        """Return (all_emailed, today_by_website), kept alive for the whole run.
+
+        The first call streams all of outreach_log.  Later calls only read rows
+        inserted past the last seen created_at watermark (minus a small
+        overlap), so per-loop cost is proportional to what was written since,
+        not to history.  The watermark is the database's insert time, not
+        sent_at: rows replayed late from the outbox or written by another
+        worker carry an older sent_at.  today_by_website is rebuilt from the
+        same incremental read when the UTC day rolls over.  Both structures
+        are mutated in place by the send paths, so callers must not replace
+        them.
+        """
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        day_start = self._parse_ts(f'{today}T00:00:00Z')
+        state = self._resources.outreach_state
+        first_load = state is None
+
+        if first_load:
+            index = self._open_index(
+                'outreach_emailed', self._lookup_emailed,
+                lambda: supabase.table('outreach_log').select('id', count='exact', head=True),
+            )
+            state = {'all_emailed': index, 'today_by_website': {}, 'day': today, 'watermark_column': 'created_at'}
+        elif state['day'] != today:
+            state['today_by_website'].clear()
+            state['day'] = today
+        index = state['all_emailed']
+
+        def scan(column: str) -> tuple:
+            columns = 'contact_email, website, sent_at' + ('' if column == 'sent_at' else f', {column}')
+            if index.watermark:
+                since = self._parse_ts(index.watermark) - timedelta(seconds=OUTREACH_WATERMARK_OVERLAP_SECONDS)
+                if first_load:
+                    # A disk-loaded index may predate today's rows needed for today_by_website.
+                    since = min(since, day_start)
+                rows = stream_rows('outreach_log', columns, filters=lambda q: q.gt(column, since.isoformat()))
+            else:
+                rows = stream_rows('outreach_log', columns)
+
+            new_rows = 0
+            watermark = index.watermark
+            watermark_ts = self._parse_ts(watermark) if watermark else None
+            for o in rows:
+                new_rows += 1
+                email = (o.get('contact_email') or '').lower()
+                if email:
+                    index.add_from_source(email)
+                sent_at = o.get('sent_at')
+                if sent_at and self._parse_ts(sent_at) >= day_start and email:
+                    state['today_by_website'].setdefault(o['website'], set()).add(email)
+                marked_at = o.get(column)
+                if marked_at:
+                    marked_ts = self._parse_ts(marked_at)
+                    if watermark_ts is None or marked_ts > watermark_ts:
+                        watermark, watermark_ts = marked_at, marked_ts
+            return new_rows, watermark
 
+        try:
+            new_rows, watermark = scan(state['watermark_column'])
+        except Exception as e:
+            if state['watermark_column'] == 'sent_at' or not missing_column(e, 'created_at'):
+                raise
+            # Client-side sent_at misses rows that land late; apply the migration
+            print("  ⚠️ outreach_log.created_at missing (apply supabase/add_outreach_log_created_at.sql) "
+                  "— refreshing the outreach cache by sent_at")
+            state['watermark_column'] = 'sent_at'
+            new_rows, watermark = scan('sent_at')
+
+        index.watermark = watermark
+        if new_rows:
+            self._save_index('outreach_emailed', index)
+        if not first_load:
+            print(f"🔁 Outreach cache refreshed: {new_rows} row(s) since watermark")
+        self._resources.outreach_state = state
+        return state['all_emailed'], state['today_by_website']
+
+    # ─── SEND BATCH ────────────────────────────────
+
+    def _lead_candidates(self, settings: Dict, limit: int = 50) -> tuple:
+        """(enriched, contacted) leads with contacts for the allowed ICP fits, oldest first."""
         allowed_fits = settings.get('allowed_icp_fits', ['HIGH'])
 
         # Two-pass query: prioritize fresh enriched leads over contacted ones
@@ -1377,36 +2102,131 @@ class AISDRAgent:
             "icp_fit", allowed_fits
         ).eq("has_contacts", True).eq(
             "status", "enriched"
-        ).order("created_at", desc=False).limit(50).execute()
+        ).order("created_at", desc=False).limit(limit).execute()
 
         contacted_leads = supabase.table("leads").select("*").in_(
             "icp_fit", allowed_fits
         ).eq("has_contacts", True).eq(
             "status", "contacted"
-        ).order("created_at", desc=False).limit(50).execute()
+        ).order("created_at", desc=False).limit(limit).execute()
+
+        return enriched_leads.data or [], contacted_leads.data or []
+
+    def _prospect_candidates(self, limit: int = 50) -> tuple:
+        """(qualified, contacted) gold-enriched prospects.
+
+        Contacts are discovered when a prospect is first attempted (see
+        _send_one_prospect), not here: with recipient lanes most candidates
+        are deferred or never reached by the batch.
+        """
+        org_id = self._resolve_org_id()
+
+        # Query gold-enriched prospects (high ICP fit with Apollo contacts discovered)
+        prospects_result = supabase.table("prospects").select("*").eq(
+            "org_id", org_id
+        ).eq("enrichment_status", "gold_enriched").in_(
+            "status", ["qualified", "enriched"]
+        ).order("icp_fit_score", desc=True, nullsfirst=False).limit(limit).execute()
+
+        # Also include contacted prospects (may have un-emailed contacts)
+        contacted_result = supabase.table("prospects").select("*").eq(
+            "org_id", org_id
+        ).eq("enrichment_status", "gold_enriched").eq(
+            "status", "contacted"
+        ).order("created_at", desc=False).limit(limit).execute()
+
+        return prospects_result.data or [], contacted_result.data or []
+
+    def _wait_between_sends(self, min_gap: int, deadline: Optional[datetime] = None):
+        """Pause min_gap minutes plus jitter, unless the deadline is too close."""
+        wait = (min_gap * 60) + random.randint(10, 60)
+        if deadline:
+            secs_left = (deadline - datetime.now(timezone.utc)).total_seconds()
+            if secs_left <= wait + 60:
+                print(f"  ⏰ Only {secs_left:.0f}s left — skipping wait.")
+                return
+        print(f"  ⏳ Waiting {wait // 60}m {wait % 60}s...")
+        time.sleep(wait)
+
+    def _schedule_next_send(self, min_gap: int):
+        """Earliest time (monotonic) of the next queue send: min_gap minutes plus jitter."""
+        self._next_send_at = time.monotonic() + (min_gap * 60) + random.randint(10, 60)
+
+    def _wait_for_send_slot(self, deadline: Optional[datetime] = None):
+        """Sleep until the gap after the previous send has passed, even across batches."""
+        wait = self._next_send_at - time.monotonic()
+        if wait <= 0:
+            return
+        if deadline:
+            secs_left = (deadline - datetime.now(timezone.utc)).total_seconds()
+            if secs_left <= wait + 60:
+                print(f"  ⏰ Only {secs_left:.0f}s left — skipping wait.")
+                return
+        print(f"  ⏳ Waiting {int(wait) // 60}m {int(wait) % 60}s...")
+        # Settings changes also wake the scheduler; only pause/drain cut the gap short
+        while wait > 0 and not self._batch_interrupted():
+            self._scheduler.sleep_until(datetime.now(timezone.utc) + timedelta(seconds=wait))
+            wait = self._next_send_at - time.monotonic()
+
+    def _batch_interrupted(self) -> bool:
+        """True once a local pause or drain asks the current batch to stop."""
+        return self._control_paused or self._drain_requested.is_set()
+
+    def request_drain(self, reason: str = 'drain'):
+        """Stop after the send in progress and wind down like at the run deadline."""
+        if not self._drain_requested.is_set():
+            print(f"\n🛬 Drain requested ({reason})")
+        self._drain_requested.set()
+        self._scheduler.wake(reason)
+
+    def set_paused(self, paused: bool):
+        """Pause sending locally (on top of agent_settings.agent_enabled) or resume."""
+        self._control_paused = paused
+        print(f"\n{'⏸️  Paused' if paused else '▶️  Resumed'} via control socket")
+        self._scheduler.wake('paused' if paused else 'resumed')
+
+    def control_status(self) -> Dict:
+        """What GET /status on the daemon control socket returns."""
+        return {
+            **self._heartbeat.status(),
+            'paused': self._control_paused,
+            'draining': self._drain_requested.is_set() or self._admission.draining,
+            'outbox_pending': self._outbox.pending(),
+            'latency': self._latency.summary(),
+        }
+
+    def _admit(self, deadline: Optional[datetime], *phases: str) -> bool:
+        """False (and logs why) when the phases can't finish before the deadline."""
+        if self._admission.admit(*phases, deadline=deadline):
+            return True
+        print(f"\n⏰ Not starting {' + '.join(phases)} before the deadline: {self._admission.last_refusal}")
+        return False
+
+    def send_batch(self, count: int = 10, deadline: datetime = None, sender_pool: list = None):
+        print(f"\n{'=' * 60}")
+        print(f"📤 SENDING BATCH: up to {count} emails")
+        print(f"{'=' * 60}\n")
+
+        settings = self._get_settings(refresh=True)
+        if not settings.get('agent_enabled', False):
+            print("⏸️  Agent is PAUSED.")
+            return 0
+
+        allowed_fits = settings.get('allowed_icp_fits', ['HIGH'])
+        enriched_leads, contacted_leads = self._lead_candidates(settings)
 
         # Enriched first — they always have un-emailed contacts
-        all_leads = (enriched_leads.data or []) + (contacted_leads.data or [])
+        all_leads = enriched_leads + contacted_leads
 
         if not all_leads:
             print(f"📭 No {'/'.join(allowed_fits)} leads ready.")
             return 0
 
-        n_enriched = len(enriched_leads.data or [])
-        n_contacted = len(contacted_leads.data or [])
+        n_enriched = len(enriched_leads)
+        n_contacted = len(contacted_leads)
 
-        # Load already-emailed contacts
-        all_outreach = supabase.table("outreach_log").select("contact_email").execute()
-        all_emailed = set(o['contact_email'].lower() for o in (all_outreach.data or []) if o.get('contact_email'))
-
-        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-        today_outreach = supabase.table("outreach_log").select(
-            "website, contact_email"
-        ).gte("sent_at", f"{today}T00:00:00Z").execute()
-
-        today_by_website = {}
-        for o in (today_outreach.data or []):
-            today_by_website.setdefault(o['website'], []).append(o['contact_email'])
+        # Already-emailed contacts (cached for the run, refreshed incrementally)
+        all_emailed, today_by_website = self._get_outreach_state()
 
         # Load bounce suppression list as a fallback safety net
         bounced_set = self._load_bounce_suppression()
@@ -1427,8 +2247,7 @@ class AISDRAgent:
             if sent >= count:
                 break
 
-            if deadline and datetime.now(timezone.utc) >= deadline:
-                print(f"\n⏰ Deadline reached — stopping batch.")
+            if not self._admit(deadline, SEND_PHASE):
                 break
 
             print(f"\n{'─' * 50}")
@@ -1440,21 +2259,17 @@ class AISDRAgent:
                 break
 
             print(f"  ✉️ Using sender: {sender.get('email_address')} ({sender.get('remaining')} left)")
+            send_started = time.monotonic()
             result = self._send_one(lead, all_emailed, today_by_website, settings, sender, bounced_set)
+            if result in ('sent', 'failed'):
+                self._latency.record(SEND_PHASE, time.monotonic() - send_started)
 
             if result == 'sent':
                 sent += 1
                 self._record_sender_success(sender)
                 # Wait between sends
                 if sent < count:
-                    wait = (min_gap * 60) + random.randint(10, 60)
-                    if deadline:
-                        secs_left = (deadline - datetime.now(timezone.utc)).total_seconds()
-                        if secs_left <= wait + 60:
-                            print(f"  ⏰ Only {secs_left:.0f}s left — skipping wait.")
-                            continue
-                    print(f"  ⏳ Waiting {wait // 60}m {wait % 60}s...")
-                    time.sleep(wait)
+                    self._wait_between_sends(min_gap, deadline)
             elif result == 'failed':
                 failed += 1
             else:
@@ -1465,39 +2280,85 @@ class AISDRAgent:
 
     # ─── BOUNCE SUPPRESSION ─────────────────────────
 
-    def _load_bounce_suppression(self) -> set:
-        """Load set of bounced email addresses from activity_log.bounced_email column."""
-        try:
-            org_id = self._resolve_org_id()
-            query = supabase.table('activity_log').select('bounced_email').eq(
-                'activity_type', 'email_bounced'
-            ).not_.is_('bounced_email', 'null')
-            if org_id:
-                query = query.eq('org_id', org_id)
-            rows = query.execute().data or []
-            suppressed = set(r['bounced_email'].lower() for r in rows if r.get('bounced_email'))
-            if suppressed:
-                print(f"🚫 Loaded {len(suppressed)} bounced email(s) for suppression")
-            return suppressed
-        except Exception as e:
-            print(f"  ⚠️ Could not load bounce suppression list: {e}")
-            return set()
+    def _bounce_filters(self, query):
+        query = query.eq('activity_type', 'email_bounced').not_.is_('bounced_email', 'null')
+        org_id = self._resolve_org_id()
+        return query.eq('org_id', org_id) if org_id else query
 
-    # ─── CHECK BOUNCES ─────────────────────────────
+    def _lookup_bounced(self, emails: List[str]) -> set:
+        """Exact, case-insensitive check for bounced-index Bloom hits against activity_log.bounced_email."""
+        return match_addresses('activity_log', 'bounced_email', emails, 'match_bounced_addresses',
+                               {'p_org_id': self._resolve_org_id()}, filters=self._bounce_filters)
 
-    def check_bounces(self):
-        print(f"\n{'=' * 60}")
+    def _bounced_index_name(self) -> str:
+        # Bounces are per org, so each org gets its own cached index
+        org_id = self._resolve_org_id()
+        return f"bounced-{org_id}" if org_id else 'bounced'
+
+    def _load_bounce_suppression(self) -> SuppressionIndex:
+        """Bounced-address index built from activity_log.bounced_email.
+
+        Kept for the whole run and refreshed by created_at watermark, like the
+        emailed index.  If the refresh fails the last good index is returned.
+        """
+        index = self._bounced_index
+        if index is None:
+            index = self._open_index(
+                self._bounced_index_name(), self._lookup_bounced,
+                lambda: self._bounce_filters(
+                    supabase.table('activity_log').select('id', count='exact', head=True)
+                ),
+            )
+            self._bounced_index = index
+
+        try:
+            if index.watermark:
+                since = (self._parse_ts(index.watermark)
+                         - timedelta(seconds=OUTREACH_WATERMARK_OVERLAP_SECONDS)).isoformat()
+                def filters(query):
+                    return self._bounce_filters(query).gt('created_at', since)
+            else:
+                filters = self._bounce_filters
+
+            new_rows = 0
+            watermark = index.watermark
+            for r in stream_rows('activity_log', 'bounced_email, created_at', filters=filters):
+                new_rows += 1
+                index.add_from_source(r.get('bounced_email'))
+                created_at = r.get('created_at')
+                if created_at and (not watermark or self._parse_ts(created_at) > self._parse_ts(watermark)):
+                    watermark = created_at
+            index.watermark = watermark
+            if new_rows:
+                print(f"🚫 Indexed {new_rows} bounced email row(s) for suppression")
+                self._save_index(self._bounced_index_name(), index)
+        except Exception as e:
+            print(f"  ⚠️ Could not refresh bounce suppression index: {e}")
+        return index
+
+    # ─── CHECK BOUNCES ─────────────────────────────
+
+    @spans.timed(BOUNCE_SCAN_SPAN)
+    def check_bounces(self):
+        print(f"\n{'=' * 60}")
         print("🔄 CHECKING BOUNCES")
         print(f"{'=' * 60}\n")
 
-        bounced = self.gmail.check_bounces(days=7)
+        # Resumed runs only read bounces since the last completed scan
+        since = self._run_checkpoint().time('bounces_checked_at')
+        if since and since > datetime.now(timezone.utc) - timedelta(days=7):
+            since -= timedelta(minutes=BOUNCE_SCAN_OVERLAP_MINUTES)
+            print(f"  Scanning bounces since {since.strftime('%Y-%m-%d %H:%M UTC')}")
+            bounced = self.gmail.check_bounces(since=since)
+        else:
+            bounced = self.gmail.check_bounces(days=7)
 
         if not bounced:
             print("✅ No bounces found!")
             return
 
         # Dedup: skip emails already processed (matches JS check-bounces.js behavior)
-        already_processed = self._load_bounce_suppression()
+        already_processed = self._load_bounce_suppression().suppressed_among(bounced)
         new_bounces = [e for e in bounced if e.lower() not in already_processed]
         if not new_bounces:
             print(f"✅ {len(bounced)} bounce(s) found but all already processed.")
@@ -1506,55 +2367,72 @@ class AISDRAgent:
         print(f"🚫 Found {len(new_bounces)} new bounced (skipped {len(bounced) - len(new_bounces)} already processed): {', '.join(new_bounces)}\n")
 
         org_id = self._resolve_org_id()
+        now_iso = datetime.now(timezone.utc).isoformat()
+        bounced_lower = {e.lower() for e in new_bounces}
+
+        # Remove from contact_database to prevent re-discovery
         cleaned = 0
-        for email in new_bounces:
-            # Remove from contact_database to prevent re-discovery
-            q = supabase.table("contact_database").delete().eq("email", email)
+        for chunk in chunked(new_bounces):
+            q = supabase.table("contact_database").delete().in_("email", chunk)
             if org_id:
                 q = q.eq("org_id", org_id)
-            deleted = q.execute()
-            if deleted.data:
-                print(f"  🗑️ Removed {email}")
+            for row in (q.execute().data or []):
+                print(f"  🗑️ Removed {row.get('email')}")
                 cleaned += 1
 
-            # Reset leads to 'enriched' if this was their only contact
-            outreach = supabase.table("outreach_log").select("website").eq("contact_email", email).execute()
-            for o in (outreach.data or []):
-                other = supabase.table("outreach_log").select(
-                    "id", count="exact", head=True
-                ).eq("website", o['website']).neq("contact_email", email).execute()
-
-                if not other.count or other.count == 0:
-                    supabase.table("leads").update({"status": "enriched"}).eq("website", o['website']).execute()
-                    print(f"  ↩️ Reset {o['website']} to enriched")
+        # Reset leads to 'enriched' if the bounced addresses were their only contacts.
+        # One grouped read finds the websites that were emailed at a bounced
+        # address, a second finds which of those also emailed someone else.
+        affected_websites = set()
+        for chunk in chunked(new_bounces):
+            for o in stream_rows('outreach_log', 'website',
+                                 filters=lambda q, chunk=chunk: q.in_('contact_email', chunk)):
+                if o.get('website'):
+                    affected_websites.add(o['website'])
+
+        websites_with_others = set()
+        for chunk in chunked(sorted(affected_websites)):
+            for o in stream_rows('outreach_log', 'website, contact_email',
+                                 filters=lambda q, chunk=chunk: q.in_('website', chunk)):
+                if (o.get('contact_email') or '').lower() not in bounced_lower:
+                    websites_with_others.add(o['website'])
+
+        to_reset = sorted(affected_websites - websites_with_others)
+        for chunk in chunked(to_reset):
+            try:
+                supabase.table("leads").update({"status": "enriched"}).in_("website", chunk).execute()
+                for website in chunk:
+                    print(f"  ↩️ Reset {website} to enriched")
+            except Exception as e:
+                print(f"  ⚠️ Could not reset leads to enriched: {e}")
 
-            # Mark outreach_log rows for this email as bounced
+        # Mark outreach_log rows for these emails as bounced
+        for chunk in chunked(new_bounces):
             try:
                 supabase.table('outreach_log').update({
                     'bounced': True,
-                    'bounced_at': datetime.now(timezone.utc).isoformat(),
-                }).eq('contact_email', email).execute()
+                    'bounced_at': now_iso,
+                }).in_('contact_email', chunk).execute()
             except Exception as e:
-                print(f"  ⚠️ Could not mark outreach_log bounced for {email}: {e}")
+                print(f"  ⚠️ Could not mark outreach_log bounced for {len(chunk)} email(s): {e}")
 
-            # Log bounce with dedicated bounced_email column for suppression lookup
-            try:
-                row = {
-                    "activity_type": "email_bounced",
-                    "summary": f"Bounced: {email} — removed from contacts",
-                    "status": "failed",
-                    "bounced_email": email,
-                }
-                if org_id:
-                    row["org_id"] = org_id
-                supabase.table("activity_log").insert(row).execute()
-            except Exception as e:
-                print(f"  ⚠️ Log error: {e}")
+        # Log bounces with dedicated bounced_email column for suppression lookup
+        self._log_many([
+            self._activity_row("email_bounced", summary=f"Bounced: {email} — removed from contacts",
+                               status="failed", bounced_email=email)
+            for email in new_bounces
+        ])
+        # Bounce suppression reads bounced_email back from activity_log
+        self._activity.flush()
+
+        for email in new_bounces:
+            self._bounced_index.add(email)
 
         print(f"\n✅ Cleaned {cleaned} contacts")
 
     # ─── CHECK REPLIES ──────────────────────────
 
+    @spans.timed(REPLY_SCAN_SPAN)
     def check_replies(self, lookback_days: int = 60) -> int:
         """Scan sent email threads for real replies and record them.
 
@@ -1572,23 +2450,58 @@ class AISDRAgent:
         cutoff = (datetime.now(timezone.utc) - timedelta(days=lookback_days)).isoformat()
 
         # Only check threads not yet marked as replied, within the lookback window
-        results = supabase.table('outreach_log').select(
-            'id, lead_id, contact_email, contact_name, website, gmail_thread_id, replied_at'
-        ).is_('replied_at', 'null').not_.is_('gmail_thread_id', 'null').neq(
-            'gmail_thread_id', ''
-        ).gte('sent_at', cutoff).order('sent_at', desc=True).execute()
-
-        rows = results.data or []
+        rows = list(stream_rows(
+            'outreach_log',
+            'id, lead_id, contact_email, contact_name, website, gmail_thread_id, replied_at',
+            filters=lambda q: q.is_('replied_at', 'null').not_.is_('gmail_thread_id', 'null').neq(
+                'gmail_thread_id', ''
+            ).gte('sent_at', cutoff),
+        ))
         if not rows:
             print("  📭 No unreplied threads to check.")
             return 0
 
         print(f"  Checking {len(rows)} threads...")
-        our_email = self.gmail.get_from_email()
-        new_replies = 0
-        now_iso = datetime.now(timezone.utc).isoformat()
+        replied = self._scan_replied_threads(rows, 'leads')
+        if replied:
+            self._record_replies(replied)
+
+        new_replies = len(replied)
+        print(f"\n  ✅ Found {new_replies} new {'reply' if new_replies == 1 else 'replies'}")
+        return new_replies
+
+    def _scan_replied_threads(self, rows: List[Dict], scope: str) -> List[Dict]:
+        """Read phase: return the first outreach row of each thread that has a reply.
+
+        Deduplicates by gmail_thread_id so each thread costs one Gmail API
+        call. No database writes happen here; callers apply them in bulk.
+        When the checkpoint has the Gmail history id of the last `scope`
+        ('leads' / 'prospects') scan, only threads that received a message
+        since then are opened; every REPLY_FULL_SCAN_HOURS all are.
+        """
+        checkpoint = self._run_checkpoint()
+        history_key, full_scan_key = f'{scope}_reply_history_id', f'{scope}_reply_full_scan_at'
+        # Taken before scanning: messages arriving during the scan are seen next time
+        try:
+            history_id = self.gmail.history_id()
+        except Exception as e:
+            print(f"  ⚠️ Could not read Gmail history id: {e}")
+            history_id = None
+        changed = None
+        last_history_id = checkpoint.get(history_key)
+        if history_id and last_history_id and not checkpoint.due(full_scan_key, REPLY_FULL_SCAN_HOURS * 3600):
+            try:
+                changed = self.gmail.history_threads(last_history_id)
+            except Exception as e:
+                print(f"  ⚠️ Could not read Gmail history ({e}) — checking every thread")
+        if changed is not None:
+            total = len({row.get('gmail_thread_id') for row in rows})
+            rows = [row for row in rows if row.get('gmail_thread_id') in changed]
+            print(f"  📜 {len({row['gmail_thread_id'] for row in rows})} of {total} threads "
+                  f"changed since the last scan")
 
-        # Deduplicate by thread_id — one DB write per unique thread
+        our_email = self.gmail.get_from_email()
+        replied = []
         seen_threads: set = set()
         for row in rows:
             thread_id = row.get('gmail_thread_id', '')
@@ -1602,42 +2515,51 @@ class AISDRAgent:
                 print(f"  ⚠️ Thread check error ({row.get('contact_email')}): {e}")
                 continue
 
-            if not has_reply:
-                continue
-
-            contact_email = row.get('contact_email', '')
-            website = row.get('website', '')
-            lead_id = row.get('lead_id')
-            print(f"  💬 Reply detected: {contact_email} ({website})")
-            new_replies += 1
-
-            # Update all outreach rows for this thread
+            if has_reply:
+                print(f"  💬 Reply detected: {row.get('contact_email', '')} ({row.get('website', '')})")
+                replied.append(row)
+
+        if history_id:
+            checkpoint.set(history_key, history_id)
+            if changed is None:
+                checkpoint.mark(full_scan_key)
+            self._save_checkpoint()
+        return replied
+
+    def _mark_threads_replied(self, replied: List[Dict], now_iso: str):
+        """Set outreach_log.replied_at for every row of the replied threads."""
+        thread_ids = [row['gmail_thread_id'] for row in replied]
+        for chunk in chunked(thread_ids):
             try:
                 supabase.table('outreach_log').update({
                     'replied_at': now_iso,
-                }).eq('gmail_thread_id', thread_id).is_('replied_at', 'null').execute()
+                }).in_('gmail_thread_id', chunk).is_('replied_at', 'null').execute()
             except Exception as e:
-                print(f"  ⚠️ Could not update outreach_log replied_at: {e}")
+                print(f"  ⚠️ Could not update outreach_log replied_at ({len(chunk)} threads): {e}")
 
-            # Mark lead as replied
-            try:
-                update_q = supabase.table('leads').update({
-                    'status': 'replied',
-                    'updated_at': now_iso,
-                })
-                if lead_id:
-                    update_q = update_q.eq('id', lead_id)
-                else:
-                    update_q = update_q.eq('website', website)
-                update_q.execute()
-            except Exception as e:
-                print(f"  ⚠️ Could not update lead status: {e}")
+    def _record_replies(self, replied: List[Dict]):
+        """Write phase for check_replies: bulk outreach, leads and activity writes."""
+        now_iso = datetime.now(timezone.utc).isoformat()
+        self._mark_threads_replied(replied, now_iso)
 
-            self._log('email_reply', lead_id,
-                      f"Reply from {contact_email} at {website}")
+        # Mark leads as replied — by id where known, by website otherwise
+        lead_ids = sorted({row['lead_id'] for row in replied if row.get('lead_id')})
+        websites = sorted({row['website'] for row in replied if not row.get('lead_id') and row.get('website')})
+        for column, values in (('id', lead_ids), ('website', websites)):
+            for chunk in chunked(values):
+                try:
+                    supabase.table('leads').update({
+                        'status': 'replied',
+                        'updated_at': now_iso,
+                    }).in_(column, chunk).execute()
+                except Exception as e:
+                    print(f"  ⚠️ Could not update lead status: {e}")
 
-        print(f"\n  ✅ Found {new_replies} new {'reply' if new_replies == 1 else 'replies'}")
-        return new_replies
+        self._log_many([
+            self._activity_row('email_reply', row.get('lead_id'),
+                               f"Reply from {row.get('contact_email', '')} at {row.get('website', '')}")
+            for row in replied
+        ])
 
     # ─── PROSPECT-BASED METHODS ─────────────────────
 
@@ -1713,7 +2635,7 @@ class AISDRAgent:
                     'per_page': 25,
                 })
                 req = urllib.request.Request(
-                    'https://api.apollo.io/api/v1/mixed_people/api_search',
+                    f'{APOLLO_API_BASE}/api/v1/mixed_people/api_search',
                     data=search_payload.encode(),
                     method='POST',
                 )
@@ -1730,7 +2652,7 @@ class AISDRAgent:
                     top3 = people[:3]
                     enrich_payload = json.dumps({'details': [{'id': p['id']} for p in top3]})
                     req2 = urllib.request.Request(
-                        'https://api.apollo.io/api/v1/people/bulk_match',
+                        f'{APOLLO_API_BASE}/api/v1/people/bulk_match',
                         data=enrich_payload.encode(),
                         method='POST',
                     )
@@ -1821,33 +2743,42 @@ class AISDRAgent:
             return {'match_score': 30, 'match_level': 'Possible Match', 'match_reason': 'Mid-Level'}
         return {'match_score': 10, 'match_level': 'Possible Match', 'match_reason': 'Other'}
 
-    def _send_one_prospect(self, prospect, all_emailed, today_by_website, settings, sender: Dict, bounced_set: set = None) -> str:
+    @staticmethod
+    def _fetch_prospect_contacts(prospect_id: str, org_id: Optional[str]) -> List[Dict]:
+        with spans.span(CONTACT_LOOKUP_SPAN):
+            result = supabase.table('prospect_contacts').select('*').eq(
+                'prospect_id', prospect_id
+            ).eq('org_id', org_id).order(
+                'match_score', desc=True
+            ).limit(50).execute()
+        return result.data or []
+
+    def _send_one_prospect(self, prospect, all_emailed: SuppressionIndex, today_by_website, settings, sender: Dict,
+                           bounced_set: SuppressionIndex = None) -> str:
         """Try to send one email for a prospect. Returns: 'sent', 'skipped', 'failed'."""
         max_contacts_per_lead_per_day = settings.get('max_contacts_per_lead_per_day', 1)
         org_id = self._resolve_org_id()
 
         # Check per-prospect daily limit
-        today_contacts = today_by_website.get(prospect['website'], [])
+        today_contacts = today_by_website.get(prospect['website'], set())
         if len(today_contacts) >= max_contacts_per_lead_per_day:
             return 'skipped'
 
         # Find contacts from prospect_contacts (already scored and linked)
-        result = supabase.table('prospect_contacts').select('*').eq(
-            'prospect_id', prospect['id']
-        ).eq('org_id', org_id).order(
-            'match_score', desc=True
-        ).limit(50).execute()
-
-        contacts = result.data or []
+        contacts = self._fetch_prospect_contacts(prospect['id'], org_id)
+        if not contacts:
+            # First attempt for a prospect without contacts: discover them now
+            try:
+                if self.discover_prospect_contacts(prospect['id']):
+                    contacts = self._fetch_prospect_contacts(prospect['id'], org_id)
+            except Exception as e:
+                print(f"  ⚠️ Contact discovery error for {prospect['website']}: {e}")
         if not contacts:
             print(f"  ⚠️ No prospect_contacts for {prospect['website']}")
             return 'failed'
 
         # Filter already emailed + bounced
-        _bounced = bounced_set or set()
-        available = [c for c in contacts if c.get('email')
-                     and c['email'].lower() not in all_emailed
-                     and c['email'].lower() not in _bounced]
+        available = self._filter_suppressed(contacts, all_emailed, bounced_set)
 
         if not available:
             print(f"  ⏭️  All contacts already emailed for {prospect['website']}")
@@ -1904,6 +2835,11 @@ class AISDRAgent:
             return 'failed'
 
         # Pre-send dedup
+        if self._outbox.pending(ref=contact['email'].lower()):
+            # Sent earlier; its outreach_log row is still queued in the outbox
+            print(f"  ⏭️  Dedup: {contact['email']} has a send still queued in the outbox — skipping")
+            all_emailed.add(contact['email'].lower())
+            return 'skipped'
         try:
             dedup_check = supabase.table('outreach_log').select(
                 'id', count='exact', head=True
@@ -1942,7 +2878,7 @@ class AISDRAgent:
             except Exception as e:
                 print(f"  ⚠️ Could not fetch message headers: {e}")
 
-        # Log outreach (retry on failure — email WAS sent)
+        # Log outreach through the durable outbox (email WAS sent)
         outreach_row_data = {
             "prospect_id": prospect['id'],
             "website": prospect['website'],
@@ -1960,39 +2896,25 @@ class AISDRAgent:
         if org_id:
             outreach_row_data["org_id"] = org_id
 
-        for attempt in range(3):
-            try:
-                supabase.table("outreach_log").insert(outreach_row_data).execute()
-                break
-            except Exception as e:
-                if attempt < 2:
-                    print(f"  ⚠️ outreach_log insert failed (attempt {attempt + 1}/3), retrying: {e}")
-                    time.sleep(1)
-                else:
-                    print(f"  ❌ CRITICAL: outreach_log insert failed after 3 attempts for gmail_message_id={gmail_msg_id}.")
-                    self._log('outreach_log_write_failed',
-                              prospect_id=prospect['id'],
-                              summary=f"CRITICAL: Sent {gmail_msg_id} to {contact['email']} but DB write failed: {e}",
-                              status='failed')
-
-        # Mark prospect as contacted
-        supabase.table("prospects").update({
-            "status": "contacted",
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-        }).eq("id", prospect['id']).eq("org_id", org_id).execute()
-
-        # Mark prospect_contact as contacted
-        try:
-            supabase.table("prospect_contacts").update({
-                "contacted": True,
-                "contacted_at": datetime.now(timezone.utc).isoformat(),
-            }).eq("prospect_id", prospect['id']).eq("email", contact['email']).execute()
-        except Exception:
-            pass
+        now_iso = datetime.now(timezone.utc).isoformat()
+        self._record_send_writes(
+            f"send:{gmail_msg_id or prospect['id'] + ':' + contact['email'].lower()}",
+            [
+                {'table': 'outreach_log', 'action': 'insert', 'values': outreach_row_data,
+                 'unique': 'gmail_message_id'},
+                # Mark prospect and prospect_contact as contacted
+                {'table': 'prospects', 'action': 'update', 'match': {'id': prospect['id'], 'org_id': org_id},
+                 'values': {"status": "contacted", "updated_at": now_iso}},
+                {'table': 'prospect_contacts', 'action': 'update',
+                 'match': {'prospect_id': prospect['id'], 'email': contact['email']},
+                 'values': {"contacted": True, "contacted_at": now_iso}},
+            ],
+            ref=contact['email'].lower(),
+        )
 
         # Track
         all_emailed.add(contact['email'].lower())
-        today_by_website.setdefault(prospect['website'], []).append(contact['email'])
+        today_by_website.setdefault(prospect['website'], set()).add(contact['email'].lower())
 
         self._log('email_sent',
                    prospect_id=prospect['id'],
@@ -2011,57 +2933,21 @@ class AISDRAgent:
             print("⏸️  Agent is PAUSED.")
             return 0
 
-        org_id = self._resolve_org_id()
-
-        # Query gold-enriched prospects (high ICP fit with Apollo contacts discovered)
-        prospects_result = supabase.table("prospects").select("*").eq(
-            "org_id", org_id
-        ).eq("enrichment_status", "gold_enriched").in_(
-            "status", ["qualified", "enriched"]
-        ).order("icp_fit_score", desc=True, nullsfirst=False).limit(50).execute()
-
-        # Also include contacted prospects (may have un-emailed contacts)
-        contacted_result = supabase.table("prospects").select("*").eq(
-            "org_id", org_id
-        ).eq("enrichment_status", "gold_enriched").eq(
-            "status", "contacted"
-        ).order("created_at", desc=False).limit(50).execute()
-
-        all_prospects = (prospects_result.data or []) + (contacted_result.data or [])
+        qualified_prospects, contacted_prospects = self._prospect_candidates()
+        all_prospects = qualified_prospects + contacted_prospects
 
         if not all_prospects:
             print("📭 No gold-enriched prospects ready. Run the pipeline: Scout → Crawl → Analyze → Score → Gold Enrich")
             return 0
 
-        n_qualified = len(prospects_result.data or [])
-        n_contacted = len(contacted_result.data or [])
-
-        # Load already-emailed contacts
-        all_outreach = supabase.table("outreach_log").select("contact_email").execute()
-        all_emailed = set(o['contact_email'].lower() for o in (all_outreach.data or []) if o.get('contact_email'))
+        n_qualified = len(qualified_prospects)
+        n_contacted = len(contacted_prospects)
 
-        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-        today_outreach = supabase.table("outreach_log").select(
-            "website, contact_email"
-        ).gte("sent_at", f"{today}T00:00:00Z").execute()
-
-        today_by_website = {}
-        for o in (today_outreach.data or []):
-            today_by_website.setdefault(o['website'], []).append(o['contact_email'])
+        # Already-emailed contacts (cached for the run, refreshed incrementally)
+        all_emailed, today_by_website = self._get_outreach_state()
 
         bounced_set = self._load_bounce_suppression()
 
-        # Auto-discover contacts for prospects that have none
-        for prospect in all_prospects:
-            try:
-                existing = supabase.table('prospect_contacts').select(
-                    '*', count='exact'
-                ).eq('prospect_id', prospect['id']).eq('org_id', org_id).execute()
-                if not existing.count or existing.count == 0:
-                    self.discover_prospect_contacts(prospect['id'])
-            except Exception as e:
-                print(f"  ⚠️ Contact discovery error for {prospect['website']}: {e}")
-
         print(f"📋 {len(all_prospects)} candidate prospects ({n_qualified} qualified, {n_contacted} contacted), {len(all_emailed)} contacts already emailed\n")
 
         sent = 0
@@ -2078,8 +2964,7 @@ class AISDRAgent:
             if sent >= count:
                 break
 
-            if deadline and datetime.now(timezone.utc) >= deadline:
-                print(f"\n⏰ Deadline reached — stopping batch.")
+            if not self._admit(deadline, SEND_PHASE):
                 break
 
             print(f"\n{'─' * 50}")
@@ -2091,20 +2976,16 @@ class AISDRAgent:
                 break
 
             print(f"  ✉️ Using sender: {sender.get('email_address')} ({sender.get('remaining')} left)")
+            send_started = time.monotonic()
             result = self._send_one_prospect(prospect, all_emailed, today_by_website, settings, sender, bounced_set)
+            if result in ('sent', 'failed'):
+                self._latency.record(SEND_PHASE, time.monotonic() - send_started)
 
             if result == 'sent':
                 sent += 1
                 self._record_sender_success(sender)
                 if sent < count:
-                    wait = (min_gap * 60) + random.randint(10, 60)
-                    if deadline:
-                        secs_left = (deadline - datetime.now(timezone.utc)).total_seconds()
-                        if secs_left <= wait + 60:
-                            print(f"  ⏰ Only {secs_left:.0f}s left — skipping wait.")
-                            continue
-                    print(f"  ⏳ Waiting {wait // 60}m {wait % 60}s...")
-                    time.sleep(wait)
+                    self._wait_between_sends(min_gap, deadline)
             elif result == 'failed':
                 failed += 1
             else:
@@ -2113,6 +2994,7 @@ class AISDRAgent:
         print(f"\n🏁 BATCH (PROSPECTS): {sent} sent, {failed} failed, {skipped} skipped")
         return sent
 
+    @spans.timed(REPLY_SCAN_SPAN)
     def check_replies_prospects(self, lookback_days: int = 60) -> int:
         """Scan sent email threads for replies, updating prospects.status instead of leads.status."""
         print(f"\n{'=' * 60}")
@@ -2123,147 +3005,82 @@ class AISDRAgent:
         org_id = self._resolve_org_id()
 
         # Get unreplied outreach rows — filter to prospect-based rows (prospect_id IS NOT NULL)
-        results = supabase.table('outreach_log').select(
-            'id, contact_email, contact_name, website, gmail_thread_id, replied_at, prospect_id'
-        ).is_('replied_at', 'null').not_.is_('gmail_thread_id', 'null').not_.is_(
-            'prospect_id', 'null'
-        ).neq(
-            'gmail_thread_id', ''
-        ).gte('sent_at', cutoff).order('sent_at', desc=True).execute()
-
-        rows = results.data or []
+        rows = list(stream_rows(
+            'outreach_log',
+            'id, contact_email, contact_name, website, gmail_thread_id, replied_at, prospect_id',
+            filters=lambda q: q.is_('replied_at', 'null').not_.is_('gmail_thread_id', 'null').not_.is_(
+                'prospect_id', 'null'
+            ).neq('gmail_thread_id', '').gte('sent_at', cutoff),
+        ))
         if not rows:
             print("  📭 No unreplied threads to check.")
             return 0
 
         print(f"  Checking {len(rows)} threads...")
-        our_email = self.gmail.get_from_email()
-        new_replies = 0
-        now_iso = datetime.now(timezone.utc).isoformat()
-
-        seen_threads: set = set()
-        for row in rows:
-            thread_id = row.get('gmail_thread_id', '')
-            if not thread_id or thread_id in seen_threads:
-                continue
-            seen_threads.add(thread_id)
-
-            try:
-                has_reply = self.gmail.check_thread_for_replies(thread_id, our_email)
-            except Exception as e:
-                print(f"  ⚠️ Thread check error ({row.get('contact_email')}): {e}")
-                continue
-
-            if not has_reply:
-                continue
-
-            contact_email = row.get('contact_email', '')
-            website = row.get('website', '')
-            print(f"  💬 Reply detected: {contact_email} ({website})")
-            new_replies += 1
-
-            # Update outreach_log
-            try:
-                supabase.table('outreach_log').update({
-                    'replied_at': now_iso,
-                }).eq('gmail_thread_id', thread_id).is_('replied_at', 'null').execute()
-            except Exception as e:
-                print(f"  ⚠️ Could not update outreach_log replied_at: {e}")
+        replied = self._scan_replied_threads(rows, 'prospects')
+        if replied:
+            now_iso = datetime.now(timezone.utc).isoformat()
+            self._mark_threads_replied(replied, now_iso)
 
             # Update prospect status to 'engaged'
-            try:
-                supabase.table('prospects').update({
-                    'status': 'engaged',
-                    'updated_at': now_iso,
-                }).eq('org_id', org_id).eq('website', website).execute()
-            except Exception as e:
-                print(f"  ⚠️ Could not update prospect status: {e}")
+            prospect_ids = sorted({row['prospect_id'] for row in replied if row.get('prospect_id')})
+            for chunk in chunked(prospect_ids):
+                try:
+                    supabase.table('prospects').update({
+                        'status': 'engaged',
+                        'updated_at': now_iso,
+                    }).eq('org_id', org_id).in_('id', chunk).execute()
+                except Exception as e:
+                    print(f"  ⚠️ Could not update prospect status: {e}")
 
-            self._log('email_reply',
-                       prospect_id=row.get('prospect_id'),
-                       summary=f"[prospect] Reply from {contact_email} at {website}")
+            self._log_many([
+                self._activity_row('email_reply', prospect_id=row.get('prospect_id'),
+                                   summary=f"[prospect] Reply from {row.get('contact_email', '')} "
+                                           f"at {row.get('website', '')}")
+                for row in replied
+            ])
 
+        new_replies = len(replied)
         print(f"\n  ✅ Found {new_replies} new {'reply' if new_replies == 1 else 'replies'}")
         return new_replies
 
-    def _show_prospect_stats(self):
+    def _show_prospect_stats(self, prospects: Dict):
         """Show prospect pipeline stats alongside leads stats."""
-        org_id = self._resolve_org_id()
-
         print(f"\n{'─' * 60}")
         print("📊 PROSPECT PIPELINE")
         print(f"{'─' * 60}")
 
-        statuses = ['new', 'enriching', 'enriched', 'qualified', 'contacted', 'engaged', 'disqualified']
-        for status in statuses:
-            cnt = supabase.table("prospects").select(
-                "*", count="exact", head=True
-            ).eq("org_id", org_id).eq("status", status).execute().count or 0
-            print(f"  {status:15s} {cnt}")
+        by_status = prospects.get('by_status') or {}
+        for status in PROSPECT_STATUSES:
+            print(f"  {status:15s} {by_status.get(status, 0)}")
 
         # Pipeline stage counts
         print(f"\n  {'─' * 40}")
         print("  Pipeline stages:")
-        for stage_field, stage_values in [
-            ("crawl_status", ["pending", "crawled", "failed"]),
-            ("analysis_status", ["pending", "analyzed", "failed"]),
-            ("enrichment_status", ["pending", "ready_for_gold", "gold_enriched"]),
-        ]:
+        for stage_field, stage_values in PROSPECT_STAGE_VALUES:
+            counts = prospects.get(stage_field) or {}
             for val in stage_values:
-                cnt = supabase.table("prospects").select(
-                    "*", count="exact", head=True
-                ).eq("org_id", org_id).eq(stage_field, val).execute().count or 0
+                cnt = counts.get(val, 0)
                 if cnt > 0:
                     print(f"    {stage_field}={val:20s} {cnt}")
 
         # ICP fit breakdown
         print(f"\n  ICP fit:")
+        fits = prospects.get('icp_fit') or {}
         for fit in ['HIGH', 'MEDIUM', 'LOW']:
-            cnt = supabase.table("prospects").select(
-                "*", count="exact", head=True
-            ).eq("org_id", org_id).eq("icp_fit", fit).execute().count or 0
+            cnt = fits.get(fit, 0)
             if cnt > 0:
                 print(f"    {fit:10s} {cnt}")
 
-        # Average confidence
-        try:
-            conf_rows = supabase.table("prospects").select(
-                "confidence_score"
-            ).eq("org_id", org_id).not_.is_("confidence_score", "null").execute()
-            scores = [r['confidence_score'] for r in (conf_rows.data or []) if r.get('confidence_score') is not None]
-            avg_conf = sum(scores) / len(scores) if scores else 0
-            print(f"\n  Avg confidence:   {avg_conf:.2f}")
-        except Exception:
+        avg_conf = prospects.get('avg_confidence')
+        if avg_conf is not None:
+            print(f"\n  Avg confidence:   {float(avg_conf):.2f}")
+        else:
             print(f"\n  Avg confidence:   N/A")
-
-        # Stale data (last_enriched_at > 90 days ago)
-        try:
-            ninety_days_ago = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
-            stale = supabase.table("prospects").select(
-                "*", count="exact", head=True
-            ).eq("org_id", org_id).lt("last_enriched_at", ninety_days_ago).execute().count or 0
-            stale_null = supabase.table("prospects").select(
-                "*", count="exact", head=True
-            ).eq("org_id", org_id).is_("last_enriched_at", "null").execute().count or 0
-            print(f"  Stale (>90d):     {stale + stale_null}")
-        except Exception:
-            print(f"  Stale (>90d):     N/A")
-
-        # Under-crawled (< 3 pages)
-        try:
-            all_prospects = supabase.table("prospects").select("id").eq("org_id", org_id).execute()
-            prospect_ids = [p['id'] for p in (all_prospects.data or [])]
-            under_crawled = 0
-            # Check crawl counts in batches
-            for pid in prospect_ids:
-                crawl_cnt = supabase.table("company_crawls").select(
-                    "*", count="exact", head=True
-                ).eq("prospect_id", pid).execute().count or 0
-                if crawl_cnt < 3:
-                    under_crawled += 1
-            print(f"  Under-crawled:    {under_crawled}")
-        except Exception:
-            print(f"  Under-crawled:    N/A")
+        stale = prospects.get('stale')
+        print(f"  Stale (>90d):     {stale if stale is not None else 'N/A'}")
+        under_crawled = prospects.get('under_crawled')
+        print(f"  Under-crawled:    {under_crawled if under_crawled is not None else 'N/A'}")
 
         print(f"{'─' * 60}")
 
@@ -2288,10 +3105,9 @@ class AISDRAgent:
         print(f"{'=' * 60}\n")
 
         # Get all HIGH ICP leads with contacts
-        leads = supabase.table("leads").select("website").eq(
-            "icp_fit", "HIGH"
-        ).eq("has_contacts", True).execute()
-        lead_websites = [l['website'] for l in (leads.data or [])]
+        leads = stream_rows('leads', 'website',
+                            filters=lambda q: q.eq('icp_fit', 'HIGH').eq('has_contacts', True))
+        lead_websites = [l['website'] for l in leads]
 
         if not lead_websites:
             print("  No HIGH leads with contacts found.")
@@ -2300,10 +3116,7 @@ class AISDRAgent:
         print(f"  Found {len(lead_websites)} HIGH leads with contacts")
 
         # Get already-emailed addresses so we skip those
-        outreach = supabase.table("outreach_log").select("contact_email").execute()
-        already_emailed = set(
-            o['contact_email'].lower() for o in (outreach.data or []) if o.get('contact_email')
-        )
+        already_emailed, _ = self._get_outreach_state()
 
         # Collect unverified or expired contacts from HIGH leads, scored and filtered
         expiry_cutoff = (datetime.now(timezone.utc) - timedelta(days=VERIFICATION_MAX_AGE_DAYS)).isoformat()
@@ -2317,9 +3130,11 @@ class AISDRAgent:
                 f"elv_status.is.null,elv_verified_at.lt.{expiry_cutoff}"
             ).limit(50).execute()
 
-            for c in (result.data or []):
+            rows = result.data or []
+            emailed = already_emailed.suppressed_among(c.get('email') or '' for c in rows)
+            for c in rows:
                 email = c.get('email', '')
-                if not email or email.lower() in already_emailed:
+                if not email or email.lower() in emailed:
                     continue
 
                 apollo_status = (c.get('apollo_email_status') or '').lower()
@@ -2390,95 +3205,269 @@ class AISDRAgent:
 
     # ─── FOLLOW-UP EMAILS ─────────────────────────
 
-    def process_followups(self, deadline: datetime = None) -> int:
-        """Send follow-up emails for outreach that hasn't gotten replies.
+    @spans.timed(FOLLOWUP_SCAN_SPAN)
+    def _fetch_due_followups(self, now: datetime) -> List[Dict]:
+        """This org's due follow-ups via the get_due_followups RPC (one round-trip).
 
-        Follow-up #1: 3 days after initial email.
-        Follow-up #2: 5 days after follow-up #1.
-        All follow-ups are sent as replies in the original thread.
+        Falls back to the in-process reference implementation when the RPC
+        is not deployed (supabase/add_due_followups_rpc.sql): outreach_log is
+        streamed with only the key columns, then the due originals and their
+        leads are fetched by id in chunks.
         """
-        print(f"\n{'=' * 60}")
-        print("🔄 PROCESSING FOLLOW-UPS")
-        print(f"{'=' * 60}\n")
+        org_id = self._resolve_org_id()
+        try:
+            rows = supabase.rpc('get_due_followups', {
+                'p_fu1_days': FOLLOWUP_1_DELAY_DAYS,
+                'p_fu2_days': FOLLOWUP_2_DELAY_DAYS,
+                'p_org_id': org_id,
+            }).execute().data
+            if isinstance(rows, list):
+                return rows
+            raise ValueError(f"unexpected RPC result: {rows!r}")
+        except Exception as e:
+            print(f"  ⚠️ get_due_followups RPC unavailable, computing locally: {e}")
 
-        settings = self._get_settings(refresh=True)
-        if not settings.get('agent_enabled', False):
-            print("⏸️  Agent is PAUSED.")
-            return 0
+        key_rows = stream_rows(
+            'outreach_log',
+            'id, org_id, lead_id, contact_email, website, followup_number, sent_at, replied_at, bounced',
+            filters=(lambda q: q.eq('org_id', org_id)) if org_id else None,
+        )
+        due = compute_due_followups(key_rows, None, now, org_id=org_id)
+        if not due:
+            return []
 
-        now = datetime.now(timezone.utc)
-        followup_1_cutoff = (now - timedelta(days=3)).isoformat()
-        followup_2_cutoff = (now - timedelta(days=5)).isoformat()
+        originals: Dict[str, Dict] = {}
+        for chunk in chunked([item['original']['id'] for item in due]):
+            for row in supabase.table('outreach_log').select('*').in_('id', chunk).execute().data or []:
+                originals[row['id']] = row
+        lead_ids = sorted({item['original']['lead_id'] for item in due if item['original'].get('lead_id')})
+        leads: Dict[str, Dict] = {}
+        for chunk in chunked(lead_ids):
+            for row in supabase.table('leads').select('*').in_('id', chunk).execute().data or []:
+                leads[row['id']] = row
+
+        return [
+            {
+                'original': originals[item['original']['id']],
+                'next_followup_number': item['next_followup_number'],
+                'lead': leads.get(item['original'].get('lead_id')),
+            }
+            for item in due
+            if item['original']['id'] in originals
+        ]
+
+    def _next_followup_due_at(self, now: datetime) -> datetime:
+        """When run_autonomous should next run process_followups.
 
-        # ── Find candidates for Follow-up #1 ──
-        # Initial emails (followup_number=0) sent ≥ 3 days ago,
-        # that don't already have a follow-up #1 row.
+        The next thread to become due is the oldest initial email younger
+        than FOLLOWUP_1_DELAY_DAYS or the oldest follow-up #1 younger than
+        FOLLOWUP_2_DELAY_DAYS (one row each). It may err early, which only
+        costs an empty pass. Capped at FOLLOWUP_RECHECK_MINUTES so
+        follow-ups left over by an earlier pass (caps, deadline) are retried.
+        """
+        org_id = self._resolve_org_id()
+        due_times = []
+        for fu_number, delay_days in ((0, FOLLOWUP_1_DELAY_DAYS), (1, FOLLOWUP_2_DELAY_DAYS)):
+            try:
+                q = supabase.table('outreach_log').select('sent_at').eq(
+                    'followup_number', fu_number).is_('replied_at', 'null').gt(
+                    'sent_at', (now - timedelta(days=delay_days)).isoformat())
+                if org_id:
+                    q = q.eq('org_id', org_id)
+                rows = q.order('sent_at').limit(1).execute().data or []
+            except Exception as e:
+                print(f"  ⚠️ Could not compute next follow-up time: {e}")
+                break
+            if rows and rows[0].get('sent_at'):
+                due_times.append(self._parse_ts(rows[0]['sent_at']) + timedelta(days=delay_days))
+        return min(due_times + [now + timedelta(minutes=FOLLOWUP_RECHECK_MINUTES)])
+
+    def _due_followup_candidates(self, now: datetime) -> List[tuple]:
+        """Due follow-ups as (outreach_row, followup_number, lead) minus bounced and still-queued contacts."""
+        # Each item carries the initial outreach row, the follow-up number to
+        # send and a snapshot of the lead (see followup_due.py for the rules).
         try:
-            initial_emails = supabase.table("outreach_log").select("*").eq(
-                "followup_number", 0
-            ).lte("sent_at", followup_1_cutoff).execute()
+            due = self._fetch_due_followups(now)
         except Exception as e:
-            print(f"  ❌ Error querying initial emails: {e}")
-            initial_emails = type('obj', (object,), {'data': []})()
+            print(f"  ❌ Error computing due follow-ups: {e}")
+            due = []
+
+        # Load bounce suppression list as a fallback safety net
+        bounced_set = self._load_bounce_suppression()
+        bounced = bounced_set.suppressed_among(
+            item['original'].get('contact_email', '') for item in due
+        )
+        # Sent earlier, but the outreach_log row is still queued in the outbox
+        skip = set(bounced) | {(op['values'].get('contact_email') or '').lower()
+                               for op in self._outbox.pending_ops(kind='outreach_log.insert')}
+        return [
+            (item['original'], item['next_followup_number'], item.get('lead'))
+            for item in due
+            if (item['original'].get('contact_email') or '').lower() not in skip
+        ]
+
+    def _send_followup(self, outreach_row: Dict, fu_number: int, lead: Optional[Dict]) -> str:
+        """Send one follow-up as a reply in the original thread.
+
+        Returns 'sent', 'skipped' (send still queued, reply found, terminal CRM stage) or 'failed'.
+        """
+        now = datetime.now(timezone.utc)
+        contact_email = outreach_row['contact_email']
+        contact_name = outreach_row.get('contact_name', '')
+        website = outreach_row['website']
+        original_subject = outreach_row.get('email_subject', '')
+        original_body = outreach_row.get('email_body', '')
+        gmail_thread_id = outreach_row.get('gmail_thread_id', '')
+        rfc_message_id = outreach_row.get('rfc_message_id', '')
+
+        print(f"{'─' * 50}")
+        print(f"  📩 Follow-up #{fu_number} → {contact_name} <{contact_email}> ({website})")
+
+        if self._outbox.pending(ref=contact_email.lower()):
+            # Sent earlier; its outreach_log row is still queued in the outbox
+            print(f"  ⏭️  Dedup: {contact_email} has a send still queued in the outbox — skipping")
+            return 'skipped'
+
+        # Check if prospect already replied (via Gmail thread)
+        if gmail_thread_id:
+            try:
+                has_reply = self.gmail.check_thread_for_replies(
+                    gmail_thread_id, self.gmail.get_from_email()
+                )
+                if has_reply:
+                    print(f"  💬 Prospect already replied — skipping!")
+                    # Mark only this lead row as replied (avoid cross-domain/contact bleed).
+                    update_q = supabase.table("leads").update({
+                        "status": "replied",
+                        "updated_at": now.isoformat(),
+                    })
+                    if outreach_row.get('lead_id'):
+                        update_q = update_q.eq("id", outreach_row['lead_id'])
+                    else:
+                        update_q = update_q.eq("website", website)
+                    update_q.execute()
+                    # Mark outreach_log replied_at if not already set
+                    try:
+                        supabase.table('outreach_log').update({
+                            'replied_at': now.isoformat(),
+                        }).eq('id', outreach_row['id']).is_('replied_at', 'null').execute()
+                    except Exception:
+                        pass
+                    self._log('email_reply', outreach_row.get('lead_id'),
+                              f"Reply from {contact_email} at {website}")
+                    return 'skipped'
+            except Exception as e:
+                print(f"  ⚠️ Could not check replies: {e}")
 
-        # ── Find candidates for Follow-up #2 ──
-        # Follow-up #1 emails sent ≥ 5 days ago,
-        # that don't already have a follow-up #2 row.
+        # Lead snapshot for context (returned with the due list)
+        lead = lead or {'website': website}
+
+        # Only skip terminal CRM stages. "replied" can be stale/misclassified;
+        # thread-level reply check above is the authoritative source for follow-up suppression.
+        if lead.get('status') in ('qualified', 'demo'):
+            print(f"  ⏭️  Lead status is '{lead.get('status')}' — skipping follow-up.")
+            return 'skipped'
+        if lead.get('status') == 'replied':
+            print("  ℹ️  Lead marked 'replied' in CRM, but no thread reply detected; continuing.")
+
+        # Generate follow-up email
         try:
-            followup1_emails = supabase.table("outreach_log").select("*").eq(
-                "followup_number", 1
-            ).lte("sent_at", followup_2_cutoff).execute()
+            followup_data = generate_followup_email(
+                lead, contact_name, fu_number, original_subject, original_body
+            )
+            print(f"  ✍️  Generated follow-up #{fu_number}")
         except Exception as e:
-            print(f"  ❌ Error querying follow-up #1 emails: {e}")
-            followup1_emails = type('obj', (object,), {'data': []})()
+            print(f"  ❌ Follow-up generation failed: {e}")
+            return 'failed'
 
-        # Build a set of (contact_email, website) that already have follow-ups
+        # Send as threaded reply (or fallback to regular send)
         try:
-            existing_followups = supabase.table("outreach_log").select(
-                "contact_email, website, followup_number"
-            ).gt("followup_number", 0).execute()
+            if gmail_thread_id and rfc_message_id:
+                result = self.gmail.send_reply(
+                    to=contact_email,
+                    subject=original_subject,
+                    body=followup_data['body'],
+                    thread_id=gmail_thread_id,
+                    original_message_id=rfc_message_id,
+                )
+            else:
+                # Fallback: send as new email with "Re:" prefix
+                re_subject = f"Re: {original_subject}" if not original_subject.lower().startswith('re:') else original_subject
+                result = self.gmail.send_email(
+                    to=contact_email,
+                    subject=re_subject,
+                    body=followup_data['body'],
+                )
+
+            fu_gmail_msg_id = result.get('id', '')
+            fu_gmail_thread_id = result.get('threadId', gmail_thread_id)
+            print(f"  ✅ Follow-up #{fu_number} SENT! ID: {fu_gmail_msg_id}")
         except Exception as e:
-            print(f"  ❌ Error querying existing follow-ups: {e}")
-            existing_followups = type('obj', (object,), {'data': []})()
-
-        has_followup1 = set()
-        has_followup2 = set()
-        for row in (existing_followups.data or []):
-            key = (row['contact_email'].lower(), row['website'].lower())
-            if row['followup_number'] == 1:
-                has_followup1.add(key)
-            elif row['followup_number'] == 2:
-                has_followup2.add(key)
+            print(f"  ❌ Send failed: {e}")
+            self._log('followup_failed', outreach_row.get('lead_id'),
+                      f"Follow-up #{fu_number} failed: {contact_email} - {e}", 'failed')
+            return 'failed'
 
-        # Load bounce suppression list as a fallback safety net
-        bounced_set = self._load_bounce_suppression()
+        # Retrieve RFC Message-ID for potential future threading
+        fu_rfc_message_id = ''
+        if fu_gmail_msg_id:
+            try:
+                headers = self.gmail.get_message_headers(fu_gmail_msg_id)
+                fu_rfc_message_id = headers.get('Message-ID', headers.get('Message-Id', ''))
+            except Exception:
+                pass
 
-        # Merge candidates: (outreach_row, followup_number_to_send)
-        candidates = []
+        # Log the follow-up in outreach_log (sender_email for single source of truth)
+        # through the durable outbox — the email WAS sent, we must record it.
+        fu_org_id = self._resolve_org_id()
+        fu_outreach_data = {
+            "lead_id": outreach_row.get('lead_id'),
+            "website": website,
+            "contact_email": contact_email,
+            "contact_name": contact_name,
+            "email_subject": f"Re: {original_subject}",
+            "email_body": followup_data['body'],
+            "sent_at": datetime.now(timezone.utc).isoformat(),
+            "followup_number": fu_number,
+            "gmail_message_id": fu_gmail_msg_id,
+            "gmail_thread_id": fu_gmail_thread_id,
+            "rfc_message_id": fu_rfc_message_id,
+            "parent_outreach_id": outreach_row.get('id'),
+            "sender_email": self.gmail.get_from_email(),
+        }
+        if fu_org_id:
+            fu_outreach_data["org_id"] = fu_org_id
+
+        self._record_send_writes(
+            f"followup:{fu_gmail_msg_id or str(outreach_row.get('id')) + ':' + str(fu_number)}",
+            [{'table': 'outreach_log', 'action': 'insert', 'values': fu_outreach_data,
+              'unique': 'gmail_message_id'}],
+            ref=(contact_email or '').lower(),
+        )
 
-        for row in (initial_emails.data or []):
-            if row.get('contact_email', '').lower() in bounced_set:
-                continue
-            key = (row['contact_email'].lower(), row['website'].lower())
-            if key not in has_followup1:
-                candidates.append((row, 1))
+        self._log('followup_sent', outreach_row.get('lead_id'),
+                   f"Follow-up #{fu_number} sent to {contact_name} <{contact_email}> at {website}")
 
-        for row in (followup1_emails.data or []):
-            if row.get('contact_email', '').lower() in bounced_set:
-                continue
-            key = (row['contact_email'].lower(), row['website'].lower())
-            if key not in has_followup2:
-                # Need the original email for context — find the initial outreach
-                try:
-                    original = supabase.table("outreach_log").select("*").eq(
-                        "contact_email", row['contact_email']
-                    ).eq("website", row['website']).eq(
-                        "followup_number", 0
-                    ).limit(1).execute()
-                    if original.data:
-                        candidates.append((original.data[0], 2))
-                except Exception:
-                    pass
+        return 'sent'
+
+    def process_followups(self, deadline: datetime = None) -> int:
+        """Send follow-up emails for outreach that hasn't gotten replies.
+
+        Follow-up #1: 3 days after initial email.
+        Follow-up #2: 5 days after follow-up #1.
+        All follow-ups are sent as replies in the original thread.
+        """
+        print(f"\n{'=' * 60}")
+        print("🔄 PROCESSING FOLLOW-UPS")
+        print(f"{'=' * 60}\n")
+
+        settings = self._get_settings(refresh=True)
+        if not settings.get('agent_enabled', False):
+            print("⏸️  Agent is PAUSED.")
+            return 0
+
+        # ── Find due follow-ups in one set-based query ──
+        candidates = self._due_followup_candidates(datetime.now(timezone.utc))
 
         if not candidates:
             print("✅ No follow-ups due right now.")
@@ -2489,184 +3478,231 @@ class AISDRAgent:
         sent = 0
         min_gap = settings.get('min_minutes_between_emails', 2)
 
-        for outreach_row, fu_number in candidates:
-            if deadline and datetime.now(timezone.utc) >= deadline:
-                print(f"\n⏰ Deadline reached — stopping follow-ups.")
+        for outreach_row, fu_number, lead in candidates:
+            if not self._admit(deadline, FOLLOWUP_PHASE):
                 break
 
-            contact_email = outreach_row['contact_email']
-            contact_name = outreach_row.get('contact_name', '')
-            website = outreach_row['website']
-            original_subject = outreach_row.get('email_subject', '')
-            original_body = outreach_row.get('email_body', '')
-            gmail_thread_id = outreach_row.get('gmail_thread_id', '')
-            rfc_message_id = outreach_row.get('rfc_message_id', '')
-
-            print(f"{'─' * 50}")
-            print(f"  📩 Follow-up #{fu_number} → {contact_name} <{contact_email}> ({website})")
+            send_started = time.monotonic()
+            result = self._send_followup(outreach_row, fu_number, lead)
+            if result in ('sent', 'failed'):
+                self._latency.record(FOLLOWUP_PHASE, time.monotonic() - send_started)
+            if result != 'sent':
+                continue
+            sent += 1
 
-            # Check if prospect already replied (via Gmail thread)
-            if gmail_thread_id:
-                try:
-                    has_reply = self.gmail.check_thread_for_replies(
-                        gmail_thread_id, self.gmail.get_from_email()
-                    )
-                    if has_reply:
-                        print(f"  💬 Prospect already replied — skipping!")
-                        # Mark only this lead row as replied (avoid cross-domain/contact bleed).
-                        update_q = supabase.table("leads").update({
-                            "status": "replied",
-                            "updated_at": now.isoformat(),
-                        })
-                        if outreach_row.get('lead_id'):
-                            update_q = update_q.eq("id", outreach_row['lead_id'])
-                        else:
-                            update_q = update_q.eq("website", website)
-                        update_q.execute()
-                        # Mark outreach_log replied_at if not already set
-                        try:
-                            supabase.table('outreach_log').update({
-                                'replied_at': now.isoformat(),
-                            }).eq('id', outreach_row['id']).is_('replied_at', 'null').execute()
-                        except Exception:
-                            pass
-                        self._log('email_reply', outreach_row.get('lead_id'),
-                                  f"Reply from {contact_email} at {website}")
-                        continue
-                except Exception as e:
-                    print(f"  ⚠️ Could not check replies: {e}")
+            # Wait between sends
+            if sent < len(candidates):
+                self._wait_between_sends(min_gap, deadline)
 
-            # Load the lead for context
-            try:
-                lead_result = supabase.table("leads").select("*").eq(
-                    "id", outreach_row['lead_id']
-                ).single().execute()
-                lead = lead_result.data or {}
-            except Exception:
-                lead = {'website': website}
+        print(f"\n🏁 FOLLOW-UPS: {sent} sent out of {len(candidates)} due")
+        return sent
 
-            # Only skip terminal CRM stages. "replied" can be stale/misclassified;
-            # thread-level reply check above is the authoritative source for follow-up suppression.
-            if lead.get('status') in ('qualified', 'demo'):
-                print(f"  ⏭️  Lead status is '{lead.get('status')}' — skipping follow-up.")
-                continue
-            if lead.get('status') == 'replied':
-                print("  ℹ️  Lead marked 'replied' in CRM, but no thread reply detected; continuing.")
+    # ─── UNIFIED WORK QUEUE ─────────────────────────
 
-            # Generate follow-up email
-            try:
-                followup_data = generate_followup_email(
-                    lead, contact_name, fu_number, original_subject, original_body
-                )
-                print(f"  ✍️  Generated follow-up #{fu_number}")
-            except Exception as e:
-                print(f"  ❌ Follow-up generation failed: {e}")
-                continue
+    def _recipient_window(self, settings: Dict) -> Optional[SendWindow]:
+        """Per-recipient send window, or None when lanes are off (global Eastern gate)."""
+        if not settings.get('use_recipient_timezones', True):
+            return None
+        return SendWindow(datetime.now(timezone.utc), settings.get('send_hour_start', 9),
+                          settings.get('send_hour_end', 17), self._parse_send_days(settings.get('send_days')))
+
+    def _build_work_queue(self, settings: Dict, use_prospects: bool,
+                          include_followups: bool = True) -> WorkQueue:
+        """One priority queue of due follow-ups plus lead or prospect candidates.
+
+        Priorities come from agent_settings.work_priorities (see work_queue.py
+        for the defaults); ties go to the earliest due / oldest item. Items
+        parked in the run checkpoint (skipped earlier today) are left out. With
+        recipient timezones on, items whose local send window is closed are
+        deferred and queue.next_available_at says when the first one opens.
+        """
+        queue = WorkQueue(resolve_priorities(settings.get('work_priorities')))
+        window = self._recipient_window(settings)
+        parked = self._run_checkpoint().parked()
 
-            # Send as threaded reply (or fallback to regular send)
-            try:
-                if gmail_thread_id and rfc_message_id:
-                    result = self.gmail.send_reply(
-                        to=contact_email,
-                        subject=original_subject,
-                        body=followup_data['body'],
-                        thread_id=gmail_thread_id,
-                        original_message_id=rfc_message_id,
-                    )
-                else:
-                    # Fallback: send as new email with "Re:" prefix
-                    re_subject = f"Re: {original_subject}" if not original_subject.lower().startswith('re:') else original_subject
-                    result = self.gmail.send_email(
-                        to=contact_email,
-                        subject=re_subject,
-                        body=followup_data['body'],
-                    )
+        def add(kind, key, payload, due_at, recipient):
+            if key in parked:
+                return
+            if window is not None:
+                opens_at = window.opens_at(infer_timezone(recipient))
+                if opens_at != window.now:
+                    queue.defer(key, opens_at)
+                    return
+            queue.push(kind, key, payload, due_at)
+
+        def created(row):
+            return self._parse_ts(row['created_at']) if row.get('created_at') else None
+
+        if include_followups:
+            for outreach_row, fu_number, lead in self._due_followup_candidates(datetime.now(timezone.utc)):
+                sent_at = outreach_row.get('sent_at')
+                add(FOLLOWUP, f"followup:{outreach_row['id']}",
+                    {'original': outreach_row, 'next_followup_number': fu_number, 'lead': lead},
+                    self._parse_ts(sent_at) if sent_at else None, lead or outreach_row)
+
+        limit = LANE_CANDIDATE_LIMIT if window is not None else 50
+        if use_prospects:
+            qualified, contacted = self._prospect_candidates(limit=limit)
+            # Qualified prospects keep their icp_fit_score order (no due time)
+            for p in qualified:
+                add(PROSPECT, f"prospect:{p['id']}", {'prospect': p}, None, p)
+            for p in contacted:
+                add(CONTACTED_PROSPECT, f"prospect:{p['id']}", {'prospect': p}, created(p), p)
+        else:
+            enriched, contacted = self._lead_candidates(settings, limit=limit)
+            for l in enriched:
+                add(ENRICHED_LEAD, f"lead:{l['id']}", {'lead': l}, created(l), l)
+            for l in contacted:
+                add(CONTACTED_LEAD, f"lead:{l['id']}", {'lead': l}, created(l), l)
+        return queue
+
+    def send_from_queue(self, count: int = 10, deadline: datetime = None, sender_pool: list = None,
+                        use_prospects: bool = False, include_followups: bool = True,
+                        setup_started: Optional[float] = None, yield_at_gap: bool = False) -> Dict:
+        """Send up to `count` emails drawn from the unified work queue.
+
+        Returns {'sent': n, 'followups': n, 'next_open_at': datetime | None,
+        'setup_seconds': s}, where next_open_at is when the first deferred
+        recipient's window opens. setup_started (time.monotonic()) lets the
+        caller include its own capacity checks in the measured setup time.
+        yield_at_gap ends the batch instead of sleeping out the gap between
+        sends (the orchestrator lets other orgs send meanwhile).
+        """
+        if setup_started is None:
+            setup_started = time.monotonic()
+        print(f"\n{'=' * 60}")
+        print(f"📤 SENDING FROM WORK QUEUE: up to {count} emails")
+        print(f"{'=' * 60}\n")
 
-                fu_gmail_msg_id = result.get('id', '')
-                fu_gmail_thread_id = result.get('threadId', gmail_thread_id)
-                print(f"  ✅ Follow-up #{fu_number} SENT! ID: {fu_gmail_msg_id}")
-            except Exception as e:
-                print(f"  ❌ Send failed: {e}")
-                self._log('followup_failed', outreach_row.get('lead_id'),
-                          f"Follow-up #{fu_number} failed: {contact_email} - {e}", 'failed')
-                continue
+        settings = self._get_settings(refresh=True)
+        if not settings.get('agent_enabled', False):
+            print("⏸️  Agent is PAUSED.")
+            return {'sent': 0, 'followups': 0, 'next_open_at': None}
+
+        queue = self._build_work_queue(settings, use_prospects, include_followups)
+        if queue.deferred:
+            opens = queue.next_available_at.strftime('%a %H:%M UTC') if queue.next_available_at else 'n/a'
+            print(f"🌐 {queue.deferred} recipient(s) outside their local send hours (next window opens {opens})")
+        if not queue:
+            print("📭 Nothing queued: no due follow-ups and no "
+                  f"{'gold-enriched prospects' if use_prospects else 'leads'} ready in an open send window.")
+            return {'sent': 0, 'followups': 0, 'next_open_at': queue.next_available_at}
+
+        counts = queue.counts()
+        print(f"📋 Queue: " + ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items())))
+
+        # Already-emailed contacts (cached for the run, refreshed incrementally)
+        all_emailed, today_by_website = self._get_outreach_state()
+        bounced_set = self._load_bounce_suppression()
 
-            # Retrieve RFC Message-ID for potential future threading
-            fu_rfc_message_id = ''
-            if fu_gmail_msg_id:
-                try:
-                    headers = self.gmail.get_message_headers(fu_gmail_msg_id)
-                    fu_rfc_message_id = headers.get('Message-ID', headers.get('Message-Id', ''))
-                except Exception:
-                    pass
-
-            # Log the follow-up in outreach_log (sender_email for single source of truth)
-            # Retry on failure — the email WAS sent, we must record it.
-            fu_org_id = self._resolve_org_id()
-            fu_outreach_data = {
-                "lead_id": outreach_row.get('lead_id'),
-                "website": website,
-                "contact_email": contact_email,
-                "contact_name": contact_name,
-                "email_subject": f"Re: {original_subject}",
-                "email_body": followup_data['body'],
-                "sent_at": datetime.now(timezone.utc).isoformat(),
-                "followup_number": fu_number,
-                "gmail_message_id": fu_gmail_msg_id,
-                "gmail_thread_id": fu_gmail_thread_id,
-                "rfc_message_id": fu_rfc_message_id,
-                "parent_outreach_id": outreach_row.get('id'),
-                "sender_email": self.gmail.get_from_email(),
-            }
-            if fu_org_id:
-                fu_outreach_data["org_id"] = fu_org_id
+        if sender_pool is None:
+            sender_pool = self._load_sender_pool(settings)
+        min_gap = settings.get('min_minutes_between_emails', 2)
+        setup_seconds = time.monotonic() - setup_started
+        self._latency.record(SETUP_PHASE, setup_seconds)
+
+        sent = followups_sent = failed = skipped = 0
+        senders_exhausted = False
+        # Items are claimed a batch at a time so parallel workers split the queue;
+        # once the sender pool is used up only follow-ups are claimed
+        items = self._claimed_items(queue, lambda: count - sent, self._resolve_org_id(settings),
+                                    accept=lambda item: item.kind == FOLLOWUP or not senders_exhausted)
+        for item in items:
+            if sent >= count or self._batch_interrupted():
+                self._leases.release([item.key])
+                break
+            if yield_at_gap and self._next_send_at > time.monotonic():
+                self._leases.release([item.key])
+                break
 
-            for attempt in range(3):
-                try:
-                    supabase.table("outreach_log").insert(fu_outreach_data).execute()
+            phase = FOLLOWUP_PHASE if item.kind == FOLLOWUP else SEND_PHASE
+            if item.kind == FOLLOWUP:
+                self._wait_for_send_slot(deadline)
+                if self._batch_interrupted() or not self._admit(deadline, phase):
+                    self._leases.release([item.key])
                     break
-                except Exception as e:
-                    if attempt < 2:
-                        print(f"  ⚠️ Follow-up outreach_log insert failed (attempt {attempt + 1}/3), retrying: {e}")
-                        time.sleep(1)
-                    else:
-                        print(f"  ❌ CRITICAL: Follow-up outreach_log insert failed for gmail_message_id={fu_gmail_msg_id}. "
-                              f"Email WAS sent but has no DB record.")
-                        self._log('outreach_log_write_failed', outreach_row.get('lead_id'),
-                                  f"CRITICAL: Follow-up #{fu_number} sent {fu_gmail_msg_id} to {contact_email} but DB write failed: {e}",
-                                  'failed')
-
-            self._log('followup_sent', outreach_row.get('lead_id'),
-                       f"Follow-up #{fu_number} sent to {contact_name} <{contact_email}> at {website}")
+                send_started = time.monotonic()
+                print(f"\n[{sent + 1}/{count}] follow-up (priority {item.priority})")
+                result = self._send_followup(item.payload['original'], item.payload['next_followup_number'],
+                                             item.payload.get('lead'))
+                if result == 'sent':
+                    followups_sent += 1
+            else:
+                # Follow-ups reply from the thread's inbox; initial sends need pool capacity
+                sender = self._pick_sender(sender_pool)
+                if not sender:
+                    print("  🛑 No sender accounts with remaining daily capacity.")
+                    senders_exhausted = True
+                    self._leases.release([item.key])
+                    continue
 
-            sent += 1
+                self._wait_for_send_slot(deadline)
+                if self._batch_interrupted() or not self._admit(deadline, phase):
+                    self._leases.release([item.key])
+                    break
+                send_started = time.monotonic()
+                row = item.payload.get('lead') or item.payload.get('prospect')
+                print(f"\n{'─' * 50}")
+                print(f"[{sent + 1}/{count}] {item.kind}: {row.get('company_name') or row['website']} "
+                      f"(priority {item.priority})")
+                print(f"  ✉️ Using sender: {sender.get('email_address')} ({sender.get('remaining')} left)")
+                if item.kind in (PROSPECT, CONTACTED_PROSPECT):
+                    result = self._send_one_prospect(row, all_emailed, today_by_website, settings, sender, bounced_set)
+                else:
+                    result = self._send_one(row, all_emailed, today_by_website, settings, sender, bounced_set)
+                if result == 'sent':
+                    self._record_sender_success(sender)
 
-            # Wait between sends
-            if sent < len(candidates):
-                wait = (min_gap * 60) + random.randint(10, 60)
-                if deadline:
-                    secs_left = (deadline - datetime.now(timezone.utc)).total_seconds()
-                    if secs_left <= wait + 60:
-                        print(f"  ⏰ Only {secs_left:.0f}s left — skipping wait.")
-                        continue
-                print(f"  ⏳ Waiting {wait // 60}m {wait % 60}s...")
-                time.sleep(wait)
+            if result in ('sent', 'failed'):
+                self._latency.record(phase, time.monotonic() - send_started)
+            if result == 'sent':
+                sent += 1
+                self._schedule_next_send(min_gap)
+            elif result == 'failed':
+                failed += 1
+            else:
+                skipped += 1
+                self._run_checkpoint().park(item.key)
+        # Releases the claims on the rest of the current chunk
+        items.close()
 
-        print(f"\n🏁 FOLLOW-UPS: {sent} sent out of {len(candidates)} due")
-        return sent
+        self._save_checkpoint()
+        print(f"\n🏁 QUEUE BATCH: {sent} sent ({followups_sent} follow-ups), {failed} failed, {skipped} skipped")
+        return {'sent': sent, 'followups': followups_sent, 'next_open_at': queue.next_available_at,
+                'setup_seconds': setup_seconds}
 
     # ─── FULL AUTO (CONTINUOUS LOOP) ───────────────
 
-    def run_autonomous(self):
+    def run_autonomous(self, deadline: Optional[datetime] = None, close: bool = True) -> bool:
+        """Bounce/reply scans, then the send loop until the deadline or a drain.
+
+        The deadline defaults to the GitHub Actions job limit. `daemon` runs
+        one cycle per UTC day with close=False so clients, caches and
+        background threads stay warm between cycles. Returns False if the
+        run could not start (Gmail auth).
+        """
         run_start = datetime.now(timezone.utc)
-        hard_deadline = run_start + timedelta(minutes=GH_ACTIONS_TIMEOUT_MINUTES)
+        hard_deadline = deadline or run_start + timedelta(minutes=GH_ACTIONS_TIMEOUT_MINUTES)
+        # Refusals near the previous cycle's deadline don't carry over
+        self._admission = AdmissionControl(self._latency)
+        # Span histograms cover one run (one daemon cycle)
+        spans.reset()
 
         print(f"\n{'=' * 80}")
         print(f"🤖 AUTONOMOUS MODE — CONTINUOUS LOOP")
         print(f"   Started: {run_start.strftime('%Y-%m-%d %H:%M UTC')}")
-        print(f"   Hard deadline: {hard_deadline.strftime('%H:%M UTC')} ({GH_ACTIONS_TIMEOUT_MINUTES} min)")
+        print(f"   Hard deadline: {hard_deadline.strftime('%H:%M UTC')} "
+              f"({(hard_deadline - run_start).total_seconds() / 60:.0f} min)")
         print(f"{'=' * 80}\n")
 
+        # Dashboard liveness comes from a background thread; the loop below
+        # only updates the in-memory status it publishes.
+        self._heartbeat.update(phase='starting', started_at=run_start.isoformat(),
+                               loop_count=0, sent=0, followups_sent=0)
+        self._heartbeat.start()
+        # Settings are served from memory; this thread picks up dashboard edits
+        self._settings.start()
+
         # Verify Gmail
         try:
             email = self.gmail.verify()
@@ -2674,14 +3710,32 @@ class AISDRAgent:
         except Exception as e:
             print(f"❌ Gmail error: {e}")
             self._log('autonomous_run', summary=f"Gmail auth failed: {e}", status='failed')
-            return
+            if close:
+                self.close()
+            return False
 
-        # Phase 1: Check bounces and replies once at start
-        print("\n📬 Phase 1a: Checking bounces...")
-        try:
-            self.check_bounces()
-        except Exception as e:
-            print(f"  ⚠️ Bounce check error: {e}")
+        # Land writes from sends an earlier run couldn't record before anything
+        # reads outreach_log (dedup, capacity, follow-ups)
+        queued = self._outbox.pending()
+        if queued:
+            applied = self._outbox.replay(force=True)
+            print(f"📮 Outbox: replayed {applied}/{queued} queued write(s) from an earlier run")
+
+        # Bounce and reply scans are org-wide: only the worker holding the org
+        # lease runs them, any others just send
+        primary = self._hold_org_lease()
+        if not primary:
+            print("🔒 Another worker holds this org's lease — skipping bounce and reply scans")
+
+        # Phase 1: Check bounces and replies once at start, unless the
+        # previous run's checkpoint says they ran moments ago
+        if primary:
+            print("\n📬 Phase 1a: Checking bounces...")
+            self._heartbeat.update(phase='checking_bounces', publish_now=True)
+            try:
+                self._checkpointed_scan('bounces_checked_at', self.check_bounces)
+            except Exception as e:
+                print(f"  ⚠️ Bounce check error: {e}")
 
         # Determine pipeline mode from settings
         settings = self._get_settings(refresh=True)
@@ -2691,117 +3745,161 @@ class AISDRAgent:
         else:
             print("🔀 Pipeline mode: LEADS (classic)")
 
-        print("\n💬 Phase 1b: Checking replies...")
-        try:
-            if use_prospects:
-                self.check_replies_prospects()
-            else:
-                self.check_replies()
-        except Exception as e:
-            print(f"  ⚠️ Reply check error: {e}")
-
-        # Phase 2: Process follow-ups once at start
-        print(f"\n{'=' * 80}")
-        print(f"📩 Phase 2: Processing follow-up emails")
-        print(f"{'=' * 80}")
-        total_followups_this_run = 0
-        try:
-            followups_sent = self.process_followups(deadline=hard_deadline)
-            total_followups_this_run += followups_sent
-        except Exception as e:
-            print(f"  ⚠️ Follow-up processing error: {e}")
+        if primary:
+            print("\n💬 Phase 1b: Checking replies...")
+            self._heartbeat.update(phase='checking_replies')
+            try:
+                self._checkpointed_scan('replies_checked_at',
+                                        self.check_replies_prospects if use_prospects else self.check_replies)
+            except Exception as e:
+                print(f"  ⚠️ Reply check error: {e}")
 
-        # Phase 3: Continuous send loop
+        # Phase 2: Continuous send loop — due follow-ups and initial sends are
+        # drawn from one priority queue, so follow-ups go out first on the first loop
         print(f"\n{'=' * 80}")
-        print(f"📤 Phase 3: Continuous sending loop")
+        print(f"📤 Phase 2: Continuous sending loop (follow-ups + initial sends)")
         print(f"{'=' * 80}")
 
         total_sent_this_run = 0
+        total_followups_this_run = 0
         loop_count = 0
-        # Process follow-ups again every N loops (roughly every ~30 min)
-        followup_check_interval = 6
-
-        while datetime.now(timezone.utc) < hard_deadline:
+        # Follow-ups are queued from startup (or when the checkpoint says the
+        # next one falls due), then again whenever the next one falls due;
+        # replies are checked on a fixed cadence
+        next_followup_at = self._resumed_followup_at(datetime.now(timezone.utc))
+        last_reply_check = self._run_checkpoint().time('replies_checked_at') or datetime.now(timezone.utc)
+        next_reply_check_at = last_reply_check + timedelta(minutes=REPLY_CHECK_INTERVAL_MINUTES)
+
+        while datetime.now(timezone.utc) < hard_deadline and not self._drain_requested.is_set():
             loop_count += 1
+            self._heartbeat.update(loop_count=loop_count)
 
-            # Refresh settings each loop (so dashboard changes take effect live)
+            # Latest settings (the watcher thread applies dashboard changes within seconds)
             settings = self._get_settings(refresh=True)
-
-            # Update heartbeat so dashboard shows agent is alive
-            self._update_heartbeat()
-
-            # Check if agent is paused
-            if not settings.get('agent_enabled', False):
-                print(f"\n⏸️  Agent PAUSED. Sleeping 60s then rechecking...")
-                time.sleep(60)
+            now = datetime.now(timezone.utc)
+
+            # Check if agent is paused — sleep until a settings change (or a
+            # resume on the daemon control socket) wakes us
+            if not settings.get('agent_enabled', False) or self._control_paused:
+                self._heartbeat.update(phase='paused', publish_now=True)
+                print(f"\n⏸️  Agent PAUSED. Waiting for settings change...")
+                self._scheduler.sleep_until(None, hard_deadline)
                 continue
 
-            # Check send hours
-            if not self._is_within_send_hours(settings):
-                try:
-                    import pytz
-                    now_est = datetime.now(pytz.timezone('US/Eastern'))
-                except ImportError:
-                    now_est = datetime.now(timezone.utc) - timedelta(hours=5)
-
-                print(f"\n⏰ Outside send hours (now: {now_est.strftime('%I:%M %p EST')}). Sleeping 5 min...")
-                for _ in range(5):
-                    time.sleep(60)
-                    self._update_heartbeat()
+            # Check send hours — sleep until the window opens. With recipient
+            # timezones on, the window is applied per recipient when the queue
+            # is built instead.
+            lanes = settings.get('use_recipient_timezones', True)
+            if not lanes and not self._is_within_send_hours(settings):
+                window_start = next_send_window_start(
+                    now, settings.get('send_hour_start', 9), settings.get('send_hour_end', 17),
+                    self._parse_send_days(settings.get('send_days')))
+                self._heartbeat.update(phase='outside_send_hours',
+                                       next_wake_at=window_start.isoformat() if window_start else None)
+                opens = (window_start.astimezone(send_tz()).strftime('%a %I:%M %p %Z')
+                         if window_start else 'never (no send days)')
+                print(f"\n⏰ Outside send hours. Sleeping until window opens: {opens}")
+                self._scheduler.sleep_until(window_start, hard_deadline)
                 continue
 
             # Check daily limit — load pool once and reuse for both capacity check
             # and send_batch (avoids double DB round-trip + double reset logic per loop)
+            capacity_started = time.monotonic()
             max_per_day = settings.get('max_emails_per_day', 50)
             remaining_global = self._get_remaining_today(max_per_day)
             sender_pool_for_loop = self._load_sender_pool(settings)
             remaining_sender = sum(int(s.get('remaining', 0)) for s in sender_pool_for_loop)
-            remaining = min(remaining_global, remaining_sender)
+            # Sends whose outreach_log rows are still in the outbox aren't
+            # counted by the DB yet
+            queued_sends = self._queued_sends(self._resolve_org_id(settings))
+            remaining = max(0, min(remaining_global, remaining_sender) - queued_sends)
+            capacity_seconds = time.monotonic() - capacity_started
 
             if remaining <= 0:
-                print(f"\n🛑 Daily limit reached ({max_per_day}/{max_per_day}). Sleeping 30 min then rechecking...")
-                # Sleep in intervals with heartbeat — the date might roll over
-                for _ in range(30):
-                    time.sleep(60)
-                    self._update_heartbeat()
+                reset_at = next_utc_midnight(now)
+                self._heartbeat.update(phase='daily_limit', next_wake_at=reset_at.isoformat())
+                print(f"\n🛑 Daily limit reached ({max_per_day}/{max_per_day}). "
+                      f"Sleeping until capacity resets at {reset_at.strftime('%H:%M UTC')}...")
+                self._scheduler.sleep_until(reset_at, hard_deadline)
                 continue
 
-            # Periodically process follow-ups and check replies during the send loop
-            if loop_count % followup_check_interval == 0:
-                print(f"\n📩 Periodic follow-up check (loop #{loop_count})...")
-                try:
-                    fu_sent = self.process_followups(deadline=hard_deadline)
-                    total_followups_this_run += fu_sent
-                    total_sent_this_run += fu_sent
-                except Exception as e:
-                    print(f"  ⚠️ Follow-up error: {e}")
-                try:
-                    if use_prospects:
-                        self.check_replies_prospects()
-                    else:
-                        self.check_replies()
-                except Exception as e:
-                    print(f"  ⚠️ Reply check error: {e}")
+            # Check replies periodically (before follow-ups are queued)
+            if now >= next_reply_check_at:
+                if not self._admit(hard_deadline, REPLY_CHECK_PHASE):
+                    break
+                # Only the org lease holder scans; re-acquiring takes over from a dead worker
+                if self._hold_org_lease():
+                    self._heartbeat.update(phase='checking_replies')
+                    try:
+                        with self._latency.timer(REPLY_CHECK_PHASE):
+                            self._checkpointed_scan(
+                                'replies_checked_at',
+                                self.check_replies_prospects if use_prospects else self.check_replies,
+                                force=True)
+                    except Exception as e:
+                        print(f"  ⚠️ Reply check error: {e}")
+                next_reply_check_at = datetime.now(timezone.utc) + timedelta(minutes=REPLY_CHECK_INTERVAL_MINUTES)
 
             # Re-check pipeline mode (may change via dashboard)
             use_prospects = settings.get('use_prospect_db', False)
 
-            # Send a small batch (5 at a time to allow frequent settings checks)
-            batch_size = min(remaining, 5)
-            print(f"\n🔄 Loop #{loop_count} — Budget: {remaining}/{max_per_day}, sending up to {batch_size} ({'prospects' if use_prospects else 'leads'})")
+            # Size the batch to amortise setup over the sends while keeping one
+            # batch short enough that settings are re-checked regularly
+            gap_seconds = settings.get('min_minutes_between_emails', 2) * 60 + 35  # mean jitter
+            batch_size = self._batch_sizer.size(remaining, gap_seconds)
+            include_followups = now >= next_followup_at
+            # Don't start a batch unless its setup and at least one send fit
+            if not self._admit(hard_deadline, SETUP_PHASE,
+                               FOLLOWUP_PHASE if include_followups else SEND_PHASE):
+                break
+            self._heartbeat.update(phase='sending', next_wake_at=None, batch_size=batch_size)
+            setup_avg = self._latency.mean(SETUP_PHASE)
+            send_avg = self._latency.mean(SEND_PHASE)
+            timing = (f", setup ~{setup_avg:.1f}s, send ~{send_avg:.1f}s + {gap_seconds}s gap"
+                      if setup_avg is not None and send_avg is not None else "")
+            print(f"\n🔄 Loop #{loop_count} — Budget: {remaining}/{max_per_day}, batch size {batch_size}{timing} ({'prospects' if use_prospects else 'leads'}{' + follow-ups' if include_followups else ''})")
 
-            if use_prospects:
-                sent = self.send_batch_prospects(count=batch_size, sender_pool=sender_pool_for_loop, deadline=hard_deadline)
-            else:
-                sent = self.send_batch(count=batch_size, deadline=hard_deadline, sender_pool=sender_pool_for_loop)
+            try:
+                result = self.send_from_queue(
+                    count=batch_size, deadline=hard_deadline, sender_pool=sender_pool_for_loop,
+                    use_prospects=use_prospects, include_followups=include_followups,
+                    setup_started=time.monotonic() - capacity_seconds)
+            except Exception as e:
+                print(f"  ⚠️ Send error: {e}")
+                result = {'sent': 0, 'followups': 0, 'next_open_at': None}
+            sent, fu_sent = result['sent'], result['followups']
+            if result.get('setup_seconds') is not None:
+                print(f"  ⏱️ Loop #{loop_count}: batch size {batch_size}, setup {result['setup_seconds']:.1f}s")
+                self._heartbeat.update(setup_seconds=round(result['setup_seconds'], 2))
+            if include_followups:
+                next_followup_at = self._next_followup_due_at(datetime.now(timezone.utc))
+                self._checkpoint_followup_at(next_followup_at)
             total_sent_this_run += sent
+            total_followups_this_run += fu_sent
+            self._heartbeat.update(sent=total_sent_this_run, followups_sent=total_followups_this_run)
+            if self._admission.draining:
+                break
 
             if sent == 0:
-                # No leads to send — sleep in short intervals with heartbeat
-                print(f"  📭 Nothing to send. Sleeping 5 min...")
-                for _ in range(5):
-                    time.sleep(60)
-                    self._update_heartbeat()
+                # Nothing eligible right now: new leads have no change signal, so
+                # recheck after the idle interval, or sooner if a follow-up falls due
+                wake_at = min(datetime.now(timezone.utc) + timedelta(minutes=IDLE_RECHECK_MINUTES),
+                              next_followup_at)
+                if result.get('next_open_at'):
+                    # Recipients are waiting on their local window: sleep until the
+                    # first one opens rather than polling every few minutes
+                    wake_at = min(max(wake_at, result['next_open_at']), next_followup_at)
+                self._heartbeat.update(phase='idle', next_wake_at=wake_at.isoformat())
+                print(f"  📭 Nothing to send. Sleeping until {wake_at.strftime('%H:%M UTC')}...")
+                self._scheduler.sleep_until(wake_at, hard_deadline)
+
+        if self._admission.draining:
+            # Refused work near the deadline: wind down now (summary, activity
+            # log flush, final heartbeat) instead of being killed mid-write
+            print(f"\n🛬 Draining before the deadline ({self._admission.refused} unit(s) not started)")
+            self._heartbeat.update(phase='draining', publish_now=True)
+        elif self._drain_requested.is_set():
+            self._heartbeat.update(phase='draining', publish_now=True)
 
         # Final summary
         print(f"\n{'=' * 80}")
@@ -2814,22 +3912,290 @@ class AISDRAgent:
         print(f"{'=' * 80}\n")
 
         self.show_status()
+        self._resources.report_spans(run_start, org_id=self._get_settings().get('org_id'))
         self._log('autonomous_run',
                    summary=f"Auto complete: {total_sent_this_run} sent ({total_followups_this_run} follow-ups) in {loop_count} loops")
+        if close:
+            self.close()
+        return True
+
+    def run_daemon(self):
+        """Run autonomous cycles indefinitely in one process, controlled over localhost.
+
+        Each cycle runs until the next UTC midnight (when daily caps reset),
+        so the per-run summary and activity row become daily ones, while the
+        Gmail token, suppression indexes, outreach cache, latency samples and
+        background threads stay warm. SIGTERM and POST /drain finish the send
+        in progress, flush the outbox and activity log, release leases and exit.
+        """
+        def then_status(action: Callable[[], None]) -> Callable[[], Dict]:
+            def command() -> Dict:
+                action()
+                return self.control_status()
+            return command
+
+        control = ControlServer({
+            'status': self.control_status,
+            'pause': then_status(lambda: self.set_paused(True)),
+            'resume': then_status(lambda: self.set_paused(False)),
+            'drain': then_status(lambda: self.request_drain('control socket')),
+        }, port=DAEMON_CONTROL_PORT, token=DAEMON_CONTROL_TOKEN)
+        control.start()
+        print(f"🎛️  Control socket: http://127.0.0.1:{control.port} (status, pause, resume, drain)")
+        # Graceful stop instead of SystemExit mid-send
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.request_drain('SIGTERM'))
+
+        try:
+            while not self._drain_requested.is_set():
+                now = datetime.now(timezone.utc)
+                if not self.run_autonomous(deadline=next_utc_midnight(now), close=False):
+                    retry_at = datetime.now(timezone.utc) + timedelta(minutes=DAEMON_RETRY_MINUTES)
+                    print(f"  🔁 Retrying at {retry_at.strftime('%H:%M UTC')}")
+                    self._scheduler.sleep_until(retry_at)
+        finally:
+            control.stop()
+            self.close()
 
 
 # ═══════════════════════════════════════════════════════════
-# CLI
+# MULTI-ORG ORCHESTRATOR
 # ═══════════════════════════════════════════════════════════
 
-if __name__ == "__main__":
-    import sys
+# How often the orchestrator reloads the enabled orgs and their settings
+ORG_REFRESH_MINUTES = 5
+
+
+class OrgOrchestrator:
+    """Run every enabled org in one process, interleaving send turns fairly.
+
+    Each org keeps its own agent_settings row (caps, send hours, pipeline
+    mode) and sender pool, and gets its own AISDRAgent.  The Supabase
+    client, Gmail session, outbox, activity writer, leases, latency samples
+    and outreach cache are shared, so adding an org costs a settings row,
+    not another GitHub Actions job with its own startup and cold caches.
+    Turns go to the eligible org furthest behind its share of sends
+    (fair_share.py); while one org waits out its inter-send gap, the
+    others send.
+    """
+
+    def __init__(self):
+        self.gmail = GmailService()
+        self.resources = AgentResources()
+        self.agents: Dict[str, AISDRAgent] = {}
+        self.fair = FairShare()
+        self._scheduler = Scheduler()
+        self._next_followup_at: Dict[str, datetime] = {}
+        self._next_reply_check_at: Dict[str, datetime] = {}
+        self._sent: Dict[str, int] = {}
+        self._followups_sent: Dict[str, int] = {}
+
+    def refresh_orgs(self) -> int:
+        """Load enabled orgs' settings; start agents for new ones, stop paused ones."""
+        rows = supabase.table('agent_settings').select('*').eq(
+            'agent_enabled', True
+        ).not_.is_('org_id', 'null').execute().data or []
+
+        seen = set()
+        for row in rows:
+            org_id = row['org_id']
+            seen.add(org_id)
+            agent = self.agents.get(org_id)
+            if agent is None:
+                agent = AISDRAgent(settings_id=row['id'], gmail=self.gmail, resources=self.resources)
+                self.agents[org_id] = agent
+                self._sent.setdefault(org_id, 0)
+                self._followups_sent.setdefault(org_id, 0)
+                agent._heartbeat.update(phase='starting', sent=self._sent[org_id],
+                                        followups_sent=self._followups_sent[org_id])
+                agent._heartbeat.start()
+                print(f"  ➕ Org {org_id}: up to {row.get('max_emails_per_day', 50)}/day")
+            agent._settings.set(row)
+            if org_id not in self._next_followup_at:
+                self._next_followup_at[org_id] = agent._resumed_followup_at(datetime.now(timezone.utc))
+            self.fair.set_org(org_id, row.get('max_emails_per_day', 50))
+
+        for org_id in [o for o in self.agents if o not in seen]:
+            print(f"  ➖ Org {org_id}: paused or removed")
+            self.agents.pop(org_id).close()
+            self.fair.remove(org_id)
+        return len(self.agents)
+
+    def _scan_org(self, org_id: str, agent: AISDRAgent, startup: bool):
+        """Bounce (startup only) and reply scans for one org, on the org lease holder.
+
+        At startup, scans an earlier run completed recently are skipped.
+        """
+        if not agent._hold_org_lease():
+            self._next_reply_check_at[org_id] = (datetime.now(timezone.utc)
+                                                 + timedelta(minutes=REPLY_CHECK_INTERVAL_MINUTES))
+            return
+        settings = agent._get_settings()
+        check_replies = (agent.check_replies_prospects if settings.get('use_prospect_db', False)
+                         else agent.check_replies)
+        agent._heartbeat.update(phase='checking_replies')
+        try:
+            if startup:
+                agent._checkpointed_scan('bounces_checked_at', agent.check_bounces)
+            with agent._latency.timer(REPLY_CHECK_PHASE):
+                agent._checkpointed_scan('replies_checked_at', check_replies, force=not startup)
+        except Exception as e:
+            print(f"  ⚠️ Org {org_id} scan error: {e}")
+        last = agent._run_checkpoint().time('replies_checked_at') or datetime.now(timezone.utc)
+        self._next_reply_check_at[org_id] = last + timedelta(minutes=REPLY_CHECK_INTERVAL_MINUTES)
+
+    def _turn(self, org_id: str, agent: AISDRAgent, now: datetime, deadline: datetime) -> int:
+        """One send turn for one org under its own caps. Returns emails sent."""
+        settings = agent._get_settings(refresh=True)
+        if now >= self._next_reply_check_at.get(org_id, now):
+            if not agent._admit(deadline, REPLY_CHECK_PHASE):
+                return 0
+            self._scan_org(org_id, agent, startup=False)
+
+        capacity_started = time.monotonic()
+        max_per_day = settings.get('max_emails_per_day', 50)
+        sender_pool = agent._load_sender_pool(settings)
+        # Sends still queued in the outbox count against this org's cap too
+        remaining = min(agent._get_remaining_today(max_per_day),
+                        sum(int(s.get('remaining', 0)) for s in sender_pool)) - agent._queued_sends(org_id)
+        if remaining <= 0:
+            print(f"  🛑 Org {org_id}: daily limit reached")
+            self.fair.record(org_id, 0)
+            self.fair.defer(org_id, next_utc_midnight(now))
+            return 0
+
+        gap_seconds = settings.get('min_minutes_between_emails', 2) * 60 + 35  # mean jitter
+        batch_size = agent._batch_sizer.size(remaining, gap_seconds)
+        include_followups = now >= self._next_followup_at.get(org_id, now)
+        if not agent._admit(deadline, SETUP_PHASE, FOLLOWUP_PHASE if include_followups else SEND_PHASE):
+            return 0
+
+        agent._heartbeat.update(phase='sending', batch_size=batch_size, next_wake_at=None)
+        print(f"\n🏢 Org {org_id} — budget {remaining}/{max_per_day}, batch size {batch_size}")
+        try:
+            result = agent.send_from_queue(
+                count=batch_size, deadline=deadline, sender_pool=sender_pool,
+                use_prospects=settings.get('use_prospect_db', False),
+                include_followups=include_followups,
+                setup_started=capacity_started, yield_at_gap=True)
+        except Exception as e:
+            print(f"  ⚠️ Org {org_id} send error: {e}")
+            result = {'sent': 0, 'followups': 0, 'next_open_at': None}
+        if include_followups:
+            self._next_followup_at[org_id] = agent._next_followup_due_at(datetime.now(timezone.utc))
+            agent._checkpoint_followup_at(self._next_followup_at[org_id])
+
+        sent = result['sent']
+        self.fair.record(org_id, sent)
+        self._sent[org_id] += sent
+        self._followups_sent[org_id] += result['followups']
+        agent._heartbeat.update(sent=self._sent[org_id], followups_sent=self._followups_sent[org_id])
+        if sent:
+            self.fair.defer(org_id, None)
+        else:
+            idle_until = datetime.now(timezone.utc) + timedelta(minutes=IDLE_RECHECK_MINUTES)
+            if result.get('next_open_at'):
+                idle_until = max(idle_until, result['next_open_at'])
+            idle_until = min(idle_until, self._next_followup_at.get(org_id, idle_until))
+            agent._heartbeat.update(phase='idle', next_wake_at=idle_until.isoformat())
+            self.fair.defer(org_id, idle_until)
+        return sent
+
+    def run(self):
+        run_start = datetime.now(timezone.utc)
+        hard_deadline = run_start + timedelta(minutes=GH_ACTIONS_TIMEOUT_MINUTES)
+        spans.reset()
+
+        print(f"\n{'=' * 80}")
+        print(f"🏢 MULTI-ORG ORCHESTRATOR")
+        print(f"   Started: {run_start.strftime('%Y-%m-%d %H:%M UTC')}")
+        print(f"   Hard deadline: {hard_deadline.strftime('%H:%M UTC')} ({GH_ACTIONS_TIMEOUT_MINUTES} min)")
+        print(f"{'=' * 80}\n")
 
+        # One Gmail verification and one outbox replay for every org
+        try:
+            print(f"✅ Gmail: {self.gmail.verify()}")
+        except Exception as e:
+            print(f"❌ Gmail error: {e}")
+            self.resources.close()
+            return
+        queued = self.resources.outbox.pending()
+        if queued:
+            applied = self.resources.outbox.replay(force=True)
+            print(f"📮 Outbox: replayed {applied}/{queued} queued write(s) from an earlier run")
+
+        if not self.refresh_orgs():
+            print("📭 No enabled orgs (agent_settings with agent_enabled and org_id).")
+            self.resources.close()
+            return
+        next_refresh_at = datetime.now(timezone.utc) + timedelta(minutes=ORG_REFRESH_MINUTES)
+
+        print(f"\n📬 Startup scans for {len(self.agents)} org(s)...")
+        for org_id, agent in list(self.agents.items()):
+            self._scan_org(org_id, agent, startup=True)
+
+        turns = 0
+        draining = False
+        while datetime.now(timezone.utc) < hard_deadline and not draining:
+            now = datetime.now(timezone.utc)
+            if now >= next_refresh_at:
+                self.refresh_orgs()
+                next_refresh_at = now + timedelta(minutes=ORG_REFRESH_MINUTES)
+
+            eligible = {org_id: agent._next_eligible_at(agent._get_settings(), now)
+                        for org_id, agent in self.agents.items()}
+            org_id, wake_at = self.fair.pick(now, eligible)
+            if org_id is None:
+                wake_at = min(wake_at, next_refresh_at) if wake_at else next_refresh_at
+                print(f"  💤 No org can send now. Sleeping until {wake_at.strftime('%H:%M UTC')}...")
+                self._scheduler.sleep_until(wake_at, hard_deadline)
+                continue
+
+            turns += 1
+            agent = self.agents[org_id]
+            self._turn(org_id, agent, now, hard_deadline)
+            draining = agent._admission.draining
+
+        if draining:
+            print(f"\n🛬 Draining before the deadline")
+
+        total = sum(self._sent.values())
+        print(f"\n{'=' * 80}")
+        print(f"🏁 ORCHESTRATOR RUN COMPLETE")
+        for org_id in sorted(self._sent):
+            print(f"   {org_id}: {self._sent[org_id]} sent ({self._followups_sent[org_id]} follow-ups)")
+        print(f"   Total emails this run: {total} in {turns} turns")
+        print(f"   Runtime: {(datetime.now(timezone.utc) - run_start).total_seconds() / 60:.0f} min")
+        print(f"{'=' * 80}\n")
+        # Spans are process-wide, so one report covers every org
+        self.resources.report_spans(run_start)
+
+        for org_id, agent in self.agents.items():
+            agent._log('autonomous_run',
+                       summary=f"Orchestrated run: {self._sent[org_id]} sent "
+                               f"({self._followups_sent[org_id]} follow-ups)")
+            agent.close()
+        self.resources.close()
+
+
+# ═══════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════
+
+def main(argv: List[str]) -> int:
+    """CLI dispatch: run the subcommand in argv (sys.argv[1:]). Returns the exit status."""
+    install_sigterm_exit()
+    if argv[:1] == ["orchestrate"]:
+        # Builds one agent per enabled org itself
+        OrgOrchestrator().run()
+        return 0
     agent = AISDRAgent()
 
-    if len(sys.argv) < 2:
+    if not argv:
         print("Usage:")
         print("  python ai_sdr_agent.py auto              # Full autonomous run (auto-detects leads/prospects mode)")
+        print("  python ai_sdr_agent.py orchestrate       # Autonomous run for every enabled org in one process")
+        print("  python ai_sdr_agent.py daemon            # Run indefinitely; control on localhost:$SDR_CONTROL_PORT")
         print("  python ai_sdr_agent.py send-batch 10     # Send N emails (leads)")
         print("  python ai_sdr_agent.py send-batch-prospects 10  # Send N emails (prospects)")
         print("  python ai_sdr_agent.py process-followups  # Send due follow-up emails")
@@ -2839,31 +4205,33 @@ if __name__ == "__main__":
         print("  python ai_sdr_agent.py batch-verify 500  # Pre-verify N emails for HIGH leads")
         print("  python ai_sdr_agent.py verify-gmail      # Test Gmail")
         print("  python ai_sdr_agent.py status             # Pipeline stats")
-        sys.exit(1)
+        return 1
 
-    cmd = sys.argv[1]
+    cmd = argv[0]
 
     if cmd == "auto":
         agent.run_autonomous()
+    elif cmd == "daemon":
+        agent.run_daemon()
     elif cmd == "send-batch":
-        n = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+        n = int(argv[1]) if len(argv) > 1 else 10
         agent.send_batch(n)
     elif cmd == "send-batch-prospects":
-        n = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+        n = int(argv[1]) if len(argv) > 1 else 10
         agent.send_batch_prospects(n)
     elif cmd == "process-followups":
         agent.process_followups()
     elif cmd == "check-bounces":
         agent.check_bounces()
     elif cmd == "check-replies":
-        days = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+        days = int(argv[1]) if len(argv) > 1 else 60
         agent.check_replies(lookback_days=days)
     elif cmd == "check-replies-prospects":
-        days = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+        days = int(argv[1]) if len(argv) > 1 else 60
         agent.check_replies_prospects(lookback_days=days)
     elif cmd == "batch-verify":
-        n = int(sys.argv[2]) if len(sys.argv) > 2 else 500
-        min_score = int(sys.argv[3]) if len(sys.argv) > 3 else 60
+        n = int(argv[1]) if len(argv) > 1 else 500
+        min_score = int(argv[2]) if len(argv) > 2 else 60
         agent.batch_verify(limit=n, min_score=min_score)
     elif cmd == "verify-gmail":
         try:
@@ -2874,4 +4242,11 @@ if __name__ == "__main__":
         agent.show_status()
     else:
         print(f"Unknown: {cmd}")
-        sys.exit(1)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main(sys.argv[1:]))
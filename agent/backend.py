@@ -0,0 +1,580 @@
+"""
+Data-access backends for the agent: Supabase, or in memory.
+
+All database access in ai_sdr_agent.py goes through the module-level
+`supabase` object, and only through a narrow slice of the supabase-py API:
+
+  backend.table(name) -> query builder
+      select(columns='*', count=None, head=False) | insert(rows) |
+      update(values) | upsert(rows, on_conflict='id') | delete()
+      eq / neq / gt / gte / lt / lte / like / ilike (column, value)
+      in_(column, values), is_(column, 'null' | True | False)
+      not_ (negates the next filter), or_("col.op.value,...")
+      order(column, desc=False, nullsfirst=None), limit(n), range(a, b), single()
+      execute() -> result with .data and .count
+  backend.rpc(name, params).execute()
+
+That slice is the backend interface.  `create_supabase_backend()` returns
+the real client; `InMemoryBackend` implements the same slice over Python
+dicts for the tables the agent uses, so benchmarks and tests can run the
+real agent logic offline against seeded synthetic data:
+
+    backend = InMemoryBackend()
+    backend.seed('leads', [{'id': 'l1', 'website': 'acme.com', ...}])
+    ai_sdr_agent.supabase = backend
+
+Every execute() counts as one round trip (`round_trips`, `calls` per
+(table, operation)) and can be given a simulated `latency`.  Equality
+filters are answered from per-column hash indexes and ordered keyset
+pages from sorted views, both built on first use and kept up to date by
+writes, so tables seeded with millions of rows stay usable.  RPCs must be
+registered with `register_rpc()`; unregistered ones fail with PostgREST's
+missing-function error, so the agent's "not migrated yet" fallbacks run.
+
+Pure Python with no Supabase dependency (supabase is imported only by
+create_supabase_backend()).
+"""
+
+import bisect
+import itertools
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Tables the agent reads or writes
+TABLES = (
+    'leads', 'prospects', 'prospect_contacts', 'contacts', 'contact_database', 'company_crawls',
+    'outreach_log', 'activity_log', 'agent_settings', 'email_accounts', 'agent_leases', 'agent_metrics',
+)
+
+_TIMESTAMP = re.compile(r'^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}|$)')
+
+
+def create_supabase_backend(url: Optional[str], key: Optional[str]):
+    """The production backend: a supabase-py client."""
+    from supabase import create_client
+    return create_client(url, key)
+
+
+class BackendError(Exception):
+    """Raised by InMemoryBackend where PostgREST would return an error."""
+
+
+class Result:
+    """What execute() returns: rows (or one row after single()) and the exact count."""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def _comparable(value: Any) -> Any:
+    # Timestamps are compared as instants, whatever their ISO spelling
+    if isinstance(value, str) and _TIMESTAMP.match(value):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _index_key(value: Any) -> Any:
+    """Hash key under which eq() and in_() treat values as equal (see _compare)."""
+    value = _comparable(value)
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if op == 'is':
+        if right in (None, 'null'):
+            return left is None
+        return left is (right in (True, 'true'))
+    if left is None:
+        # SQL: comparisons with NULL are never true
+        return False
+    if op in ('like', 'ilike'):
+        pattern = '^' + '.*'.join(re.escape(part) for part in str(right).split('%')) + '$'
+        return re.match(pattern, str(left), re.IGNORECASE if op == 'ilike' else 0) is not None
+    if op == 'in':
+        return left in right or str(left) in {str(v) for v in right}
+    left, right = _comparable(left), _comparable(right)
+    if type(left) is not type(right) and not (isinstance(left, (int, float)) and isinstance(right, (int, float))):
+        left, right = str(left), str(right)
+    if op == 'eq':
+        return left == right
+    if op == 'neq':
+        return left != right
+    if op == 'gt':
+        return left > right
+    if op == 'gte':
+        return left >= right
+    if op == 'lt':
+        return left < right
+    if op == 'lte':
+        return left <= right
+    raise BackendError(f"unsupported operator {op!r}")
+
+
+def _split_top_level(expr: str) -> List[str]:
+    """Split an or_() expression on commas outside parentheses."""
+    parts, depth, current = [], 0, ''
+    for ch in expr:
+        if ch == ',' and depth == 0:
+            parts.append(current)
+            current = ''
+            continue
+        depth += (ch == '(') - (ch == ')')
+        current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _parse_condition(text: str) -> tuple:
+    """One PostgREST `column.op.value` condition (optionally `column.not.op.value`)
+    as (op, column, value, negated)."""
+    column, rest = text.strip().split('.', 1)
+    negate = rest.startswith('not.')
+    if negate:
+        rest = rest[4:]
+    op, value = rest.split('.', 1)
+    if op == 'in':
+        value = [v.strip().strip('"') for v in value.strip('()').split(',') if v.strip()]
+    elif op == 'is':
+        value = {'null': None, 'true': True, 'false': False}.get(value, value)
+    return op, column, value, negate
+
+
+class _Query:
+    """Query builder over one in-memory table (see the module docstring)."""
+
+    def __init__(self, backend: 'InMemoryBackend', table: str):
+        self._backend = backend
+        self._table = table
+        self._op = 'select'
+        self._columns = '*'
+        self._count = None
+        self._head = False
+        self._payload: Any = None
+        self._on_conflict = 'id'
+        self._filters: List[Callable[[Dict], bool]] = []
+        # (op, column, value, negated) of the simple filters, for index lookups
+        self._conds: List[tuple] = []
+        self._negate = False
+        self._order: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._single = False
+
+    # ─── OPERATIONS ────────────────────────────
+
+    def select(self, columns: str = '*', count: Optional[str] = None, head: bool = False):
+        self._columns, self._count, self._head = columns, count, head
+        return self
+
+    def insert(self, rows):
+        self._op, self._payload = 'insert', rows
+        return self
+
+    def update(self, values: Dict):
+        self._op, self._payload = 'update', values
+        return self
+
+    def upsert(self, rows, on_conflict: str = 'id'):
+        self._op, self._payload, self._on_conflict = 'upsert', rows, on_conflict or 'id'
+        return self
+
+    def delete(self):
+        self._op = 'delete'
+        return self
+
+    # ─── FILTERS ───────────────────────────────
+
+    @property
+    def not_(self):
+        self._negate = True
+        return self
+
+    def _filter(self, op: str, column: str, value: Any):
+        negate, self._negate = self._negate, False
+        self._filters.append(lambda row: _compare(op, row.get(column), value) != negate)
+        self._conds.append((op, column, value, negate))
+        return self
+
+    def eq(self, column, value):
+        return self._filter('eq', column, value)
+
+    def neq(self, column, value):
+        return self._filter('neq', column, value)
+
+    def gt(self, column, value):
+        return self._filter('gt', column, value)
+
+    def gte(self, column, value):
+        return self._filter('gte', column, value)
+
+    def lt(self, column, value):
+        return self._filter('lt', column, value)
+
+    def lte(self, column, value):
+        return self._filter('lte', column, value)
+
+    def like(self, column, pattern):
+        return self._filter('like', column, pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter('ilike', column, pattern)
+
+    def in_(self, column, values: Iterable):
+        return self._filter('in', column, list(values))
+
+    def is_(self, column, value):
+        return self._filter('is', column, value)
+
+    def or_(self, expr: str):
+        conditions = [_parse_condition(part) for part in _split_top_level(expr)]
+        negate, self._negate = self._negate, False
+        self._filters.append(lambda row: any(_compare(op, row.get(column), value) != neg
+                                             for op, column, value, neg in conditions) != negate)
+        self._conds.append(('or', None, conditions, negate))
+        return self
+
+    # ─── SHAPING ───────────────────────────────
+
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None):
+        # PostgREST default: NULLS LAST ascending, NULLS FIRST descending
+        self._order.append((column, desc, desc if nullsfirst is None else nullsfirst))
+        return self
+
+    def limit(self, n: int):
+        self._limit = n
+        return self
+
+    def range(self, start: int, end: int):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    def execute(self) -> Result:
+        return self._backend._execute(self)
+
+    # ─── EVALUATION (backend lock held) ────────
+
+    def _matches(self, row: Dict) -> bool:
+        return all(f(row) for f in self._filters)
+
+    def _sorted(self, rows: List[Dict]) -> List[Dict]:
+        for column, desc, nulls_first in reversed(self._order):
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            present.sort(key=lambda r: _comparable(r[column]), reverse=desc)
+            rows = missing + present if nulls_first else present + missing
+        return rows
+
+    def _project(self, row: Dict) -> Dict:
+        columns = [c.strip() for c in self._columns.split(',')]
+        if '*' in columns:
+            return dict(row)
+        return {c: row.get(c) for c in columns}
+
+
+class InMemoryBackend:
+    """The agent's tables as lists of dicts, behind the supabase-py query API.
+
+    Args:
+        latency: Seconds slept per execute(), to model network round trips.
+        tables: Table names accepted (default TABLES); others raise.
+    """
+
+    def __init__(self, latency: float = 0.0, tables: Iterable[str] = TABLES):
+        self.latency = latency
+        self.tables: Dict[str, List[Dict]] = {name: [] for name in tables}
+        self.rpcs: Dict[str, Callable[['InMemoryBackend', Dict], Any]] = {}
+        self.calls: Counter = Counter()
+        self.round_trips = 0
+        self._lock = threading.RLock()
+        # Lookup structures over the live row dicts, built on first use:
+        # table -> column -> index key -> rows in insertion order
+        self._indexes: Dict[str, Dict[str, Dict[Any, List[Dict]]]] = {}
+        # (table, column) -> (sorted keys, rows), or None when keys are NULL or mixed types
+        self._views: Dict[Tuple[str, str], Optional[tuple]] = {}
+        self._seq: Dict[int, int] = {}  # id(row) -> insertion order
+        self._next_seq = itertools.count()
+
+    def seed(self, table: str, rows: Iterable[Dict]) -> int:
+        """Add rows (ids and created_at filled in like column defaults)."""
+        with self._lock:
+            data = self._rows(table)
+            added = [self._with_defaults(row) for row in rows]
+            data.extend(added)
+            self._added(table, added)
+            return len(added)
+
+    def register_rpc(self, name: str, fn: Callable[['InMemoryBackend', Dict], Any]):
+        """Serve rpc(name, params) with fn(backend, params) -> data."""
+        self.rpcs[name] = fn
+
+    def rows(self, table: str) -> List[Dict]:
+        """Snapshot of a table's rows (for assertions and reports)."""
+        with self._lock:
+            return [dict(row) for row in self._rows(table)]
+
+    def reset_counters(self):
+        with self._lock:
+            self.calls.clear()
+            self.round_trips = 0
+
+    # ─── CLIENT API ────────────────────────────
+
+    def table(self, name: str) -> _Query:
+        self._rows(name)
+        return _Query(self, name)
+
+    def rpc(self, name: str, params: Optional[Dict] = None):
+        backend = self
+
+        class _Call:
+            def execute(self):
+                return backend._call_rpc(name, params or {})
+
+        return _Call()
+
+    # ─── INTERNALS ─────────────────────────────
+
+    def _rows(self, table: str) -> List[Dict]:
+        if table not in self.tables:
+            raise BackendError(f'relation "public.{table}" does not exist')
+        return self.tables[table]
+
+    @staticmethod
+    def _with_defaults(row: Dict) -> Dict:
+        row = dict(row)
+        row.setdefault('id', str(uuid.uuid4()))
+        row.setdefault('created_at', datetime.now(timezone.utc).isoformat())
+        return row
+
+    def _round_trip(self, key: tuple):
+        self.round_trips += 1
+        self.calls[key] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _call_rpc(self, name: str, params: Dict) -> Result:
+        with self._lock:
+            self._round_trip(('rpc', name))
+            fn = self.rpcs.get(name)
+            if fn is None:
+                raise BackendError(f"PGRST202: Could not find the function public.{name}")
+            return Result(fn(self, params))
+
+    def _execute(self, q: _Query) -> Result:
+        with self._lock:
+            self._round_trip((q._table, q._op))
+            data = self._rows(q._table)
+            if q._op == 'insert':
+                payload = q._payload if isinstance(q._payload, list) else [q._payload]
+                added = [self._with_defaults(row) for row in payload]
+                data.extend(added)
+                self._added(q._table, added)
+                return Result([dict(row) for row in added])
+            if q._op == 'upsert':
+                return Result(self._upsert(data, q))
+            if q._op == 'update':
+                changed = self._matching(q, data, ordered=False)
+                self._update(q._table, changed, q._payload)
+                return Result([dict(row) for row in changed])
+            if q._op == 'delete':
+                gone = self._matching(q, data, ordered=False)
+                if gone:
+                    gone_ids = {id(row) for row in gone}
+                    data[:] = [row for row in data if id(row) not in gone_ids]
+                    self._removed(q._table, gone)
+                return Result(gone)
+
+            matched = self._matching(q, data)
+            count = len(matched) if q._count else None
+            if q._head:
+                return Result(None, count)
+            end = None if q._limit is None else q._offset + q._limit
+            page = [q._project(row) for row in matched[q._offset:end]]
+            if q._single:
+                if len(page) != 1:
+                    raise BackendError(f"PGRST116: single() matched {len(page)} rows in {q._table}")
+                return Result(page[0], count)
+            return Result(page, count)
+
+    def _upsert(self, data: List[Dict], q: _Query) -> List[Dict]:
+        keys = [c.strip() for c in q._on_conflict.split(',')]
+        payload = q._payload if isinstance(q._payload, list) else [q._payload]
+        out = []
+        for new in payload:
+            existing = None
+            if all(k in new for k in keys):
+                candidates = self._lookup(q._table, keys[0], [new[keys[0]]])
+                existing = next((row for row in candidates if all(row.get(k) == new[k] for k in keys)), None)
+            if existing is None:
+                existing = self._with_defaults(new)
+                data.append(existing)
+                self._added(q._table, [existing])
+            else:
+                self._update(q._table, [existing], new)
+            out.append(dict(existing))
+        return out
+
+    # ─── INDEXES ───────────────────────────────
+
+    def _matching(self, q: _Query, data: List[Dict], ordered: bool = True) -> List[Dict]:
+        """Rows matching q's filters (in q's order unless ordered=False).
+
+        The smallest eq()/in_() index bucket (or union of buckets, for an
+        or_() of equalities) narrows the rows scanned, and
+        an ascending order(col).limit(n) read (a stream_rows page) walks the
+        sorted view of col from its gt()/gte() bound, stopping after n
+        matches.  Every candidate is still checked against all filters.
+        """
+        bucket = None
+        for op, column, value, negate in q._conds:
+            if negate:
+                continue
+            if op in ('eq', 'in'):
+                rows = self._lookup(q._table, column, value if op == 'in' else [value])
+            elif op == 'or' and all(c[0] in ('eq', 'in') and not c[3] for c in value):
+                # Union of the alternatives' buckets
+                found = {}
+                for c_op, c_column, c_value, _ in value:
+                    for row in self._lookup(q._table, c_column, c_value if c_op == 'in' else [c_value]):
+                        found[id(row)] = row
+                rows = sorted(found.values(), key=lambda row: self._seq[id(row)])
+            else:
+                continue
+            if bucket is None or len(rows) < len(bucket):
+                bucket = rows
+        if (ordered and len(q._order) == 1 and not q._order[0][1] and q._limit is not None
+                and not q._count and (bucket is None or len(bucket) * 8 > len(data))):
+            page = self._scan_view(q, q._order[0][0], q._offset + q._limit)
+            if page is not None:
+                return page
+        matched = [row for row in (data if bucket is None else bucket) if q._matches(row)]
+        return q._sorted(matched) if ordered else matched
+
+    def _index(self, table: str, column: str) -> Dict[Any, List[Dict]]:
+        by_column = self._indexes.setdefault(table, {})
+        index = by_column.get(column)
+        if index is None:
+            index = by_column[column] = {}
+            for row in self.tables[table]:
+                value = row.get(column)
+                if value is not None:
+                    index.setdefault(_index_key(value), []).append(row)
+        return index
+
+    def _lookup(self, table: str, column: str, values: List[Any]) -> List[Dict]:
+        """Rows whose `column` may equal one of `values`, in insertion order."""
+        index = self._index(table, column)
+        buckets = [index.get(_index_key(v), []) for v in {_index_key(v): v for v in values}.values()
+                   if v is not None]
+        buckets = [b for b in buckets if b]
+        if len(buckets) == 1:
+            return buckets[0]
+        return sorted((row for b in buckets for row in b), key=lambda row: self._seq[id(row)])
+
+    def _view(self, table: str, column: str) -> Optional[tuple]:
+        key = (table, column)
+        if key not in self._views:
+            rows = self.tables[table]
+            keys = [_comparable(row.get(column)) for row in rows]
+            if rows and (None in keys or len({type(k) for k in keys}) > 1):
+                self._views[key] = None
+            else:
+                order = sorted(range(len(rows)), key=keys.__getitem__)
+                self._views[key] = ([keys[i] for i in order], [rows[i] for i in order])
+        return self._views[key]
+
+    def _scan_view(self, q: _Query, column: str, wanted: int) -> Optional[List[Dict]]:
+        """The first `wanted` matches in ascending `column` order, or None without a view."""
+        view = self._view(q._table, column)
+        if view is None:
+            return None
+        keys, rows = view
+        start = 0
+        for op, col, value, negate in q._conds:
+            if col == column and op in ('gt', 'gte') and not negate:
+                bound = _comparable(value)
+                if keys and type(bound) is type(keys[0]):
+                    find = bisect.bisect_right if op == 'gt' else bisect.bisect_left
+                    start = max(start, find(keys, bound))
+        page = []
+        for row in itertools.islice(rows, start, None):
+            if q._matches(row):
+                page.append(row)
+                if len(page) >= wanted:
+                    break
+        return page
+
+    def _added(self, table: str, rows: List[Dict]):
+        for row in rows:
+            self._seq[id(row)] = next(self._next_seq)
+        for column, index in self._indexes.get(table, {}).items():
+            for row in rows:
+                if row.get(column) is not None:
+                    index.setdefault(_index_key(row[column]), []).append(row)
+        for key, view in list(self._views.items()):
+            if key[0] != table or view is None:
+                continue
+            keys, view_rows = view
+            for row in rows:
+                value = _comparable(row.get(key[1]))
+                if value is None or (keys and type(value) is not type(keys[0])):
+                    del self._views[key]
+                    break
+                pos = bisect.bisect_right(keys, value)
+                keys.insert(pos, value)
+                view_rows.insert(pos, row)
+
+    def _unindex(self, table: str, rows: List[Dict], columns: Iterable[str]):
+        indexes = self._indexes.get(table, {})
+        for column in columns:
+            index = indexes.get(column)
+            if index is None:
+                continue
+            for row in rows:
+                if row.get(column) is None:
+                    continue
+                bucket = index.get(_index_key(row[column]), [])
+                pos = bisect.bisect_left(bucket, self._seq[id(row)], key=lambda r: self._seq[id(r)])
+                if pos < len(bucket) and bucket[pos] is row:
+                    bucket.pop(pos)
+
+    def _update(self, table: str, rows: List[Dict], values: Dict):
+        """Apply `values` to `rows` in place, moving them between index buckets."""
+        columns = [c for c in values if c in self._indexes.get(table, {})]
+        self._unindex(table, rows, columns)
+        for row in rows:
+            row.update(values)
+        for column in columns:
+            index = self._indexes[table][column]
+            for row in rows:
+                if row.get(column) is not None:
+                    bucket = index.setdefault(_index_key(row[column]), [])
+                    bisect.insort(bucket, row, key=lambda r: self._seq[id(r)])
+        for column in values:
+            self._views.pop((table, column), None)
+
+    def _removed(self, table: str, rows: List[Dict]):
+        self._unindex(table, rows, list(self._indexes.get(table, {})))
+        for row in rows:
+            self._seq.pop(id(row), None)
+        for key in [k for k in self._views if k[0] == table]:
+            del self._views[key]
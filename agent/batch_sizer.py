@@ -0,0 +1,68 @@
+"""
+Adaptive batch sizing for the autonomous loop.
+
+Every send batch pays a fixed setup cost before the first send: settings,
+the daily-capacity check, the sender pool, the lead/prospect candidate
+queries, the outreach state and the bounce suppression list.  A fixed
+batch of 5 re-paid that cost every 5 sends no matter how slow setup was.
+
+`BatchSizer` sizes each batch from measured latencies instead: large enough
+that setup is at most `target_setup_fraction` of the batch's wall time, but
+small enough that one batch (sends plus the inter-send gaps) stays under
+`max_batch_seconds`, so pause/resume, limits and send hours are still
+re-checked at a bounded interval.
+
+Pure Python with no Supabase dependency: the agent records the 'batch_setup'
+and 'send' phases into a LatencyStats.
+"""
+
+import math
+
+from latency import SEND_PHASE, SETUP_PHASE, LatencyStats
+
+# Batch size until there are setup and send samples (the old fixed size)
+DEFAULT_BATCH_SIZE = 5
+MIN_BATCH_SIZE = 1
+MAX_BATCH_SIZE = 50
+# Setup may take at most this fraction of a batch's wall time
+TARGET_SETUP_FRACTION = 0.1
+# Settings are re-checked between batches, so cap one batch at 10 minutes
+MAX_BATCH_SECONDS = 10 * 60
+
+
+def adaptive_batch_size(setup_seconds: float, per_send_seconds: float, remaining: int,
+                        target_setup_fraction: float = TARGET_SETUP_FRACTION,
+                        max_batch_seconds: float = MAX_BATCH_SECONDS,
+                        min_size: int = MIN_BATCH_SIZE, max_size: int = MAX_BATCH_SIZE) -> int:
+    """Smallest batch that amortises setup to the target fraction, within bounds.
+
+    setup / (setup + n * per_send) <= f   =>   n >= setup * (1 - f) / (f * per_send)
+    """
+    if remaining <= 0:
+        return 0
+    per_send_seconds = max(per_send_seconds, 0.001)
+    amortised = math.ceil(setup_seconds * (1 - target_setup_fraction)
+                          / (target_setup_fraction * per_send_seconds))
+    time_bound = max(min_size, math.floor(max_batch_seconds / per_send_seconds))
+    return max(min_size, min(amortised, time_bound, max_size, remaining))
+
+
+class BatchSizer:
+    """Size batches from the rolling 'batch_setup' and 'send' latencies."""
+
+    def __init__(self, stats: LatencyStats, default_size: int = DEFAULT_BATCH_SIZE,
+                 target_setup_fraction: float = TARGET_SETUP_FRACTION,
+                 max_batch_seconds: float = MAX_BATCH_SECONDS):
+        self.stats = stats
+        self.default_size = default_size
+        self.target_setup_fraction = target_setup_fraction
+        self.max_batch_seconds = max_batch_seconds
+
+    def size(self, remaining: int, gap_seconds: float = 0.0) -> int:
+        """Batch size for `remaining` budget; gap_seconds is the wait after each send."""
+        setup = self.stats.mean(SETUP_PHASE)
+        send = self.stats.mean(SEND_PHASE)
+        if setup is None or send is None:
+            return max(0, min(self.default_size, remaining))
+        return adaptive_batch_size(setup, send + gap_seconds, remaining,
+                                   self.target_setup_fraction, self.max_batch_seconds)
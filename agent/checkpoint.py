@@ -0,0 +1,153 @@
+"""
+Run checkpoint so a scheduled run resumes where the previous one stopped.
+
+Every `auto` run used to start from zero: full bounce and reply scans, a
+follow-up pass on the first loop, sender rotation counts reset, and the
+same skipped candidates re-evaluated every batch.  The checkpoint is a
+small JSON file in SDR_CACHE_DIR (next to the suppression indexes, which
+keep their own watermarks) holding:
+
+  * when the bounce scan and the reply scan last completed, so Phase 1 is
+    skipped when it ran recently and otherwise only covers the time since;
+  * the Gmail history id at the last reply scan, so the next scan only
+    opens threads that received messages since then;
+  * when follow-ups next fall due, so Phase 2 skips an empty first pass;
+  * per UTC day, each sender's sends (rotation state) and the queue items
+    already evaluated and skipped (the queue cursor).
+
+A checkpoint older than `max_age` is ignored, and day-scoped state is
+dropped once the UTC day changes.  Writes go to a temporary file that is
+renamed over the old one, so a run killed mid-write leaves the previous
+checkpoint intact.
+
+Pure Python with no Supabase dependency.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Set
+
+CHECKPOINT_VERSION = 1
+# A checkpoint this old no longer describes the current state
+CHECKPOINT_MAX_AGE_SECONDS = 2 * 24 * 3600
+
+# Keys reset when the UTC day changes
+_DAY_SCOPED = ('sent_in_run', 'parked')
+
+
+def _utc_day(now: datetime) -> str:
+    return now.astimezone(timezone.utc).strftime('%Y-%m-%d')
+
+
+class RunCheckpoint:
+    """JSON-file checkpoint of resumable run state.
+
+    Args:
+        path: Checkpoint file (created with its directory on first save).
+        max_age: Seconds after which a saved checkpoint is ignored.
+        clock: Returns the current UTC datetime.
+    """
+
+    def __init__(self, path: str, max_age: float = CHECKPOINT_MAX_AGE_SECONDS,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self.path = path
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = self._load()
+        # True when the state came from an earlier run
+        self.resumed = bool(self._state)
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(state, dict) or state.get('version') != CHECKPOINT_VERSION:
+            return {}
+        try:
+            saved_at = datetime.fromisoformat(state['saved_at'])
+        except (KeyError, TypeError, ValueError):
+            return {}
+        if (self._clock() - saved_at).total_seconds() > self.max_age:
+            return {}
+        return state
+
+    def save(self):
+        """Write the checkpoint atomically."""
+        with self._lock:
+            self._state['version'] = CHECKPOINT_VERSION
+            self._state['saved_at'] = self._clock().isoformat()
+            data = json.dumps(self._state, sort_keys=True)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    # ─── TIMESTAMPS AND VALUES ─────────────────
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._state.get(key, default)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._state[key] = value
+
+    def time(self, key: str) -> Optional[datetime]:
+        value = self.get(key)
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+
+    def mark(self, key: str, when: Optional[datetime] = None):
+        """Record `when` (default now) under `key`."""
+        self.set(key, (when or self._clock()).isoformat())
+
+    def due(self, key: str, interval_seconds: float) -> bool:
+        """True unless `key` was marked less than `interval_seconds` ago."""
+        last = self.time(key)
+        return last is None or (self._clock() - last).total_seconds() >= interval_seconds
+
+    # ─── DAY-SCOPED STATE ──────────────────────
+
+    def _today(self) -> Dict[str, Any]:
+        # Caller holds the lock
+        day = _utc_day(self._clock())
+        if self._state.get('day') != day:
+            self._state['day'] = day
+            for key in _DAY_SCOPED:
+                self._state.pop(key, None)
+        return self._state
+
+    def sender_sent(self, email: str) -> int:
+        """Sends from `email` today across runs (sender rotation state)."""
+        with self._lock:
+            return int(self._today().get('sent_in_run', {}).get(email, 0))
+
+    def record_sender_send(self, email: str):
+        with self._lock:
+            counts = self._today().setdefault('sent_in_run', {})
+            counts[email] = int(counts.get(email, 0)) + 1
+
+    def parked(self) -> Set[str]:
+        """Queue items evaluated and skipped today; they wait for the next day."""
+        with self._lock:
+            return set(self._today().get('parked', []))
+
+    def park(self, key: str):
+        with self._lock:
+            parked = self._today().setdefault('parked', [])
+            if key not in parked:
+                parked.append(key)
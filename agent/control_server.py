@@ -0,0 +1,104 @@
+"""
+Local control surface for the long-running daemon.
+
+`ai_sdr_agent.py daemon` serves a small JSON API on 127.0.0.1 so an
+operator, a health check or a service manager can talk to the running
+process directly instead of through agent_settings:
+
+  GET  /status   phase, counters, pause/drain state, latency summary
+  POST /pause    stop after the send in progress and wait
+  POST /resume   continue after a pause
+  POST /drain    finish the send in progress, flush writes and exit
+
+e.g. `curl -s localhost:8765/status` or `curl -X POST localhost:8765/drain`.
+When a token is configured every request must send
+`Authorization: Bearer <token>`.
+
+Pure Python with no Supabase dependency: the agent wires in one callable
+per command, each returning a JSON-serialisable dict.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Optional
+
+DEFAULT_CONTROL_PORT = 8765
+# Commands that only read state and may be called with GET
+READ_ONLY_COMMANDS = ('status',)
+
+
+class ControlServer:
+    """Serve `commands` as /<name> endpoints on a localhost HTTP port.
+
+    Args:
+        commands: Command name -> callable returning a dict.
+        host: Interface to bind (keep it local).
+        port: TCP port; 0 picks a free one (see `port` after start()).
+        token: Optional shared secret required as a Bearer token.
+        read_only: Commands that answer GET; all others need POST.
+    """
+
+    def __init__(self, commands: Dict[str, Callable[[], Dict]], host: str = '127.0.0.1',
+                 port: int = DEFAULT_CONTROL_PORT, token: Optional[str] = None,
+                 read_only: Iterable[str] = READ_ONLY_COMMANDS):
+        self.commands = dict(commands)
+        self.host = host
+        self.port = port
+        self.token = token
+        self.read_only = set(read_only)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _handle(self, method: str, path: str, auth: Optional[str]):
+        """(HTTP status, body dict) for one request."""
+        if self.token and auth != f'Bearer {self.token}':
+            return 401, {'error': 'unauthorized'}
+        name = path.split('?', 1)[0].strip('/')
+        command = self.commands.get(name)
+        if command is None:
+            return 404, {'error': f'unknown command {name!r}', 'commands': sorted(self.commands)}
+        if method == 'GET' and name not in self.read_only:
+            return 405, {'error': f'{name} needs POST'}
+        try:
+            return 200, command()
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    def start(self):
+        """Bind and serve from a daemon thread."""
+        if self._server is not None:
+            return
+        control = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, method):
+                status, body = control._handle(method, self.path, self.headers.get('Authorization'))
+                data = json.dumps(body, default=str).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.1},
+                                        name='control', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,84 @@
+"""
+Fair interleaving of send turns across orgs for the multi-org orchestrator.
+
+The orchestrator runs every enabled org in one process and hands out send
+turns one at a time.  `FairShare.pick()` chooses among the orgs that can
+send now (send window open, capacity left, the org's inter-send gap over)
+the one furthest behind its share: sends this run divided by its weight
+(the org's daily cap), so an org with a 200/day cap gets four turns for
+every one of a 50/day org, and nobody starves.  Ties go to the org served
+least recently.
+
+When no org can send, `pick()` returns the earliest time one can, so the
+orchestrator sleeps exactly until then.
+
+Pure Python with no Supabase dependency.
+"""
+
+import itertools
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+
+class FairShare:
+    """Weighted fair choice of the next org to send."""
+
+    def __init__(self):
+        self._weights: Dict[str, float] = {}
+        self._sent: Dict[str, int] = {}
+        self._not_before: Dict[str, datetime] = {}
+        self._last_turn: Dict[str, int] = {}
+        self._turns = itertools.count(1)
+
+    def set_org(self, org_id: str, weight: float):
+        """Add an org or update its weight (its daily cap; at least 1)."""
+        self._weights[org_id] = max(1.0, float(weight or 1))
+        self._sent.setdefault(org_id, 0)
+        self._last_turn.setdefault(org_id, 0)
+
+    def remove(self, org_id: str):
+        for table in (self._weights, self._sent, self._not_before, self._last_turn):
+            table.pop(org_id, None)
+
+    def orgs(self):
+        return list(self._weights)
+
+    def defer(self, org_id: str, until: Optional[datetime]):
+        """Skip the org until `until` (idle, capacity exhausted); None clears it."""
+        if until is None:
+            self._not_before.pop(org_id, None)
+        else:
+            self._not_before[org_id] = until
+
+    def record(self, org_id: str, sent: int):
+        """Count a turn and the emails it sent."""
+        self._sent[org_id] = self._sent.get(org_id, 0) + sent
+        self._last_turn[org_id] = next(self._turns)
+
+    def share(self, org_id: str) -> float:
+        return self._sent.get(org_id, 0) / self._weights.get(org_id, 1.0)
+
+    def pick(self, now: datetime,
+             eligible_at: Dict[str, Optional[datetime]]) -> Tuple[Optional[str], Optional[datetime]]:
+        """(org to serve now or None, earliest time any org becomes eligible).
+
+        eligible_at maps org_id to when it could next send by its own rules
+        (None = not at all, e.g. paused); deferrals are applied on top.
+        """
+        ready = []
+        wake_at: Optional[datetime] = None
+        for org_id in self._weights:
+            at = eligible_at.get(org_id)
+            if at is None:
+                continue
+            not_before = self._not_before.get(org_id)
+            if not_before is not None and not_before > at:
+                at = not_before
+            if at <= now:
+                ready.append(org_id)
+            elif wake_at is None or at < wake_at:
+                wake_at = at
+        if not ready:
+            return None, wake_at
+        org_id = min(ready, key=lambda o: (self.share(o), self._last_turn.get(o, 0)))
+        return org_id, now
@@ -0,0 +1,80 @@
+"""
+Follow-up due computation shared by the agent and its in-memory fakes.
+
+`compute_due_followups` is the reference implementation of the
+`get_due_followups` RPC (supabase/add_due_followups_rpc.sql).  The agent
+uses it as a fallback when the RPC is not deployed, and tests / fake
+backends use it to serve the same contract offline.
+
+Contract — one item per outreach thread that is due, oldest first:
+    {'original': <initial outreach_log row>,
+     'next_followup_number': 1 | 2,
+     'lead': <leads row for original.lead_id, or None>}
+
+A thread is keyed by (lower(contact_email), lower(website)).  It is due for
+follow-up #1 when its initial email is at least `fu1_days` old and no
+follow-up exists yet, and for follow-up #2 when its latest follow-up #1 is
+at least `fu2_days` old and no follow-up #2 exists.  Threads with a recorded
+reply or bounce are never due.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+FOLLOWUP_1_DELAY_DAYS = 3
+FOLLOWUP_2_DELAY_DAYS = 5
+MAX_FOLLOWUP_NUMBER = 2
+
+
+def _ts(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def compute_due_followups(outreach_rows: Iterable[Dict], leads_by_id: Optional[Dict[str, Dict]],
+                          now: datetime, fu1_days: int = FOLLOWUP_1_DELAY_DAYS,
+                          fu2_days: int = FOLLOWUP_2_DELAY_DAYS, org_id: Optional[str] = None,
+                          limit: Optional[int] = None) -> List[Dict]:
+    """Return the follow-ups due at `now` (see module docstring for the contract)."""
+    threads: Dict[tuple, Dict] = {}
+    for row in outreach_rows:
+        if org_id and row.get('org_id') != org_id:
+            continue
+        key = ((row.get('contact_email') or '').lower(), (row.get('website') or '').lower())
+        thread = threads.setdefault(key, {'original': None, 'max_fu': 0, 'fu1_sent_at': None, 'closed': False})
+        fu_number = row.get('followup_number') or 0
+        sent_at = _ts(row.get('sent_at'))
+
+        thread['max_fu'] = max(thread['max_fu'], fu_number)
+        if row.get('replied_at') or row.get('bounced'):
+            thread['closed'] = True
+        if fu_number == 0:
+            current = thread['original']
+            if current is None or (sent_at and _ts(current.get('sent_at')) and sent_at < _ts(current['sent_at'])):
+                thread['original'] = row
+        elif fu_number == 1 and sent_at:
+            if thread['fu1_sent_at'] is None or sent_at > thread['fu1_sent_at']:
+                thread['fu1_sent_at'] = sent_at
+
+    fu1_cutoff = now - timedelta(days=fu1_days)
+    fu2_cutoff = now - timedelta(days=fu2_days)
+    due = []
+    for thread in threads.values():
+        original = thread['original']
+        if original is None or thread['closed']:
+            continue
+        original_sent = _ts(original.get('sent_at'))
+        if thread['max_fu'] == 0 and original_sent and original_sent <= fu1_cutoff:
+            next_number = 1
+        elif thread['max_fu'] == 1 and thread['fu1_sent_at'] and thread['fu1_sent_at'] <= fu2_cutoff:
+            next_number = 2
+        else:
+            continue
+        lead = (leads_by_id or {}).get(original.get('lead_id')) if original.get('lead_id') else None
+        due.append({'original': original, 'next_followup_number': next_number, 'lead': lead})
+
+    due.sort(key=lambda item: _ts(item['original'].get('sent_at')))
+    return due[:limit] if limit else due
@@ -0,0 +1,98 @@
+"""
+Background heartbeat publisher.
+
+A daemon thread publishes `last_heartbeat` plus a small status snapshot
+(current phase, loop count, sends so far) on its own interval, so the
+dashboard keeps seeing the agent while the work loop is inside a long
+send batch, a follow-up pass or an inter-send sleep.  The work loop only
+updates in-memory status and never does heartbeat I/O itself.
+
+The publisher is pure Python and has no Supabase dependency: the agent
+wires in the publish callable.
+"""
+
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+# agent_health (agent/agent/agent_heartbeat_migration.sql) flags the agent
+# as 'warning' after 2 minutes without a heartbeat
+DEFAULT_HEARTBEAT_INTERVAL_SECONDS = 60.0
+
+
+class Heartbeat:
+    """Publish a heartbeat and status snapshot from a daemon thread.
+
+    Args:
+        publish: Callable taking (heartbeat_iso, status_dict).
+        interval: Seconds between heartbeats.
+        on_error: Called with the exception when a publish fails; the
+            thread keeps running.
+    """
+
+    def __init__(self, publish: Callable[[str, Dict], None],
+                 interval: float = DEFAULT_HEARTBEAT_INTERVAL_SECONDS,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self._publish = publish
+        self.interval = interval
+        self._on_error = on_error
+        self._status: Dict = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_beat: Optional[datetime] = None
+
+    def update(self, publish_now: bool = False, **fields):
+        """Merge fields into the published status (e.g. phase='sending')."""
+        with self._lock:
+            self._status.update(fields)
+        if publish_now:
+            self._wake.set()
+
+    def incr(self, field: str, n: int = 1):
+        """Add n to a numeric status field (e.g. incr('sent'))."""
+        with self._lock:
+            self._status[field] = self._status.get(field, 0) + n
+
+    def status(self) -> Dict:
+        with self._lock:
+            return dict(self._status)
+
+    def beat(self):
+        """Publish one heartbeat now, from the calling thread."""
+        now = datetime.now(timezone.utc)
+        status = self.status()
+        status['updated_at'] = now.isoformat()
+        try:
+            self._publish(now.isoformat(), status)
+            self.last_beat = now
+        except Exception as e:
+            if self._on_error:
+                self._on_error(e)
+
+    def start(self):
+        """Publish immediately, then every `interval` seconds until stop()."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='heartbeat', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.beat()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def stop(self, final_phase: Optional[str] = None, timeout: float = 5.0):
+        """Stop the thread, optionally publishing a last status (e.g. 'stopped')."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout)
+        if final_phase:
+            self.update(phase=final_phase)
+            self.beat()
@@ -0,0 +1,86 @@
+"""
+Rolling per-phase latency samples for the autonomous loop.
+
+The loop times its phases (batch setup, one send, ...) and records them
+here; batch sizing reads the means to amortise setup cost, and admission
+control reads the p95s to keep work clear of the run deadline.  Only the
+most recent `window` samples per phase are kept, so estimates follow the
+current network and database conditions rather than the whole run.
+
+Pure Python with no Supabase dependency.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+# Samples kept per phase
+DEFAULT_LATENCY_WINDOW = 200
+
+# Phases timed by the agent
+SETUP_PHASE = 'batch_setup'        # capacity check .. first send of a batch
+SEND_PHASE = 'send'                # one lead/prospect: verify, generate, send, record
+FOLLOWUP_PHASE = 'followup_send'   # one follow-up reply
+REPLY_CHECK_PHASE = 'reply_check'  # one reply-check pass
+
+
+class LatencyStats:
+    """Rolling latency samples (seconds) keyed by phase name."""
+
+    def __init__(self, window: int = DEFAULT_LATENCY_WINDOW):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(phase)
+            if samples is None:
+                samples = self._samples[phase] = deque(maxlen=self.window)
+            samples.append(max(0.0, float(seconds)))
+
+    @contextmanager
+    def timer(self, phase: str) -> Iterator[None]:
+        """Record the wall time of the with-block under `phase` (also on error)."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(phase, time.monotonic() - started)
+
+    def count(self, phase: str) -> int:
+        with self._lock:
+            return len(self._samples.get(phase, ()))
+
+    def mean(self, phase: str, default: Optional[float] = None) -> Optional[float]:
+        with self._lock:
+            samples = self._samples.get(phase)
+            if not samples:
+                return default
+            return sum(samples) / len(samples)
+
+    def percentile(self, phase: str, pct: float, default: Optional[float] = None) -> Optional[float]:
+        """Nearest-rank percentile of the recent samples (pct in 0..100)."""
+        with self._lock:
+            samples = self._samples.get(phase)
+            if not samples:
+                return default
+            ordered = sorted(samples)
+        rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def p95(self, phase: str, default: Optional[float] = None) -> Optional[float]:
+        return self.percentile(phase, 95, default)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{phase: {'count', 'mean', 'p95'}} for every phase with samples."""
+        with self._lock:
+            phases = list(self._samples)
+        return {
+            phase: {'count': self.count(phase), 'mean': round(self.mean(phase, 0.0), 3),
+                    'p95': round(self.p95(phase, 0.0), 3)}
+            for phase in phases
+        }
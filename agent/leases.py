@@ -0,0 +1,143 @@
+"""
+Expiring leases so several agent workers can run side by side.
+
+Two `ai_sdr_agent.py auto` processes (say a manual workflow_dispatch
+overlapping the cron run) used to work from the same outreach snapshot and
+could email the same contact twice.  With leases (agent_leases table, see
+supabase/add_agent_leases.sql):
+
+  * `acquire()` takes run-long leases — the org's maintenance lease and one
+    per sender inbox — which are renewed from the heartbeat and released
+    on close.  A crashed worker's leases expire after `ttl` seconds.
+  * `claim()` atomically takes short-lived claims on work items (leads,
+    prospects, follow-ups).  Each item goes to exactly one worker; claims
+    are not renewed or released, they expire once the send's writes have
+    landed, so a worker with a stale cache can't pick the item up again.
+
+When the lease RPCs are not deployed yet every call succeeds locally, which
+is the old single-worker behaviour.  Other RPC errors fail closed (nothing
+acquired or claimed) so a database hiccup never leads to a double send.
+
+Pure Python with no Supabase dependency: the agent wires in the rpc
+callable, which takes (function_name, params) and returns the result rows.
+"""
+
+import os
+import socket
+import threading
+import uuid
+from typing import Any, Callable, Iterable, Optional, Set
+
+# Run-long leases (org, senders) expire this long after the last renewal;
+# the heartbeat renews them every minute
+DEFAULT_LEASE_TTL_SECONDS = 300
+# Work-item claims cover the send plus the outbox replay of its writes
+WORK_CLAIM_TTL_SECONDS = 15 * 60
+
+_MISSING_FUNCTION_MARKERS = ('PGRST202', 'Could not find the function', 'does not exist')
+
+
+def default_holder_id() -> str:
+    """Unique id for this worker process: host:pid:random."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseManager:
+    """Acquire, renew and release leases through the agent_leases RPCs.
+
+    Args:
+        rpc: Callable taking (function_name, params) and returning rows.
+        holder: This worker's id (default: host:pid:random).
+        ttl: Seconds a run-long lease lasts without renewal.
+        on_error: Called with (exception, function_name) when an RPC fails.
+    """
+
+    def __init__(self, rpc: Callable[[str, dict], Any], holder: Optional[str] = None,
+                 ttl: int = DEFAULT_LEASE_TTL_SECONDS,
+                 on_error: Optional[Callable[[Exception, str], None]] = None):
+        self._rpc = rpc
+        self.holder = holder or default_holder_id()
+        self.ttl = ttl
+        self._on_error = on_error
+        self._lock = threading.Lock()
+        # Run-long leases currently held (renewed by renew())
+        self.held: Set[str] = set()
+        # False once the RPCs turn out not to be deployed
+        self.enabled = True
+
+    def _call(self, name: str, params: dict) -> Optional[list]:
+        """Rows from the RPC, or None if it failed (and disables leasing if missing)."""
+        try:
+            rows = self._rpc(name, params)
+        except Exception as e:
+            if any(marker in str(e) for marker in _MISSING_FUNCTION_MARKERS):
+                # Not migrated yet: behave like a single worker
+                self.enabled = False
+            if self._on_error:
+                self._on_error(e, name)
+            return None
+        return rows if isinstance(rows, list) else []
+
+    @staticmethod
+    def _resources(rows: list) -> Set[str]:
+        # SETOF TEXT comes back as bare strings or {'claim_leases': ...} rows
+        out = set()
+        for row in rows:
+            if isinstance(row, dict):
+                row = next(iter(row.values()), None)
+            if row:
+                out.add(row)
+        return out
+
+    def _claim(self, resources: Iterable[str], org_id: Optional[str], ttl: int) -> Set[str]:
+        wanted = list(dict.fromkeys(resources))
+        if not wanted:
+            return set()
+        if not self.enabled:
+            return set(wanted)
+        rows = self._call('claim_leases', {
+            'p_holder': self.holder, 'p_resources': wanted,
+            'p_ttl_seconds': int(ttl), 'p_org_id': org_id,
+        })
+        if rows is None:
+            return set() if self.enabled else set(wanted)
+        return self._resources(rows) & set(wanted)
+
+    def acquire(self, resources: Iterable[str], org_id: Optional[str] = None) -> Set[str]:
+        """Take (or keep) run-long leases; returns the ones this worker now holds."""
+        wanted = set(resources)
+        got = self._claim(wanted, org_id, self.ttl)
+        with self._lock:
+            self.held -= wanted - got
+            self.held |= got
+        return got
+
+    def claim(self, resources: Iterable[str], org_id: Optional[str] = None,
+              ttl: int = WORK_CLAIM_TTL_SECONDS) -> Set[str]:
+        """Atomically claim work items; returns the ones no other worker holds."""
+        return self._claim(resources, org_id, ttl)
+
+    def renew(self) -> int:
+        """Extend the run-long leases; leases lost meanwhile are dropped from `held`."""
+        with self._lock:
+            held = sorted(self.held)
+        if not held or not self.enabled:
+            return len(held)
+        rows = self._call('renew_leases', {
+            'p_holder': self.holder, 'p_resources': held, 'p_ttl_seconds': int(self.ttl),
+        })
+        if rows is None:
+            return len(held)
+        kept = self._resources(rows)
+        with self._lock:
+            self.held &= kept | (self.held - set(held))
+        return len(kept)
+
+    def release(self, resources: Optional[Iterable[str]] = None):
+        """Give up leases: all held run-long ones by default, or the given ones
+        (also work-item claims that were never attempted)."""
+        with self._lock:
+            targets = set(self.held if resources is None else resources)
+            self.held -= targets
+        if targets and self.enabled:
+            self._call('release_leases', {'p_holder': self.holder, 'p_resources': sorted(targets)})
@@ -0,0 +1,207 @@
+"""
+Durable local outbox for the database writes that follow a send.
+
+Once Gmail accepts a message, the outreach_log row (and the leads /
+prospects / prospect_contacts updates) must be written or the send is a
+"ghost": not counted against sender capacity and not seen by dedup, so the
+contact can be emailed again.  Those writes used to run inline on the send
+path with three quick retries, after which the row was simply lost.
+
+Now the send path records its writes here first, in one SQLite (WAL)
+transaction that is on disk before the send is reported, and a background
+thread replays them against the database until each one succeeds, with
+exponential backoff.  Entries left over by a crashed or killed run are
+replayed by the next run.  Every entry has an idempotency key (recording
+the same key twice is a no-op) and the apply callable is told when an
+entry may already have been applied by an earlier, interrupted attempt.
+
+The outbox is pure Python and has no Supabase dependency: the agent wires
+in the apply callable.  Ops are plain dicts, e.g.
+{'table': 'outreach_log', 'action': 'insert', 'values': {...},
+ 'unique': 'gmail_message_id'} or
+{'table': 'leads', 'action': 'update', 'values': {...}, 'match': {'id': ...}}.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_REPLAY_INTERVAL_SECONDS = 2.0
+# Backoff after a failed apply doubles from the first value up to the cap
+RETRY_BACKOFF_SECONDS = 5.0
+MAX_RETRY_BACKOFF_SECONDS = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    ref TEXT,
+    kind TEXT NOT NULL,
+    op TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_ref ON outbox (ref);
+"""
+
+
+class Outbox:
+    """SQLite-backed queue of post-send writes, replayed until they succeed.
+
+    Args:
+        path: SQLite file (created with its directory if missing).
+        apply: Callable taking (op, retry) that performs one op; `retry` is
+            True when an earlier attempt may have applied it already.
+        replay_interval: Seconds between background replays.
+        on_error: Called with (exception, op) when an apply fails.
+    """
+
+    def __init__(self, path: str, apply: Callable[[Dict, bool], None],
+                 replay_interval: float = DEFAULT_REPLAY_INTERVAL_SECONDS,
+                 on_error: Optional[Callable[[Exception, Dict], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self._apply = apply
+        self.replay_interval = replay_interval
+        self._on_error = on_error
+        self._clock = clock
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # A recorded send must survive power loss, not just a process crash
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.applied = 0
+        self.failures = 0
+
+    def record(self, key: str, ops: List[Dict], ref: Optional[str] = None) -> int:
+        """Durably queue `ops` (applied in order) under idempotency key `key`.
+
+        Returns how many ops were newly queued (0 if the key was seen before).
+        """
+        now = self._clock()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                for i, op in enumerate(ops):
+                    cur = self._db.execute(
+                        "INSERT OR IGNORE INTO outbox (key, ref, kind, op, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (f"{key}:{i}", ref, f"{op['table']}.{op['action']}", json.dumps(op, default=str), now),
+                    )
+                    added += cur.rowcount
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        if self._thread is not None:
+            self._wake.set()
+        return added
+
+    def pending(self, ref: Optional[str] = None, kind: Optional[str] = None) -> int:
+        """Number of queued ops, optionally only for one ref and/or kind."""
+        sql, args = "SELECT COUNT(*) FROM outbox WHERE 1=1", []
+        if ref is not None:
+            sql += " AND ref = ?"
+            args.append(ref)
+        if kind is not None:
+            sql += " AND kind = ?"
+            args.append(kind)
+        with self._lock:
+            return self._db.execute(sql, args).fetchone()[0]
+
+    def pending_ops(self, kind: Optional[str] = None) -> List[Dict]:
+        """Queued ops (decoded), oldest first, optionally only of one kind."""
+        sql, args = "SELECT op FROM outbox", []
+        if kind is not None:
+            sql += " WHERE kind = ?"
+            args.append(kind)
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY id", args).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def replay(self, force: bool = False) -> int:
+        """Apply every due op once, oldest first. Returns how many succeeded.
+
+        `force` ignores the backoff (used at shutdown and on startup).
+        """
+        with self._replay_lock:
+            now = self._clock()
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, op, attempts FROM outbox WHERE next_attempt_at <= ? ORDER BY id",
+                    (float('inf') if force else now,),
+                ).fetchall()
+            applied = 0
+            for entry_id, op_json, attempts in rows:
+                op = json.loads(op_json)
+                # Count the attempt before applying: if the process dies mid-apply,
+                # the next replay knows the op may already have landed
+                with self._lock:
+                    self._db.execute("UPDATE outbox SET attempts = attempts + 1 WHERE id = ?", (entry_id,))
+                try:
+                    self._apply(op, attempts > 0)
+                except Exception as e:
+                    self.failures += 1
+                    backoff = min(MAX_RETRY_BACKOFF_SECONDS, RETRY_BACKOFF_SECONDS * (2 ** attempts))
+                    with self._lock:
+                        self._db.execute(
+                            "UPDATE outbox SET next_attempt_at = ?, last_error = ? WHERE id = ?",
+                            (self._clock() + backoff, str(e)[:500], entry_id),
+                        )
+                    if self._on_error:
+                        self._on_error(e, op)
+                    continue
+                with self._lock:
+                    self._db.execute("DELETE FROM outbox WHERE id = ?", (entry_id,))
+                applied += 1
+            self.applied += applied
+            return applied
+
+    def start(self):
+        """Start the background replay thread and register the exit replay."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='outbox', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.replay_interval)
+            self._wake.clear()
+            try:
+                self.replay()
+            except Exception as e:
+                if self._on_error:
+                    self._on_error(e, {})
+
+    def close(self, timeout: float = 10.0):
+        """Stop the thread and try everything still queued once more.
+
+        Ops that still fail stay on disk for the next run.
+        """
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join(timeout)
+            try:
+                atexit.unregister(self.close)
+            except Exception:
+                pass
+        self.replay(force=True)
@@ -0,0 +1,124 @@
+"""
+Recipient timezone inference for per-recipient send windows.
+
+The send window (send_hour_start..send_hour_end on send_days) used to be
+applied in US/Eastern for everyone.  With recipient lanes it is applied in
+each recipient's local time instead, so the run can keep sending to Pacific,
+European or APAC recipients while the Eastern window is closed.
+
+`infer_timezone(row)` picks the most specific signal available on a lead or
+prospect row, falling back to SEND_TIMEZONE (US/Eastern):
+
+  1. an explicit IANA `timezone` (prospects.timezone, leads.metadata.timezone)
+  2. a US state / Canadian province (`state`, metadata.state)
+  3. a country code or name (prospects.hq_country, `country`, metadata.country)
+  4. the website's country-code TLD (.co.uk, .de, .com.au, ...)
+"""
+
+from typing import Dict, Optional
+
+from send_scheduler import SEND_TIMEZONE
+
+# Primary business timezone per ISO 3166-1 alpha-2 country
+COUNTRY_TIMEZONES = {
+    'US': 'US/Eastern', 'CA': 'America/Toronto', 'MX': 'America/Mexico_City',
+    'BR': 'America/Sao_Paulo', 'AR': 'America/Argentina/Buenos_Aires', 'CL': 'America/Santiago',
+    'CO': 'America/Bogota',
+    'GB': 'Europe/London', 'UK': 'Europe/London', 'IE': 'Europe/Dublin', 'PT': 'Europe/Lisbon',
+    'ES': 'Europe/Madrid', 'FR': 'Europe/Paris', 'BE': 'Europe/Brussels', 'NL': 'Europe/Amsterdam',
+    'LU': 'Europe/Luxembourg', 'DE': 'Europe/Berlin', 'CH': 'Europe/Zurich', 'AT': 'Europe/Vienna',
+    'IT': 'Europe/Rome', 'DK': 'Europe/Copenhagen', 'NO': 'Europe/Oslo', 'SE': 'Europe/Stockholm',
+    'FI': 'Europe/Helsinki', 'PL': 'Europe/Warsaw', 'CZ': 'Europe/Prague', 'GR': 'Europe/Athens',
+    'IL': 'Asia/Jerusalem', 'AE': 'Asia/Dubai', 'ZA': 'Africa/Johannesburg', 'IN': 'Asia/Kolkata',
+    'SG': 'Asia/Singapore', 'HK': 'Asia/Hong_Kong', 'JP': 'Asia/Tokyo', 'KR': 'Asia/Seoul',
+    'AU': 'Australia/Sydney', 'NZ': 'Pacific/Auckland',
+}
+
+_COUNTRY_NAMES = {
+    'united states': 'US', 'usa': 'US', 'united states of america': 'US', 'canada': 'CA',
+    'united kingdom': 'GB', 'england': 'GB', 'great britain': 'GB', 'ireland': 'IE',
+    'germany': 'DE', 'france': 'FR', 'netherlands': 'NL', 'spain': 'ES', 'italy': 'IT',
+    'sweden': 'SE', 'denmark': 'DK', 'norway': 'NO', 'finland': 'FI', 'australia': 'AU',
+    'new zealand': 'NZ', 'india': 'IN', 'singapore': 'SG', 'japan': 'JP', 'mexico': 'MX',
+    'brazil': 'BR', 'israel': 'IL',
+}
+
+# US states and Canadian provinces outside Eastern time
+_REGION_TIMEZONES = {
+    'US/Pacific': ('CA', 'WA', 'OR', 'NV', 'california', 'washington', 'oregon', 'nevada',
+                   'BC', 'british columbia'),
+    'America/Phoenix': ('AZ', 'arizona'),
+    'US/Mountain': ('CO', 'UT', 'NM', 'ID', 'MT', 'WY', 'colorado', 'utah', 'new mexico',
+                    'idaho', 'montana', 'wyoming', 'AB', 'alberta'),
+    'US/Central': ('TX', 'IL', 'MN', 'WI', 'MO', 'IA', 'KS', 'NE', 'OK', 'LA', 'AR', 'MS',
+                   'AL', 'TN', 'ND', 'SD', 'texas', 'illinois', 'minnesota', 'wisconsin',
+                   'missouri', 'iowa', 'kansas', 'nebraska', 'oklahoma', 'louisiana',
+                   'arkansas', 'mississippi', 'alabama', 'tennessee', 'north dakota',
+                   'south dakota', 'MB', 'manitoba', 'SK', 'saskatchewan'),
+    'US/Alaska': ('AK', 'alaska'),
+    'US/Hawaii': ('HI', 'hawaii'),
+}
+REGION_TIMEZONES = {
+    region.lower(): tz for tz, regions in _REGION_TIMEZONES.items() for region in regions
+}
+
+# Country-code TLDs (longest suffix wins)
+_TLD_COUNTRIES = {
+    '.co.uk': 'GB', '.uk': 'GB', '.ie': 'IE', '.de': 'DE', '.fr': 'FR', '.nl': 'NL', '.es': 'ES',
+    '.it': 'IT', '.se': 'SE', '.dk': 'DK', '.no': 'NO', '.fi': 'FI', '.be': 'BE', '.ch': 'CH',
+    '.at': 'AT', '.pl': 'PL', '.pt': 'PT', '.cz': 'CZ', '.gr': 'GR', '.com.au': 'AU', '.au': 'AU',
+    '.co.nz': 'NZ', '.nz': 'NZ', '.ca': 'CA', '.jp': 'JP', '.sg': 'SG', '.in': 'IN',
+    '.com.br': 'BR', '.br': 'BR', '.mx': 'MX', '.com.mx': 'MX', '.co.za': 'ZA', '.il': 'IL',
+}
+
+
+def _valid_tz(name: Optional[str]) -> Optional[str]:
+    if not name or not isinstance(name, str):
+        return None
+    try:
+        import pytz
+        pytz.timezone(name)
+        return name
+    except Exception:
+        return None
+
+
+def _country_tz(value: Optional[str]) -> Optional[str]:
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    code = value.upper() if len(value) == 2 else _COUNTRY_NAMES.get(value.lower())
+    return COUNTRY_TIMEZONES.get(code or '')
+
+
+def _tld_tz(website: Optional[str]) -> Optional[str]:
+    if not website:
+        return None
+    host = website.lower().replace('https://', '').replace('http://', '').split('/')[0].rstrip('.')
+    for suffix in sorted(_TLD_COUNTRIES, key=len, reverse=True):
+        if host.endswith(suffix):
+            return COUNTRY_TIMEZONES[_TLD_COUNTRIES[suffix]]
+    return None
+
+
+def infer_timezone(row: Optional[Dict], default: str = SEND_TIMEZONE) -> str:
+    """Best-guess IANA timezone for a lead / prospect row."""
+    if not row:
+        return default
+    metadata = row.get('metadata') if isinstance(row.get('metadata'), dict) else {}
+
+    for value in (row.get('timezone'), metadata.get('timezone')):
+        tz = _valid_tz(value)
+        if tz:
+            return tz
+    for value in (row.get('state'), metadata.get('state'), row.get('hq_state'), metadata.get('region')):
+        if isinstance(value, str) and value.strip():
+            tz = REGION_TIMEZONES.get(value.strip().lower())
+            if tz:
+                return tz
+    for value in (row.get('hq_country'), row.get('country'), row.get('country_code'),
+                  metadata.get('country'), metadata.get('country_code')):
+        tz = _country_tz(value)
+        if tz:
+            return tz
+    return _tld_tz(row.get('website')) or default
@@ -0,0 +1,137 @@
+"""
+Send-window arithmetic and a wakeable sleep for the autonomous loop.
+
+run_autonomous used to sleep in fixed 60s / 5 min / 30 min blocks and
+re-check, so it routinely woke long after the send window opened or the
+UTC day (and with it sender capacity) rolled over.  These helpers compute
+the exact next eligible time instead:
+
+  * `next_send_window_start` — next hour/day inside the configured send
+    window (send_hour_start..send_hour_end inclusive, send_days ISO
+    weekdays) in the send timezone.
+  * `next_utc_midnight` — when daily caps reset (outreach_log counts are per
+    UTC day).
+
+`Scheduler.sleep_until()` then sleeps until that moment, capped by the run
+deadline, and returns early when `wake()` is called — the agent wires this
+to settings changes so pausing/resuming or editing send hours takes effect
+immediately.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+SEND_TIMEZONE = 'US/Eastern'
+# Upper bound on one sleep, so a missed wake-up can never stall the loop for long
+MAX_SLEEP_SECONDS = 15 * 60
+
+
+def send_tz(tz_name: str = SEND_TIMEZONE):
+    """tzinfo for `tz_name` (fixed UTC-5 when pytz is unavailable)."""
+    try:
+        import pytz
+        return pytz.timezone(tz_name)
+    except ImportError:
+        return timezone(timedelta(hours=-5))
+    except Exception:
+        return timezone.utc
+
+
+def _local_at(tz, day, hour: int) -> datetime:
+    naive = datetime(day.year, day.month, day.day, hour)
+    if hasattr(tz, 'localize'):
+        return tz.localize(naive)
+    return naive.replace(tzinfo=tz)
+
+
+def is_within_send_window(now: datetime, send_start: int, send_end: int,
+                          send_days: List[int], tz_name: str = SEND_TIMEZONE) -> bool:
+    """True when `now` falls inside the send window (end hour inclusive)."""
+    local = now.astimezone(send_tz(tz_name))
+    return local.isoweekday() in send_days and send_start <= local.hour <= send_end
+
+
+def next_send_window_start(now: datetime, send_start: int, send_end: int,
+                           send_days: List[int], tz_name: str = SEND_TIMEZONE) -> Optional[datetime]:
+    """Start of the next send window at or after `now` (UTC), or None if there is none.
+
+    Returns `now` when already inside the window.
+    """
+    if is_within_send_window(now, send_start, send_end, send_days, tz_name):
+        return now
+    if not send_days or send_start > send_end:
+        return None
+    tz = send_tz(tz_name)
+    local_today = now.astimezone(tz).date()
+    for offset in range(8):
+        day = local_today + timedelta(days=offset)
+        if day.isoweekday() not in send_days:
+            continue
+        start = _local_at(tz, day, max(0, min(23, send_start)))
+        if start > now:
+            return start.astimezone(timezone.utc)
+    return None
+
+
+class SendWindow:
+    """The configured send window, evaluated in any recipient timezone.
+
+    Caches the open/next-open answer per timezone for one `now`, since a
+    queue build asks the same question for many recipients in few zones.
+    """
+
+    def __init__(self, now: datetime, send_start: int, send_end: int, send_days: List[int]):
+        self.now = now
+        self.send_start = send_start
+        self.send_end = send_end
+        self.send_days = send_days
+        self._opens_at = {}
+
+    def opens_at(self, tz_name: str = SEND_TIMEZONE) -> Optional[datetime]:
+        """`now` if open in tz_name, else when it next opens there (None = never)."""
+        if tz_name not in self._opens_at:
+            self._opens_at[tz_name] = next_send_window_start(
+                self.now, self.send_start, self.send_end, self.send_days, tz_name)
+        return self._opens_at[tz_name]
+
+    def is_open(self, tz_name: str = SEND_TIMEZONE) -> bool:
+        return self.opens_at(tz_name) == self.now
+
+
+def next_utc_midnight(now: datetime) -> datetime:
+    """When per-UTC-day send counts reset."""
+    tomorrow = now.astimezone(timezone.utc).date() + timedelta(days=1)
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=timezone.utc)
+
+
+class Scheduler:
+    """Sleep until a computed time, interruptible by wake()."""
+
+    def __init__(self, max_sleep: float = MAX_SLEEP_SECONDS,
+                 now: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        self.max_sleep = max_sleep
+        self._now = now
+        self._wake = threading.Event()
+        self.wake_reason: Optional[str] = None
+
+    def wake(self, reason: str = 'wake'):
+        """Interrupt the current (or next) sleep."""
+        self.wake_reason = reason
+        self._wake.set()
+
+    def sleep_until(self, when: Optional[datetime], deadline: Optional[datetime] = None) -> bool:
+        """Sleep until `when` (None = until woken), capped by deadline and max_sleep.
+
+        Returns True if woken early by wake().
+        """
+        now = self._now()
+        targets = [t for t in (when, deadline) if t is not None]
+        seconds = self.max_sleep
+        if targets:
+            seconds = min(seconds, max(0.0, (min(targets) - now).total_seconds()))
+        woke = self._wake.wait(seconds)
+        self._wake.clear()
+        if not woke:
+            self.wake_reason = None
+        return woke
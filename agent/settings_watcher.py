@@ -0,0 +1,144 @@
+"""
+Change-driven agent_settings cache.
+
+The agent used to refetch the whole agent_settings row at the top of every
+send batch, follow-up pass and loop iteration.  SettingsWatcher serves the
+row from memory and only pulls it again when its version changes:
+
+  * `fetch_version` returns agent_settings.settings_version (bumped by a
+    trigger on real settings edits, see supabase/add_settings_version.sql),
+    or None when the column is not there yet, in which case the watcher
+    falls back to refetching the row on each check.
+  * Checks are throttled to one per `poll_interval` seconds.  With
+    `start()`, a daemon thread does the checks so callers never wait on the
+    database, and `subscribe()` callbacks fire as soon as a change lands
+    (e.g. to wake a sleeping scheduler when the agent is paused/resumed).
+
+The watcher is pure Python and has no Supabase dependency: the agent wires
+in the two fetch callables.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Dashboard changes (pause, limits, send hours) take effect within this many seconds
+DEFAULT_SETTINGS_POLL_SECONDS = 10.0
+
+# Columns the agent itself writes; changes to them are not settings changes
+VOLATILE_FIELDS = ('last_heartbeat', 'agent_status', 'settings_version', 'updated_at')
+
+_UNSET = object()
+
+
+def _settings_differ(a: Dict, b: Dict) -> bool:
+    keys = (set(a) | set(b)) - set(VOLATILE_FIELDS)
+    return any(a.get(k) != b.get(k) for k in keys)
+
+
+class SettingsWatcher:
+    """Serve agent_settings from memory, refetching only on version change.
+
+    Args:
+        fetch_row: Callable returning the full settings dict.
+        fetch_version: Callable returning a cheap change marker, or None if
+            the backend has no version column.
+        poll_interval: Min seconds between version checks.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(self, fetch_row: Callable[[], Dict], fetch_version: Callable[[], Optional[Any]],
+                 poll_interval: float = DEFAULT_SETTINGS_POLL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self._fetch_row = fetch_row
+        self._fetch_version = fetch_version
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._settings: Optional[Dict] = None
+        self._version: Any = _UNSET
+        self._checked_at: Optional[float] = None
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.row_fetches = 0
+        self.version_checks = 0
+
+    def get(self, refresh: bool = False) -> Dict:
+        """Return the settings row.
+
+        refresh=True asks for fresh settings: it checks the version unless a
+        check happened within `poll_interval` (or the background thread is
+        doing the checks), and refetches the row only if it changed.
+        """
+        if self._settings is None:
+            self.check(force=True)
+        elif refresh and self._thread is None:
+            self.check()
+        return self._settings or {}
+
+    def set(self, settings: Dict):
+        """Replace the cached row (e.g. after the agent itself wrote it)."""
+        with self._lock:
+            self._settings = settings
+            self._version = _UNSET
+
+    def invalidate(self):
+        """Force the next get() to refetch the row."""
+        with self._lock:
+            self._settings = None
+            self._version = _UNSET
+            self._checked_at = None
+
+    def check(self, force: bool = False) -> bool:
+        """Refetch the row if its version changed. Returns True on change."""
+        with self._lock:
+            now = self._clock()
+            if not force and self._checked_at is not None and now - self._checked_at < self.poll_interval:
+                return False
+            self._checked_at = now
+
+            version = None
+            if not force or self._settings is not None:
+                self.version_checks += 1
+                version = self._fetch_version()
+                if version is not None and version == self._version and self._settings is not None:
+                    return False
+
+            previous = self._settings
+            settings = self._fetch_row() or {}
+            self.row_fetches += 1
+            self._settings = settings
+            self._version = version if version is not None else settings.get('settings_version', _UNSET)
+            changed = previous is not None and _settings_differ(previous, settings)
+            listeners = list(self._listeners) if changed else []
+
+        for callback in listeners:
+            callback(settings)
+        return changed
+
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """Call `callback(settings)` whenever a check finds changed settings."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def start(self):
+        """Check for changes from a daemon thread every `poll_interval` seconds."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='settings-watcher', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check(force=True)
+            except Exception as e:
+                print(f"  ⚠️ Settings check failed: {e}")
+
+    def stop(self, timeout: float = 5.0):
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout)
@@ -0,0 +1,159 @@
+"""
+Whole-run timing spans for the send pipeline and the inbox scans.
+
+latency.LatencyStats keeps a short rolling window per phase for batch
+sizing and admission control.  This keeps a fixed-bucket histogram per
+span for the whole run instead, so the end-of-run report shows where the
+time budget went: contact lookup, Apollo and ELV verification, LLM
+generation, Gmail send, header fetch and DB writes on the send path, and
+the reply, bounce and follow-up scans around it.  Memory per span is
+constant however many samples are recorded.
+
+Spans can nest (a reply scan includes its DB reads) and background
+threads record DB writes concurrently, so span totals are not meant to
+add up to the run time.
+
+Pure Python with no Supabase dependency.
+"""
+
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Histogram bucket upper bounds (seconds); anything slower goes in a final open bucket
+DEFAULT_SPAN_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Spans recorded by the agent
+CONTACT_LOOKUP_SPAN = 'contact_lookup'  # contact_database / prospect_contacts read for one send
+APOLLO_VERIFY_SPAN = 'apollo_verify'    # one Apollo people/match call
+ELV_VERIFY_SPAN = 'elv_verify'          # one EmailListVerify call
+LLM_SPAN = 'llm_generate'               # one Claude email / follow-up generation
+GMAIL_SEND_SPAN = 'gmail_send'          # one messages/send (new thread or reply)
+HEADER_FETCH_SPAN = 'header_fetch'      # Message-ID / threadId lookup after a send
+DB_WRITE_SPAN = 'db_write'              # one outbox op or activity_log batch insert
+REPLY_SCAN_SPAN = 'reply_scan'          # one check_replies / check_replies_prospects pass
+BOUNCE_SCAN_SPAN = 'bounce_scan'        # one check_bounces pass
+FOLLOWUP_SCAN_SPAN = 'followup_scan'    # one due follow-up lookup
+
+
+class _Histogram:
+    __slots__ = ('counts', 'total', 'max')
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.total = 0.0
+        self.max = 0.0
+
+
+class SpanHistograms:
+    """Per-span latency histograms (seconds) for the whole run. Thread-safe."""
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_SPAN_BOUNDS):
+        self.bounds = tuple(bounds)
+        self._spans: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        seconds = max(0.0, float(seconds))
+        bucket = next((i for i, bound in enumerate(self.bounds) if seconds <= bound), len(self.bounds))
+        with self._lock:
+            hist = self._spans.get(name)
+            if hist is None:
+                hist = self._spans[name] = _Histogram(len(self.bounds) + 1)
+            hist.counts[bucket] += 1
+            hist.total += seconds
+            hist.max = max(hist.max, seconds)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Record the wall time of the with-block under `name` (also on error)."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, time.monotonic() - started)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator: record every call of the function under `name`."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            hist = self._spans.get(name)
+            return sum(hist.counts) if hist else 0
+
+    def percentile(self, name: str, pct: float, default: Optional[float] = None) -> Optional[float]:
+        """Upper bound of the bucket holding the nearest-rank sample (capped at the max seen)."""
+        with self._lock:
+            hist = self._spans.get(name)
+            if hist is None:
+                return default
+            counts, peak = list(hist.counts), hist.max
+        rank = max(1, math.ceil(pct / 100.0 * sum(counts)))
+        seen = 0
+        for i, n in enumerate(counts):
+            seen += n
+            if seen >= rank:
+                return min(self.bounds[i], peak) if i < len(self.bounds) else peak
+        return peak
+
+    def summary(self) -> Dict[str, Dict]:
+        """{span: {'count', 'total', 'mean', 'p50', 'p95', 'max', 'buckets'}}, slowest total first."""
+        with self._lock:
+            names = list(self._spans)
+        out = {}
+        for name in names:
+            with self._lock:
+                hist = self._spans[name]
+                counts, total, peak = list(hist.counts), hist.total, hist.max
+            count = sum(counts)
+            out[name] = {
+                'count': count, 'total': round(total, 3), 'mean': round(total / count, 3),
+                'p50': round(self.percentile(name, 50), 3), 'p95': round(self.percentile(name, 95), 3),
+                'max': round(peak, 3), 'buckets': counts,
+            }
+        return dict(sorted(out.items(), key=lambda item: -item[1]['total']))
+
+    def report(self, run_seconds: Optional[float] = None) -> List[str]:
+        """Table lines for the end-of-run log, with each span's share of the run."""
+        summary = self.summary()
+        if not summary:
+            return []
+        lines = [f"   {'span':<16}{'count':>7}{'total':>10}{'share':>7}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for name, s in summary.items():
+            share = f"{s['total'] / run_seconds:.0%}" if run_seconds else '-'
+            lines.append(f"   {name:<16}{s['count']:>7}{s['total']:>9.1f}s{share:>7}{s['mean']:>8.2f}s"
+                         f"{s['p50']:>8.2f}s{s['p95']:>8.2f}s{s['max']:>8.2f}s")
+        return lines
+
+    def rows(self, run_started_at: datetime, run_seconds: float, org_id: Optional[str] = None,
+             run_id: Optional[str] = None) -> List[Dict]:
+        """One agent_metrics row per span (see supabase/add_agent_metrics.sql)."""
+        return [{
+            'org_id': org_id,
+            'run_id': run_id,
+            'run_started_at': run_started_at.isoformat(),
+            'run_seconds': round(run_seconds, 1),
+            'span': name,
+            'count': s['count'],
+            'total_seconds': s['total'],
+            'mean_seconds': s['mean'],
+            'p50_seconds': s['p50'],
+            'p95_seconds': s['p95'],
+            'max_seconds': s['max'],
+            'histogram': {'bounds': list(self.bounds), 'counts': s['buckets']},
+        } for name, s in self.summary().items()]
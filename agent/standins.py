@@ -0,0 +1,561 @@
+"""
+Local stand-ins for the HTTP APIs the agent calls: Gmail (with the Google
+OAuth token endpoint), Apollo and EmailListVerify.
+
+Point the agent at them through the endpoint settings (GMAIL_API_BASE,
+GOOGLE_TOKEN_URL, APOLLO_API_BASE, ELV_API_BASE; `env()` returns the values
+for a stand-in) to load-test the send pipeline without spending
+verification credits or mailing anyone.  Each stand-in is a threaded HTTP
+server on 127.0.0.1 answering with the payload shapes of the real API, and
+can inject on any request:
+
+  * latency: fixed seconds or a (low, high) uniform range;
+  * errors: a fraction of requests answered `error_status` (500);
+  * throttling: a fraction answered 429 with a Retry-After header;
+  * scripted faults: `fail_next(n, status)` fails exactly the next n.
+
+Requests are counted per route in `calls` and injected faults per status
+in `faults`, so a load test can check what a run actually did.
+
+  gmail = GmailStandIn(latency=(0.05, 0.2), rate_limit_rate=0.02, reply_rate=0.05)
+  gmail.start()
+  os.environ.update(gmail.env())   # before importing ai_sdr_agent
+
+The Gmail stand-in keeps a mailbox: sent messages and their threads can be
+read back, `reply_rate` and `bounce_rate` make recipients answer or bounce
+(feeding check_replies and check_bounces), and the history API follows
+every message added.  Apollo and ELV statuses are drawn per address from a
+weighted table, deterministically, so a repeated lookup agrees with the
+first one.
+
+Pure Python with no Supabase dependency.
+"""
+
+import base64
+import email
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from email.utils import formatdate, parseaddr
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# Seconds, or a (low, high) range drawn uniformly per request
+Latency = Union[float, Tuple[float, float]]
+
+# Status tables: status -> relative weight
+DEFAULT_APOLLO_STATUSES = {'verified': 70, 'extrapolated': 10, 'unavailable': 10, 'catch_all': 5, 'invalid': 5}
+DEFAULT_ELV_STATUSES = {'ok': 80, 'accept_all': 8, 'unknown': 5, 'invalid': 5, 'email_disabled': 2}
+
+_APOLLO_TITLES = ['VP Marketing', 'Head of Ecommerce', 'Director of Brand', 'CMO', 'Founder',
+                  'Head of Growth', 'Director of Partnerships', 'CEO']
+_FIRST_NAMES = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery']
+_LAST_NAMES = ['Lee', 'Patel', 'Garcia', 'Kim', 'Nguyen', 'Smith', 'Cohen', 'Silva']
+
+
+def _weighted(key: str, table: Dict[str, float], seed) -> str:
+    """Status for `key` drawn from `table`, the same on every call."""
+    return random.Random(f'{seed}:{key}').choices(list(table), weights=list(table.values()))[0]
+
+
+class StandIn:
+    """Threaded localhost HTTP server with latency and fault injection.
+
+    Subclasses register routes with `route(method, pattern, handler)`;
+    handler(match, query, body, headers) returns (status, payload) where a
+    dict or list payload is sent as JSON and a str as text/plain.
+
+    Args:
+        latency: Added to every request (see `Latency`).
+        error_rate: Fraction of requests answered `error_status`.
+        rate_limit_rate: Fraction of requests answered 429.
+        retry_after: Retry-After seconds sent with a 429.
+        error_status: Status used for injected errors.
+        seed: Seed for latency and fault draws (None: random).
+        port: TCP port; 0 picks a free one (see `url` after start()).
+    """
+
+    def __init__(self, latency: Latency = 0.0, error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: int = 1, error_status: int = 500, seed=None, port: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.error_status = error_status
+        self.seed = seed
+        self.port = port
+        self.calls: Counter = Counter()
+        self.faults: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._scripted: List[int] = []
+        self._routes: List[Tuple[str, 're.Pattern', Callable, str]] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def route(self, method: str, pattern: str, handler: Callable, name: Optional[str] = None):
+        self._routes.append((method, re.compile(pattern), handler, name or pattern))
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
+
+    def env(self) -> Dict[str, str]:
+        """Agent settings that point at this stand-in."""
+        return {}
+
+    def fail_next(self, count: int = 1, status: int = 429):
+        """Answer the next `count` requests with `status`, ahead of random faults."""
+        with self._lock:
+            self._scripted.extend([status] * count)
+
+    def reset_counters(self):
+        with self._lock:
+            self.calls.clear()
+            self.faults.clear()
+
+    def _draw(self) -> Tuple[float, Optional[int]]:
+        """(latency, injected status or None) for one request."""
+        with self._lock:
+            if isinstance(self.latency, (tuple, list)):
+                delay = self._rng.uniform(*self.latency)
+            else:
+                delay = float(self.latency or 0.0)
+            if self._scripted:
+                return delay, self._scripted.pop(0)
+            r = self._rng.random()
+            if r < self.rate_limit_rate:
+                return delay, 429
+            if r < self.rate_limit_rate + self.error_rate:
+                return delay, self.error_status
+            return delay, None
+
+    def handle(self, method: str, path: str, body: bytes, headers: Dict[str, str]):
+        """(status, payload, extra headers) for one request."""
+        parts = urllib.parse.urlsplit(path)
+        query = urllib.parse.parse_qs(parts.query)
+        for route_method, pattern, handler, name in self._routes:
+            match = pattern.fullmatch(parts.path)
+            if route_method == method and match:
+                break
+        else:
+            return 404, {'error': {'code': 404, 'message': f'No route for {method} {parts.path}'}}, {}
+
+        with self._lock:
+            self.calls[name] += 1
+        delay, fault = self._draw()
+        if delay > 0:
+            time.sleep(delay)
+        if fault is not None:
+            with self._lock:
+                self.faults[fault] += 1
+            extra = {'Retry-After': str(self.retry_after)} if fault == 429 else {}
+            message = 'Rate Limit Exceeded' if fault == 429 else 'Backend Error'
+            return fault, {'error': {'code': fault, 'message': message}}, extra
+
+        content_type = headers.get('Content-Type', '')
+        if 'json' in content_type:
+            parsed = json.loads(body or b'{}')
+        elif 'form-urlencoded' in content_type:
+            parsed = {k: v[0] for k, v in urllib.parse.parse_qs(body.decode()).items()}
+        else:
+            parsed = None
+        status, payload = handler(match, query, parsed, headers)
+        return status, payload, {}
+
+    def start(self):
+        """Bind and serve from a daemon thread."""
+        if self._server is not None:
+            return
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                status, payload, extra = standin.handle(method, self.path, body, dict(self.headers))
+                if isinstance(payload, str):
+                    data, content_type = payload.encode(), 'text/plain; charset=utf-8'
+                else:
+                    data, content_type = json.dumps(payload).encode(), 'application/json; charset=UTF-8'
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.1},
+                                        name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+# ─── GMAIL + OAUTH ─────────────────────────
+
+class GmailStandIn(StandIn):
+    """Gmail API mailbox plus the OAuth token endpoint (at /token).
+
+    Args:
+        address: The mailbox's primary address.
+        aliases: Further accepted sendAs addresses.
+        reply_rate: Fraction of sends the recipient replies to.
+        bounce_rate: Fraction of sends that bounce (a mailer-daemon message).
+        **faults: StandIn arguments (latency, error_rate, rate_limit_rate, ...).
+    """
+
+    def __init__(self, address: str = 'sam@onsiteaffiliate.com', aliases=(), reply_rate: float = 0.0,
+                 bounce_rate: float = 0.0, **faults):
+        super().__init__(**faults)
+        self.address = address.lower()
+        self.aliases = [a.lower() for a in aliases]
+        self.reply_rate = reply_rate
+        self.bounce_rate = bounce_rate
+        self.messages: Dict[str, Dict] = {}
+        self.threads: Dict[str, List[str]] = {}
+        self._history: List[Tuple[int, str]] = []
+        self._history_id = 100000
+        self._ids = itertools.count(0x18f0000000000000)
+        self._tokens = set()
+        self._outcomes = random.Random(self.seed)
+
+        me = r'/gmail/v1/users/me'
+        self.route('POST', r'/token', self._token, 'token')
+        self.route('GET', me + r'/profile', self._profile, 'profile')
+        self.route('GET', me + r'/settings/sendAs', self._send_as, 'sendAs')
+        self.route('POST', me + r'/messages/send', self._send, 'messages.send')
+        self.route('GET', me + r'/messages', self._list, 'messages.list')
+        self.route('GET', me + r'/messages/(?P<id>[\w-]+)', self._get_message, 'messages.get')
+        self.route('GET', me + r'/threads/(?P<id>[\w-]+)', self._get_thread, 'threads.get')
+        self.route('GET', me + r'/history', self._history_list, 'history.list')
+
+    def env(self) -> Dict[str, str]:
+        return {'GMAIL_API_BASE': self.url, 'GOOGLE_TOKEN_URL': f'{self.url}/token'}
+
+    def expire_tokens(self):
+        """Invalidate issued access tokens so the next call gets a 401."""
+        with self._lock:
+            self._tokens.clear()
+
+    def sent(self) -> List[Dict]:
+        """Messages sent through the API, oldest first."""
+        with self._lock:
+            return [m for m in self.messages.values() if 'SENT' in m['labelIds']]
+
+    # ─── mailbox ───
+
+    def _new_id(self) -> str:
+        return format(next(self._ids), 'x')
+
+    def add_message(self, thread_id: Optional[str], headers: Dict[str, str], text: str,
+                    labels=('INBOX', 'UNREAD')) -> Dict:
+        """Store a message (a new thread when thread_id is None) and record it in history."""
+        with self._lock:
+            message_id = self._new_id()
+            thread_id = thread_id or message_id
+            self._history_id += 1
+            headers = dict(headers)
+            headers.setdefault('Date', formatdate(localtime=False))
+            headers.setdefault('Message-ID', f'<{message_id}.standin@mail.gmail.com>')
+            data = base64.urlsafe_b64encode(text.encode()).decode()
+            message = {
+                'id': message_id,
+                'threadId': thread_id,
+                'labelIds': list(labels),
+                'snippet': ' '.join(text.split())[:200],
+                'historyId': str(self._history_id),
+                'internalDate': str(int(time.time() * 1000)),
+                'sizeEstimate': len(text),
+                'payload': {
+                    'mimeType': 'text/plain',
+                    'headers': [{'name': k, 'value': v} for k, v in headers.items()],
+                    'body': {'size': len(text), 'data': data},
+                },
+            }
+            self.messages[message_id] = message
+            self.threads.setdefault(thread_id, []).append(message_id)
+            self._history.append((self._history_id, message_id))
+            return message
+
+    def add_reply(self, thread_id: str, from_email: str, text: str = 'Thanks, sounds interesting. Send more info?'):
+        """The recipient answers in `thread_id`."""
+        first = self.messages[self.threads[thread_id][0]]
+        subject = self._header(first, 'Subject') or ''
+        return self.add_message(thread_id, {
+            'From': from_email, 'To': self.address,
+            'Subject': subject if subject.lower().startswith('re:') else f'Re: {subject}',
+            'In-Reply-To': self._header(first, 'Message-ID'),
+        }, text)
+
+    def add_bounce(self, recipient: str):
+        """A mailer-daemon notice that `recipient` does not exist."""
+        return self.add_message(None, {
+            'From': 'Mail Delivery Subsystem <mailer-daemon@googlemail.com>',
+            'To': self.address,
+            'Subject': 'Delivery Status Notification (Failure)',
+            'X-Failed-Recipients': recipient,
+        }, f"Address not found\n\nYour message wasn't delivered to {recipient} because the address "
+           "couldn't be found, or is unable to receive mail.")
+
+    @staticmethod
+    def _header(message: Dict, name: str) -> Optional[str]:
+        for h in message.get('payload', {}).get('headers', []):
+            if h['name'].lower() == name.lower():
+                return h['value']
+        return None
+
+    def _view(self, message: Dict, query: Dict) -> Dict:
+        """The message as returned for ?format=... (full, metadata or minimal)."""
+        fmt = (query.get('format') or ['full'])[0]
+        if fmt == 'minimal':
+            return {k: v for k, v in message.items() if k != 'payload'}
+        if fmt == 'metadata':
+            wanted = {h.lower() for h in query.get('metadataHeaders', [])}
+            headers = [h for h in message['payload']['headers'] if not wanted or h['name'].lower() in wanted]
+            return dict(message, payload={'mimeType': message['payload']['mimeType'], 'headers': headers})
+        return message
+
+    # ─── handlers ───
+
+    def _authorized(self, headers: Dict[str, str]) -> bool:
+        auth = headers.get('Authorization', '')
+        with self._lock:
+            return auth.startswith('Bearer ') and auth[7:] in self._tokens
+
+    def _unauthorized(self):
+        return 401, {'error': {'code': 401, 'message': 'Request had invalid authentication credentials.',
+                               'status': 'UNAUTHENTICATED'}}
+
+    def _token(self, match, query, body, headers):
+        if not body or body.get('grant_type') != 'refresh_token' or not body.get('refresh_token'):
+            return 400, {'error': 'invalid_grant', 'error_description': 'Bad Request'}
+        token = 'ya29.standin-' + hashlib.sha1(f'{time.time()}:{len(self._tokens)}'.encode()).hexdigest()
+        with self._lock:
+            self._tokens.add(token)
+        return 200, {'access_token': token, 'expires_in': 3599, 'token_type': 'Bearer',
+                     'scope': 'https://www.googleapis.com/auth/gmail.modify'}
+
+    def _profile(self, match, query, body, headers):
+        if not self._authorized(headers):
+            return self._unauthorized()
+        with self._lock:
+            return 200, {'emailAddress': self.address, 'messagesTotal': len(self.messages),
+                         'threadsTotal': len(self.threads), 'historyId': str(self._history_id)}
+
+    def _send_as(self, match, query, body, headers):
+        if not self._authorized(headers):
+            return self._unauthorized()
+        return 200, {'sendAs': [
+            {'sendAsEmail': address, 'displayName': '', 'isPrimary': address == self.address,
+             'isDefault': address == self.address, 'verificationStatus': 'accepted'}
+            for address in [self.address, *self.aliases]
+        ]}
+
+    def _send(self, match, query, body, headers):
+        if not self._authorized(headers):
+            return self._unauthorized()
+        raw = (body or {}).get('raw')
+        if not raw:
+            return 400, {'error': {'code': 400, 'message': "'raw' RFC822 payload message string required"}}
+        parsed = email.message_from_bytes(base64.urlsafe_b64decode(raw + '=' * (-len(raw) % 4)))
+        thread_id = body.get('threadId')
+        if thread_id and thread_id not in self.threads:
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        sent_headers = {k: v for k, v in parsed.items() if k.lower() != 'bcc'}
+        message = self.add_message(thread_id, sent_headers, parsed.get_payload(), labels=('SENT',))
+
+        recipient = parseaddr(parsed.get('To', ''))[1].lower()
+        with self._lock:
+            outcome = self._outcomes.random()
+        if outcome < self.bounce_rate:
+            self.add_bounce(recipient)
+        elif outcome < self.bounce_rate + self.reply_rate:
+            self.add_reply(message['threadId'], recipient)
+        return 200, {'id': message['id'], 'threadId': message['threadId'], 'labelIds': ['SENT']}
+
+    def _list(self, match, query, body, headers):
+        if not self._authorized(headers):
+            return self._unauthorized()
+        terms = (query.get('q') or [''])[0].split()
+        max_results = int((query.get('maxResults') or ['100'])[0])
+        now = time.time()
+        with self._lock:
+            found = list(self.messages.values())
+        for term in terms:
+            key, _, value = term.partition(':')
+            if key == 'from':
+                found = [m for m in found if value.lower() in (self._header(m, 'From') or '').lower()]
+            elif key == 'after':
+                found = [m for m in found if int(m['internalDate']) / 1000 > int(value)]
+            elif key == 'newer_than' and value.endswith('d'):
+                found = [m for m in found if int(m['internalDate']) / 1000 > now - int(value[:-1]) * 86400]
+        found.reverse()
+        page = [{'id': m['id'], 'threadId': m['threadId']} for m in found[:max_results]]
+        result = {'resultSizeEstimate': len(found)}
+        if page:
+            result['messages'] = page
+        return 200, result
+
+    def _get_message(self, match, query, body, headers):
+        if not self._authorized(headers):
+            return self._unauthorized()
+        message = self.messages.get(match['id'])
+        if message is None:
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        return 200, self._view(message, query)
+
+    def _get_thread(self, match, query, body, headers):
+        if not self._authorized(headers):
+            return self._unauthorized()
+        with self._lock:
+            ids = list(self.threads.get(match['id'], []))
+        if not ids:
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        messages = [self._view(self.messages[i], query) for i in ids]
+        return 200, {'id': match['id'], 'historyId': messages[-1]['historyId'], 'messages': messages}
+
+    def _history_list(self, match, query, body, headers):
+        if not self._authorized(headers):
+            return self._unauthorized()
+        start = int((query.get('startHistoryId') or ['0'])[0])
+        offset = int((query.get('pageToken') or ['0'])[0])
+        max_results = int((query.get('maxResults') or ['100'])[0])
+        with self._lock:
+            if self._history and start < self._history[0][0] - 1:
+                return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+            records = [(h, self.messages[i]) for h, i in self._history if h > start]
+            current = str(self._history_id)
+        page = records[offset:offset + max_results]
+        result = {'historyId': current, 'history': [
+            {'id': str(h), 'messages': [{'id': m['id'], 'threadId': m['threadId']}],
+             'messagesAdded': [{'message': {'id': m['id'], 'threadId': m['threadId'], 'labelIds': m['labelIds']}}]}
+            for h, m in page
+        ]}
+        if offset + max_results < len(records):
+            result['nextPageToken'] = str(offset + max_results)
+        return 200, result
+
+
+# ─── APOLLO ────────────────────────────────
+
+class ApolloStandIn(StandIn):
+    """Apollo people match, bulk_match and search.
+
+    Args:
+        statuses: email_status weights for matched people.
+        people_per_domain: People a search returns per company domain.
+        **faults: StandIn arguments (latency, error_rate, rate_limit_rate, ...).
+    """
+
+    def __init__(self, statuses: Optional[Dict[str, float]] = None, people_per_domain: int = 5, **faults):
+        super().__init__(**faults)
+        self.statuses = dict(statuses or DEFAULT_APOLLO_STATUSES)
+        self.people_per_domain = people_per_domain
+        self.route('POST', r'/v1/people/match', self._match, 'people.match')
+        self.route('POST', r'/api/v1/people/bulk_match', self._bulk_match, 'people.bulk_match')
+        self.route('POST', r'/api/v1/mixed_people/api_search', self._search, 'mixed_people.search')
+
+    def env(self) -> Dict[str, str]:
+        return {'APOLLO_API_BASE': self.url}
+
+    def _person(self, person_id: str, domain: str, email_address: Optional[str] = None) -> Dict:
+        rng = random.Random(f'{self.seed}:{person_id}')
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        email_address = email_address or f'{first}.{last}@{domain}'.lower()
+        return {
+            'id': person_id,
+            'first_name': first,
+            'last_name': last,
+            'name': f'{first} {last}',
+            'title': rng.choice(_APOLLO_TITLES),
+            'email': email_address,
+            'email_status': _weighted(email_address, self.statuses, self.seed),
+            'linkedin_url': f'http://www.linkedin.com/in/{first}-{last}-{person_id[-6:]}'.lower(),
+            'organization': {'name': domain.split('.')[0].title(), 'primary_domain': domain},
+        }
+
+    def _match(self, match, query, body, headers):
+        email_address = ((body or {}).get('email') or '').lower()
+        if '@' not in email_address:
+            return 200, {'person': None}
+        person_id = hashlib.md5(email_address.encode()).hexdigest()[:24]
+        return 200, {'person': self._person(person_id, email_address.split('@', 1)[1], email_address)}
+
+    def _bulk_match(self, match, query, body, headers):
+        matches = []
+        for detail in (body or {}).get('details', [])[:10]:
+            person_id = detail.get('id') or ''
+            domain = person_id.rsplit('~', 1)[0]
+            matches.append(self._person(person_id, domain) if '~' in person_id else None)
+        found = [m for m in matches if m]
+        return 200, {'status': 'success', 'matches': matches, 'credits_consumed': len(found),
+                     'unique_enriched_records': len(found), 'missing_records': len(matches) - len(found)}
+
+    def _search(self, match, query, body, headers):
+        body = body or {}
+        domains = body.get('q_organization_domains_list') or []
+        per_page = int(body.get('per_page') or 25)
+        people = []
+        for domain in domains:
+            for n in range(self.people_per_domain):
+                person = self._person(f'{domain}~{n}', domain)
+                people.append({
+                    'id': person['id'], 'first_name': person['first_name'],
+                    'last_name_obfuscated': person['last_name'][0] + '***', 'title': person['title'],
+                    'has_email': person['email_status'] != 'unavailable',
+                    'organization': {'name': person['organization']['name'], 'has_industry': True},
+                })
+        return 200, {'total_entries': len(people), 'people': people[:per_page]}
+
+
+# ─── EMAILLISTVERIFY ───────────────────────
+
+class ELVStandIn(StandIn):
+    """EmailListVerify single-address verification (plain-text status).
+
+    Args:
+        statuses: Status weights per verified address.
+        **faults: StandIn arguments (latency, error_rate, rate_limit_rate, ...).
+    """
+
+    def __init__(self, statuses: Optional[Dict[str, float]] = None, **faults):
+        super().__init__(**faults)
+        self.statuses = dict(statuses or DEFAULT_ELV_STATUSES)
+        self.route('GET', r'/api/verifyEmail', self._verify, 'verifyEmail')
+
+    def env(self) -> Dict[str, str]:
+        return {'ELV_API_BASE': self.url}
+
+    def _verify(self, match, query, body, headers):
+        if not (query.get('secret') or [''])[0]:
+            return 200, 'key_not_valid'
+        email_address = (query.get('email') or [''])[0].lower()
+        if '@' not in email_address:
+            return 200, 'syntax_error'
+        return 200, _weighted(email_address, self.statuses, self.seed)
@@ -0,0 +1,217 @@
+"""
+Compact suppression index for emailed / bounced addresses.
+
+A Bloom filter answers "definitely not suppressed" from a few MB of bits
+instead of a Python set holding every address string.  Positive hits are
+confirmed exactly through a caller-supplied lookup (usually one `in_()`
+query against the source table), so a false positive can never block a
+send and a capacity overrun only costs extra lookups, never correctness.
+
+The index is pure Python and has no Supabase dependency: the agent wires
+in the lookup callable and decides where on disk to persist it.
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Set
+
+_MAGIC = b'SDRBLOOM1'
+
+
+def _normalize(email: str) -> str:
+    return (email or '').strip().lower()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, int(capacity))
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        h2 |= 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> bool:
+        """Set the bits for `item`. Returns True if it was (probably) new."""
+        new = False
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            mask = 1 << bit
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, item: str) -> bool:
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self._bits[byte] & (1 << bit):
+                return False
+        return True
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
+
+
+class SuppressionIndex:
+    """Set-like suppression check backed by a Bloom filter plus exact lookups.
+
+    Drop-in for the `all_emailed` / `bounced_set` sets used by the send paths:
+    supports `in`, `add()` and `len()`.  Prefer `suppressed_among()` when
+    checking several addresses, since it confirms all Bloom hits with one
+    lookup call.
+
+    Args:
+        lookup: Callable taking a list of addresses (lowercased plus any
+            differently-cased spelling the caller passed) and returning the
+            ones present in the source of truth.
+        capacity: Expected number of addresses; the false-positive rate only
+            holds up to this size.
+        error_rate: Target Bloom false-positive rate.
+        cache_size: Max exact-lookup results remembered in memory.
+    """
+
+    def __init__(self, lookup: Callable[[List[str]], Iterable[str]], capacity: int = 100_000,
+                 error_rate: float = 0.001, cache_size: int = 10_000):
+        self._lookup = lookup
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._pinned: Set[str] = set()
+        self._verified: 'OrderedDict[str, bool]' = OrderedDict()
+        self._cache_size = cache_size
+        self.watermark: Optional[str] = None
+        self.lookups = 0
+
+    def __len__(self) -> int:
+        return self._bloom.count
+
+    @property
+    def saturated(self) -> bool:
+        """True once more addresses were added than the filter was sized for."""
+        return self._bloom.saturated
+
+    def add(self, email: str):
+        """Suppress an address for the rest of this run (set semantics).
+
+        The exact string is pinned in memory, because run-local additions
+        (a contact skipped after failed verification, a send whose DB write
+        is still pending) may not be in the source table for the lookup to
+        confirm.
+        """
+        email = _normalize(email)
+        if not email:
+            return
+        self._bloom.add(email)
+        self._pinned.add(email)
+        self._verified.pop(email, None)
+
+    def add_from_source(self, email: str):
+        """Index an address that exists in the source table (Bloom bits only)."""
+        email = _normalize(email)
+        if email:
+            self._bloom.add(email)
+            self._verified.pop(email, None)
+
+    def might_contain(self, email: str) -> bool:
+        """Bloom-only check: False is definitive, True needs confirmation."""
+        return _normalize(email) in self._bloom
+
+    def __contains__(self, email: str) -> bool:
+        return bool(self.suppressed_among([email]))
+
+    def suppressed_among(self, emails: Iterable[str]) -> Set[str]:
+        """Return the lowercase addresses from `emails` that are suppressed.
+
+        Bloom negatives are answered locally; remaining hits are confirmed
+        from the pinned set, the result cache, then a single lookup call.
+        """
+        suppressed: Set[str] = set()
+        unresolved: 'OrderedDict[str, Set[str]]' = OrderedDict()
+        for raw in emails:
+            email = _normalize(raw)
+            if not email or email not in self._bloom:
+                continue
+            if email in self._pinned:
+                suppressed.add(email)
+            elif email in self._verified:
+                self._verified.move_to_end(email)
+                if self._verified[email]:
+                    suppressed.add(email)
+            else:
+                unresolved.setdefault(email, {email}).add(raw.strip())
+
+        if unresolved:
+            self.lookups += 1
+            spellings = sorted(set().union(*unresolved.values()))
+            found = {_normalize(e) for e in (self._lookup(spellings) or [])}
+            for email in unresolved:
+                hit = email in found
+                self._remember(email, hit)
+                if hit:
+                    suppressed.add(email)
+        return suppressed
+
+    def _remember(self, email: str, hit: bool):
+        self._verified[email] = hit
+        self._verified.move_to_end(email)
+        while len(self._verified) > self._cache_size:
+            self._verified.popitem(last=False)
+
+    # ─── Persistence ───────────────────────────────
+
+    def save(self, path: str):
+        """Write the Bloom bits and watermark to `path` (atomic replace)."""
+        meta = json.dumps({
+            'capacity': self._bloom.capacity,
+            'error_rate': self._bloom.error_rate,
+            'num_bits': self._bloom.num_bits,
+            'num_hashes': self._bloom.num_hashes,
+            'count': self._bloom.count,
+            'watermark': self.watermark,
+        }).encode('utf-8')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(struct.pack('<I', len(meta)))
+            f.write(meta)
+            f.write(self._bloom._bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, lookup: Callable[[List[str]], Iterable[str]],
+             cache_size: int = 10_000) -> 'SuppressionIndex':
+        """Load an index written by save(). Raises ValueError on a bad file."""
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a suppression index file")
+            (meta_len,) = struct.unpack('<I', f.read(4))
+            meta = json.loads(f.read(meta_len).decode('utf-8'))
+            bits = f.read()
+
+        index = cls(lookup, capacity=meta['capacity'], error_rate=meta['error_rate'],
+                    cache_size=cache_size)
+        bloom = index._bloom
+        if bloom.num_bits != meta['num_bits'] or len(bits) != len(bloom._bits):
+            raise ValueError(f"{path} has inconsistent filter size")
+        bloom.num_hashes = meta['num_hashes']
+        bloom.count = meta['count']
+        bloom._bits = bytearray(bits)
+        index.watermark = meta.get('watermark')
+        return index
@@ -0,0 +1,137 @@
+"""
+Priority queue of sendable work for the autonomous loop.
+
+Due follow-ups, fresh (enriched) leads, contacted leads and prospects used
+to be worked by separate passes that competed blindly for the daily
+budget: follow-ups only ran at startup and every few loops, and
+send_batch spent whatever capacity was left.  The run loop now builds one
+WorkQueue per loop and draws from it, so the budget goes to the highest
+priority sends first and a due follow-up is picked up on the next draw.
+
+Items are ordered by priority (higher first), then by `due_at` (earlier
+first: when the follow-up fell due, or when the lead was created), then by
+insertion order.  Priorities per kind default to DEFAULT_WORK_PRIORITIES
+and can be overridden with the agent_settings.work_priorities JSON column.
+"""
+
+import heapq
+import itertools
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# Work item kinds
+FOLLOWUP = 'followup'
+ENRICHED_LEAD = 'enriched_lead'
+CONTACTED_LEAD = 'contacted_lead'
+PROSPECT = 'prospect'
+CONTACTED_PROSPECT = 'contacted_prospect'
+
+# Follow-ups first (they are time-sensitive and the thread is already warm),
+# then fresh leads/prospects, then ones whose other contacts were emailed.
+DEFAULT_WORK_PRIORITIES = {
+    FOLLOWUP: 100,
+    ENRICHED_LEAD: 50,
+    PROSPECT: 50,
+    CONTACTED_LEAD: 20,
+    CONTACTED_PROSPECT: 20,
+}
+
+_FAR_FUTURE = datetime.max.replace(tzinfo=timezone.utc)
+
+
+def resolve_priorities(raw: Any = None) -> Dict[str, int]:
+    """DEFAULT_WORK_PRIORITIES overlaid with a settings value (dict or JSON string)."""
+    priorities = dict(DEFAULT_WORK_PRIORITIES)
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            raw = None
+    if isinstance(raw, dict):
+        for kind, value in raw.items():
+            try:
+                priorities[kind] = int(value)
+            except (TypeError, ValueError):
+                continue
+    return priorities
+
+
+class WorkItem:
+    """One sendable unit: a follow-up, a lead or a prospect.
+
+    `payload` holds what the send path needs, e.g. {'lead': row} or
+    {'original': row, 'next_followup_number': 1, 'lead': row}.
+    """
+
+    __slots__ = ('kind', 'key', 'payload', 'priority', 'due_at')
+
+    def __init__(self, kind: str, key: str, payload: Dict, priority: int,
+                 due_at: Optional[datetime] = None):
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.priority = priority
+        self.due_at = due_at
+
+    def __repr__(self) -> str:
+        return f"WorkItem({self.kind!r}, {self.key!r}, priority={self.priority})"
+
+
+class WorkQueue:
+    """Priority queue of WorkItems; a key is only queued once."""
+
+    def __init__(self, priorities: Optional[Dict[str, int]] = None):
+        self.priorities = priorities or dict(DEFAULT_WORK_PRIORITIES)
+        self._heap = []
+        self._keys = set()
+        self._seq = itertools.count()
+        # Items held back until their recipient's send window opens
+        self.deferred = 0
+        self.next_available_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, kind: str, key: str, payload: Dict, due_at: Optional[datetime] = None) -> bool:
+        """Queue an item. Returns False if its key is already queued."""
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        item = WorkItem(kind, key, payload, self.priorities.get(kind, 0), due_at)
+        heapq.heappush(self._heap, (-item.priority, due_at or _FAR_FUTURE, next(self._seq), item))
+        return True
+
+    def defer(self, key: str, available_at: Optional[datetime]):
+        """Record an item that is not sendable until `available_at` (None = not this week)."""
+        if key in self._keys:
+            return
+        self._keys.add(key)
+        self.deferred += 1
+        if available_at and (self.next_available_at is None or available_at < self.next_available_at):
+            self.next_available_at = available_at
+
+    def extend(self, kind: str, entries: Iterable[tuple]):
+        """Queue (key, payload, due_at) tuples of one kind."""
+        for key, payload, due_at in entries:
+            self.push(kind, key, payload, due_at)
+
+    def pop(self) -> Optional[WorkItem]:
+        """Highest-priority item, or None when empty."""
+        if not self._heap:
+            return None
+        return heapq.heappop(self._heap)[-1]
+
+    def peek(self) -> Optional[WorkItem]:
+        return self._heap[0][-1] if self._heap else None
+
+    def drain(self) -> Iterator[WorkItem]:
+        """Pop items in priority order until empty (or the caller stops)."""
+        while self._heap:
+            yield self.pop()
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self._heap:
+            counts[entry[-1].kind] = counts.get(entry[-1].kind, 0) + 1
+        return counts
@@ -0,0 +1,464 @@
+"""
+End-to-end throughput of the send pipeline at synthetic scale.
+
+Drives the agent's real code paths (send_batch, send_batch_prospects,
+process_followups, check_replies, check_bounces, batch_verify) with the
+database replaced by backend.InMemoryBackend seeded to a given number of
+outreach_log rows, Gmail / Apollo / ELV by the local stand-ins in
+agent/standins.py, and the LLM by a canned client with fixed latency.
+Nothing leaves the machine.
+
+Per scale it reports:
+  * sends/hour with policy sleeps (the gap between sends, ELV pacing)
+    taken out; they are recorded instead of slept;
+  * DB round trips per send over the send phases (outbox and activity
+    writes included); the other phases report their own round trips;
+  * peak RSS of the process (each scale runs in a fresh interpreter);
+  * p50/p95 per phase, over passes and over items (one send, one
+    follow-up, one thread check, one verification);
+  * the agent's own timing spans (spans.py) in the JSON output.
+
+Database time is modelled: the in-memory backend's own time (scans,
+the emulated get_due_followups RPC) is taken out of the measurement and
+round trips x --db-rtt-ms is added instead.
+
+Usage:
+  python benchmarks/bench_pipeline.py                        # 1k, 100k, 1m
+  python benchmarks/bench_pipeline.py 1k 100k --rounds 2 --json pipeline.json
+  python benchmarks/bench_pipeline.py 1k --no-latency        # CPU and round trips only
+  python benchmarks/bench_pipeline.py --compare main.json --json branch.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+AGENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'agent')
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+# Driven in this order every round
+PHASES = ['check_bounces', 'check_replies', 'process_followups', 'send_batch', 'send_batch_prospects',
+          'batch_verify']
+SEND_PHASES = ('send_batch', 'send_batch_prospects', 'process_followups')
+
+ORG_ID = 'b0000000-0000-0000-0000-00000000000b'
+SENDERS = ['sam@onsiteaffiliate.com', 'sam.reid@onsiteaffiliate.com']
+TITLES = ['VP Marketing', 'Head of Ecommerce', 'Founder', 'Director of Brand', 'Marketing Coordinator']
+
+# Latency of the external services (seconds); --no-latency zeroes them
+DEFAULT_LATENCY = {'gmail': 0.05, 'apollo': 0.1, 'elv': 0.2, 'llm': 1.0}
+DEFAULT_DB_RTT_MS = 20
+# Recent threads (inside check_replies' 60-day window) seeded into the Gmail stand-in
+DEFAULT_RECENT_THREADS = 300
+
+
+class CannedLLM:
+    """Replaces the Anthropic client: a fixed email after `latency` seconds."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.messages = self
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        text = ("Subject: Creator UGC without upfront costs\n\nHey Alex - quick one: are you paying creators "
+                "upfront for UGC? Amazon proved onsite commissions remove that cost, and we help brands copy "
+                "that model on their own site.\n\nSam Reid\nOnsiteAffiliate.com")
+        block = type('Block', (), {'text': text})()
+        return type('Response', (), {'content': [block]})()
+
+
+class PolicyClock:
+    """Replaces the agent's `time` module: sleep() is recorded, not slept."""
+
+    def __init__(self):
+        self.slept = 0.0
+
+    def sleep(self, seconds):
+        self.slept += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile (same rule as latency.LatencyStats)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered), max(1, math.ceil(pct / 100.0 * len(ordered)))) - 1]
+
+
+# ═══════════════════════════════════════════════════════════
+# SYNTHETIC DATA
+# ═══════════════════════════════════════════════════════════
+
+def seed(db, gmail, rows: int, recent: int, fresh: int, due: int, rng: random.Random) -> dict:
+    """Fill `db` with about `rows` outreach_log rows plus the leads, contacts and
+    prospects around them; recent threads also go into the Gmail stand-in.
+
+    Old threads have their initial email and both follow-ups (nothing due);
+    of the recent ones, `due` are waiting for follow-up #1.
+    """
+    import ai_sdr_agent
+
+    now = datetime.now(timezone.utc)
+    db.seed('agent_settings', [{
+        'id': ai_sdr_agent.AGENT_SETTINGS_ID, 'org_id': ORG_ID, 'agent_enabled': True,
+        'max_emails_per_day': 10_000, 'min_minutes_between_emails': 2, 'allowed_icp_fits': ['HIGH'],
+        'max_contacts_per_lead_per_day': 1, 'send_days': [0, 1, 2, 3, 4, 5, 6],
+    }])
+    db.seed('email_accounts', [
+        {'org_id': ORG_ID, 'email_address': sender, 'display_name': 'Sam Reid', 'daily_send_limit': 10_000,
+         'status': 'active'}
+        for sender in SENDERS
+    ])
+
+    outreach, leads, contacts = [], [], []
+    recent = min(recent, rows)
+    due = min(due, recent)
+
+    def thread(n, age_days, followups, in_gmail):
+        website = f'brand{n}.com'
+        email = f'buyer{n}@{website}'
+        lead_id = f'lead-{n:07d}'
+        leads.append({'id': lead_id, 'org_id': ORG_ID, 'website': website, 'company_name': f'Brand {n}',
+                      'icp_fit': 'HIGH' if n % 5 < 2 else 'MEDIUM', 'has_contacts': True, 'status': 'contacted',
+                      'industry': 'Beauty', 'created_at': (now - timedelta(days=age_days + 1)).isoformat()})
+        contacts.append({'id': f'cd-{n:07d}', 'org_id': ORG_ID, 'email': email, 'first_name': 'Pat',
+                         'last_name': f'Buyer{n}', 'title': TITLES[n % len(TITLES)], 'website': website,
+                         'email_domain': website, 'elv_status': 'ok',
+                         'elv_verified_at': (now - timedelta(days=age_days)).isoformat()})
+        sender = SENDERS[n % len(SENDERS)]
+        thread_id, message_id = f'old{n:x}', f'<old{n:x}@mail.gmail.com>'
+        if in_gmail:
+            message = gmail.add_message(None, {'From': f'Sam Reid <{sender}>', 'To': email,
+                                               'Subject': 'Creator UGC'}, 'Hey Pat -', labels=('SENT',))
+            thread_id = message['threadId']
+            message_id = next(h['value'] for h in message['payload']['headers'] if h['name'] == 'Message-ID')
+        for fu in range(followups + 1):
+            sent_at = now - timedelta(days=age_days - (0, 3, 8)[fu], minutes=rng.randint(0, 600))
+            outreach.append({
+                'id': f'out-{len(outreach):08d}', 'org_id': ORG_ID, 'lead_id': lead_id, 'website': website,
+                'contact_email': email, 'contact_name': f'Pat Buyer{n}',
+                'email_subject': 'Creator UGC' if fu == 0 else 'Re: Creator UGC', 'email_body': 'Hey Pat -',
+                'sent_at': sent_at.isoformat(), 'followup_number': fu, 'gmail_thread_id': thread_id,
+                'gmail_message_id': f'{thread_id}-{fu}', 'rfc_message_id': message_id, 'sender_email': sender,
+            })
+
+    n = 0
+    for i in range(recent):
+        if i < due:
+            age, followups = 3 + rng.random() * 4, 0
+        else:
+            age = rng.random() * 58
+            followups = 2 if age >= 8 else 1 if age >= 3 else 0
+        thread(n, age, followups, in_gmail=True)
+        n += 1
+    while len(outreach) < rows:
+        thread(n, 61 + rng.random() * 670, 2, in_gmail=False)
+        n += 1
+    del outreach[rows:]
+
+    # Recent bounces, picked up by check_bounces
+    for row in outreach[:max(1, recent // 50)]:
+        gmail.add_bounce(row['contact_email'])
+
+    # Fresh leads and prospects: what the send phases work through
+    prospects, prospect_contacts = [], []
+    for i in range(fresh):
+        website = f'fresh{i}.com'
+        leads.append({'id': f'fresh-{i:06d}', 'org_id': ORG_ID, 'website': website, 'company_name': f'Fresh {i}',
+                      'icp_fit': 'HIGH', 'has_contacts': True, 'status': 'enriched', 'industry': 'Apparel',
+                      'research_notes': 'DTC apparel brand with a creator program',
+                      'created_at': (now - timedelta(hours=fresh - i)).isoformat()})
+        for j, title in enumerate(TITLES[:3]):
+            contacts.append({'id': f'cdf-{i:06d}-{j}', 'org_id': ORG_ID, 'email': f'{title.split()[0].lower()}{j}@{website}',
+                             'first_name': 'Alex', 'last_name': f'Fresh{i}', 'title': title, 'website': website,
+                             'email_domain': website})
+        prospect_id = f'pros-{i:06d}'
+        prospects.append({'id': prospect_id, 'org_id': ORG_ID, 'website': f'prospect{i}.com',
+                          'company_name': f'Prospect {i}', 'enrichment_status': 'gold_enriched',
+                          'status': 'qualified', 'icp_fit_score': 90 - i % 30, 'industry_primary': 'Apparel',
+                          'created_at': (now - timedelta(hours=i)).isoformat()})
+        for j, title in enumerate(TITLES[:2]):
+            prospect_contacts.append({'org_id': ORG_ID, 'prospect_id': prospect_id, 'first_name': 'Jo',
+                                      'last_name': f'Prospect{i}', 'full_name': f'Jo Prospect{i}',
+                                      'email': f'jo{j}@prospect{i}.com', 'title': title, 'match_score': 90 - j * 10})
+
+    db.seed('outreach_log', outreach)
+    db.seed('leads', leads)
+    db.seed('contact_database', contacts)
+    db.seed('prospects', prospects)
+    db.seed('prospect_contacts', prospect_contacts)
+    return {'outreach_log': len(outreach), 'leads': len(leads), 'contact_database': len(contacts),
+            'prospects': len(prospects), 'gmail_threads': len(gmail.threads)}
+
+
+def register_rpcs(db):
+    """Serve get_due_followups from the reference implementation, as if deployed."""
+    from followup_due import compute_due_followups
+
+    def get_due_followups(backend, params):
+        due = compute_due_followups(backend.tables['outreach_log'], None, datetime.now(timezone.utc),
+                                    params.get('p_fu1_days', 3), params.get('p_fu2_days', 5),
+                                    org_id=params.get('p_org_id'))
+        wanted = {item['original'].get('lead_id') for item in due}
+        leads = {row['id']: row for row in backend.tables['leads'] if row['id'] in wanted}
+        return [dict(item, original=dict(item['original']), lead=leads.get(item['original'].get('lead_id')))
+                for item in due]
+
+    db.register_rpc('get_due_followups', get_due_followups)
+
+
+# ═══════════════════════════════════════════════════════════
+# ONE SCALE (runs in its own interpreter)
+# ═══════════════════════════════════════════════════════════
+
+def run_scale(rows: int, args) -> dict:
+    sys.path.insert(0, AGENT_DIR)
+    os.environ['SDR_CACHE_DIR'] = tempfile.mkdtemp(prefix='bench-pipeline-')
+    import ai_sdr_agent
+    from backend import InMemoryBackend
+    from standins import ApolloStandIn, ELVStandIn, GmailStandIn
+
+    latency = {k: 0.0 for k in DEFAULT_LATENCY} if args.no_latency else {
+        'gmail': args.gmail_latency, 'apollo': args.apollo_latency, 'elv': args.elv_latency, 'llm': args.llm_latency}
+    db_rtt = 0.0 if args.no_latency else args.db_rtt_ms / 1000
+    rng = random.Random(args.seed)
+
+    gmail = GmailStandIn(address=SENDERS[0], aliases=SENDERS[1:], reply_rate=0.05, bounce_rate=0.02,
+                         latency=latency['gmail'], seed=args.seed)
+    apollo = ApolloStandIn(latency=latency['apollo'], seed=args.seed)
+    elv = ELVStandIn(latency=latency['elv'], seed=args.seed)
+    for standin in (gmail, apollo, elv):
+        standin.start()
+        for name, value in standin.env().items():
+            setattr(ai_sdr_agent, name, value)
+    ai_sdr_agent.GMAIL_CREDENTIALS = json.dumps({'client_id': 'c', 'client_secret': 's', 'refresh_token': 'r'})
+    ai_sdr_agent.GMAIL_FROM_EMAIL = SENDERS[0]
+    ai_sdr_agent.APOLLO_API_KEY = ai_sdr_agent.ELV_API_KEY = 'bench'
+    llm = ai_sdr_agent.anthropic_client = CannedLLM(latency['llm'])
+    clock = ai_sdr_agent.time = PolicyClock()
+
+    class TimedBackend(InMemoryBackend):
+        """Keeps the time spent inside the backend, which the report replaces with round trips x RTT."""
+        busy = 0.0
+
+        def _execute(self, q):
+            t0 = time.perf_counter()
+            try:
+                return super()._execute(q)
+            finally:
+                self.busy += time.perf_counter() - t0
+
+        def _call_rpc(self, name, params):
+            t0 = time.perf_counter()
+            try:
+                return super()._call_rpc(name, params)
+            finally:
+                self.busy += time.perf_counter() - t0
+
+    db = TimedBackend()
+    ai_sdr_agent.supabase = db
+    started = time.perf_counter()
+    tables = seed(db, gmail, rows, args.recent, fresh=args.sends * args.rounds * 2, due=args.sends, rng=rng)
+    if not args.no_rpc:
+        register_rpcs(db)
+    seed_seconds = time.perf_counter() - started
+    seeded_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    agent = ai_sdr_agent.AISDRAgent()
+    # Writes are replayed at the end of each phase so they count against it
+    agent._outbox.close()
+
+    # Per-item timing: the unit of work inside each phase
+    items = {
+        'send_batch': (agent, '_send_one'),
+        'send_batch_prospects': (agent, '_send_one_prospect'),
+        'process_followups': (agent, '_send_followup'),
+        'check_replies': (agent.gmail, 'check_thread_for_replies'),
+        'batch_verify': (ai_sdr_agent, 'verify_email'),
+    }
+    calls = {
+        'check_bounces': lambda: agent.check_bounces(),
+        'check_replies': lambda: agent.check_replies(),
+        'process_followups': lambda: agent.process_followups(),
+        'send_batch': lambda: agent.send_batch(count=args.sends),
+        'send_batch_prospects': lambda: agent.send_batch_prospects(count=args.sends),
+        'batch_verify': lambda: agent.batch_verify(limit=args.verify),
+    }
+    stats = {phase: {'passes': [], 'items': [], 'sends': 0, 'round_trips': 0, 'policy_sleep_s': 0.0,
+                     'busy_s': 0.0} for phase in PHASES}
+
+    def timed(fn, samples):
+        def wrapper(*a, **kw):
+            trips, in_db, t0 = db.round_trips, db.busy, time.perf_counter()
+            try:
+                return fn(*a, **kw)
+            finally:
+                samples.append(time.perf_counter() - t0 - (db.busy - in_db) + (db.round_trips - trips) * db_rtt)
+        return wrapper
+
+    ai_sdr_agent.spans.reset()
+    log = io.StringIO() if args.verbose else open(os.devnull, 'w')
+    for _ in range(args.rounds):
+        for phase in PHASES:
+            s = stats[phase]
+            owner, attr = items.get(phase, (None, None))
+            if owner is not None:
+                original = getattr(owner, attr)
+                setattr(owner, attr, timed(original, s['items']))
+            trips, in_db, slept, t0 = db.round_trips, db.busy, clock.slept, time.perf_counter()
+            with contextlib.redirect_stdout(log):
+                result = calls[phase]()
+                agent._outbox.replay(force=True)
+                agent._activity.flush()
+            busy = time.perf_counter() - t0 - (db.busy - in_db) + (db.round_trips - trips) * db_rtt
+            if owner is not None:
+                if owner is agent or owner is agent.gmail:
+                    delattr(owner, attr)
+                else:
+                    setattr(owner, attr, original)
+            s['passes'].append(busy)
+            s['busy_s'] += busy
+            s['round_trips'] += db.round_trips - trips
+            s['policy_sleep_s'] += clock.slept - slept
+            if phase in SEND_PHASES:
+                s['sends'] += result or 0
+
+    agent.close()
+    for standin in (gmail, apollo, elv):
+        standin.stop()
+    if args.verbose:
+        sys.stderr.write(log.getvalue())
+
+    phases = {}
+    for phase, s in stats.items():
+        phases[phase] = {
+            'passes': len(s['passes']),
+            'pass_p50_s': round(percentile(s['passes'], 50), 4),
+            'pass_p95_s': round(percentile(s['passes'], 95), 4),
+            'items': len(s['items']),
+            'item_p50_s': round(percentile(s['items'], 50), 4) if s['items'] else None,
+            'item_p95_s': round(percentile(s['items'], 95), 4) if s['items'] else None,
+            'round_trips': s['round_trips'],
+            'policy_sleep_s': round(s['policy_sleep_s'], 1),
+        }
+        if phase in SEND_PHASES:
+            phases[phase]['sends'] = s['sends']
+            phases[phase]['sends_per_hour'] = round(s['sends'] / s['busy_s'] * 3600, 1) if s['sends'] else 0.0
+
+    sends = sum(stats[p]['sends'] for p in SEND_PHASES)
+    send_busy = sum(stats[p]['busy_s'] for p in SEND_PHASES)
+    return {
+        'rows': tables,
+        'seed_s': round(seed_seconds, 2),
+        'sends': sends,
+        'sends_per_hour': round(sends / send_busy * 3600, 1) if sends else 0.0,
+        'db_round_trips_per_send': round(sum(stats[p]['round_trips'] for p in SEND_PHASES) / sends, 1) if sends else None,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'seeded_rss_mb': round(seeded_rss_mb, 1),
+        'llm_calls': llm.calls,
+        'gmail_calls': dict(gmail.calls),
+        'phases': phases,
+        'spans': {name: {k: v for k, v in s.items() if k != 'buckets'}
+                  for name, s in ai_sdr_agent.spans.summary().items()},
+    }
+
+
+# ═══════════════════════════════════════════════════════════
+# DRIVER
+# ═══════════════════════════════════════════════════════════
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions of `results` against a previous run's JSON."""
+    checks = [('sends_per_hour', -1), ('db_round_trips_per_send', 1), ('peak_rss_mb', 1)]
+    regressions = []
+    for scale, current in results.items():
+        before = baseline.get('results', {}).get(scale)
+        if not before:
+            continue
+        for metric, worse in checks:
+            old, new = before.get(metric), current.get(metric)
+            if old and new is not None and (new - old) * worse > abs(old) * tolerance:
+                regressions.append(f"{scale}: {metric} {old} -> {new}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('scales', nargs='*', default=list(SCALES), help=f"any of {', '.join(SCALES)}")
+    parser.add_argument('--rounds', type=int, default=3, help='passes of every phase')
+    parser.add_argument('--sends', type=int, default=10, help='send_batch / send_batch_prospects count per pass')
+    parser.add_argument('--verify', type=int, default=50, help='batch_verify limit per pass')
+    parser.add_argument('--recent', type=int, default=DEFAULT_RECENT_THREADS,
+                        help='threads inside the reply-check window')
+    parser.add_argument('--db-rtt-ms', type=float, default=DEFAULT_DB_RTT_MS)
+    parser.add_argument('--gmail-latency', type=float, default=DEFAULT_LATENCY['gmail'])
+    parser.add_argument('--apollo-latency', type=float, default=DEFAULT_LATENCY['apollo'])
+    parser.add_argument('--elv-latency', type=float, default=DEFAULT_LATENCY['elv'])
+    parser.add_argument('--llm-latency', type=float, default=DEFAULT_LATENCY['llm'])
+    parser.add_argument('--no-latency', action='store_true', help='zero service latency and DB RTT')
+    parser.add_argument('--no-rpc', action='store_true', help="don't serve get_due_followups (fallback path)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--json', help='also write the results to this file')
+    parser.add_argument('--compare', help='previous --json output; exit 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative change for --compare')
+    parser.add_argument('--verbose', action='store_true', help="print the agent's output to stderr")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_scale(SCALES[args.worker], args)))
+        return 0
+
+    unknown = [s for s in args.scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+    passthrough = [a for a in (argv if argv is not None else sys.argv[1:]) if a not in args.scales]
+    results = {}
+    print(f"{'scale':<7}{'outreach':>10}{'sends/h':>10}{'rt/send':>9}{'peak RSS':>11}  phase p50/p95 (s)")
+    for scale in args.scales:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', scale, *passthrough],
+                             capture_output=True, text=True)
+        if out.returncode != 0:
+            sys.stderr.write(out.stderr)
+            print(f"❌ {scale}: worker failed")
+            return 1
+        if args.verbose:
+            sys.stderr.write(out.stderr)
+        r = results[scale] = json.loads(out.stdout.strip().splitlines()[-1])
+        spans = '  '.join(f"{p}={v['pass_p50_s']:.2f}/{v['pass_p95_s']:.2f}" for p, v in r['phases'].items())
+        print(f"{scale:<7}{r['rows']['outreach_log']:>10}{r['sends_per_hour']:>10.0f}"
+              f"{r['db_round_trips_per_send'] or 0:>9.1f}{r['peak_rss_mb']:>9.0f}MB  {spans}")
+
+    report = {'benchmark': 'pipeline', 'python': sys.version.split()[0],
+              'config': {k: v for k, v in vars(args).items() if k not in ('json', 'compare', 'worker', 'scales')},
+              'results': results}
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Startup latency of each ai_sdr_agent.py subcommand.
+
+Every subcommand pays a fixed cost before it does any work: Python
+startup, importing ai_sdr_agent, and the CLI's dispatch, which builds the
+agent (or the orchestrator). This script calls ai_sdr_agent.main() per
+subcommand in fresh interpreters, with the command methods themselves
+stubbed to return at once, and fails when that gets slower than the
+budget, or when it imports an SDK that is supposed to load lazily
+(supabase, anthropic, pytz). Nothing touches the network.
+
+Usage:
+  python benchmarks/bench_startup.py                    # all subcommands, 5 runs each
+  python benchmarks/bench_startup.py status verify-gmail --repeat 10
+  python benchmarks/bench_startup.py --json startup.json --budget-ms 400
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+AGENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'agent')
+
+COMMANDS = [
+    'auto', 'daemon', 'orchestrate', 'send-batch', 'send-batch-prospects', 'process-followups',
+    'check-bounces', 'check-replies', 'check-replies-prospects', 'batch-verify', 'verify-gmail', 'status',
+]
+# Loaded on first use only; importing any of them at startup is a regression
+LAZY_MODULES = ['supabase', 'anthropic', 'pytz']
+# Import + dispatch, median over the runs
+DEFAULT_BUDGET_MS = 500
+
+# Runs in a fresh interpreter: ai_sdr_agent.main([command]) with the commands stubbed out
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import ai_sdr_agent
+t1 = time.perf_counter()
+for cls, names in (
+    (ai_sdr_agent.AISDRAgent, ['run_autonomous', 'run_daemon', 'send_batch', 'send_batch_prospects',
+                               'process_followups', 'check_bounces', 'check_replies', 'check_replies_prospects',
+                               'batch_verify', 'show_status']),
+    (ai_sdr_agent.OrgOrchestrator, ['run']),
+    (ai_sdr_agent.GmailService, ['verify']),
+):
+    for name in names:
+        setattr(cls, name, lambda self, *args, **kwargs: None)
+status = ai_sdr_agent.main(sys.argv[1:2])
+t2 = time.perf_counter()
+print(json.dumps({
+    'status': status,
+    'import_ms': (t1 - t0) * 1000,
+    'dispatch_ms': (t2 - t1) * 1000,
+    'loaded': [name for name in sys.argv[2:] if name in sys.modules],
+}))
+"""
+
+
+def probe(command: str, cache_dir: str) -> dict:
+    """One fresh-interpreter measurement of `command`'s startup."""
+    env = dict(os.environ, SDR_CACHE_DIR=cache_dir)
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, '-c', _PROBE, command, *LAZY_MODULES],
+        cwd=AGENT_DIR, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    wall_ms = (time.perf_counter() - started) * 1000
+    result = json.loads(out.strip().splitlines()[-1])
+    if result['status'] != 0:
+        raise RuntimeError(f"{command}: exit status {result['status']}")
+    result['wall_ms'] = wall_ms
+    return result
+
+
+def measure(command: str, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        probe(command, cache_dir)  # warm the bytecode cache
+        runs = [probe(command, cache_dir) for _ in range(repeat)]
+    return {
+        'import_ms': round(statistics.median(r['import_ms'] for r in runs), 1),
+        'dispatch_ms': round(statistics.median(r['dispatch_ms'] for r in runs), 1),
+        'wall_ms': round(statistics.median(r['wall_ms'] for r in runs), 1),
+        'lazy_modules_loaded': sorted({name for r in runs for name in r['loaded']}),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('commands', nargs='*', default=COMMANDS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help='max median import + dispatch time per subcommand')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+
+    results, failures = {}, []
+    print(f"{'command':<26}{'import':>10}{'dispatch':>10}{'wall':>10}")
+    for command in args.commands:
+        r = results[command] = measure(command, args.repeat)
+        print(f"{command:<26}{r['import_ms']:>8.1f}ms{r['dispatch_ms']:>8.1f}ms{r['wall_ms']:>8.1f}ms")
+        if r['import_ms'] + r['dispatch_ms'] > args.budget_ms:
+            failures.append(f"{command}: {r['import_ms'] + r['dispatch_ms']:.0f}ms > {args.budget_ms:.0f}ms budget")
+        if r['lazy_modules_loaded']:
+            failures.append(f"{command}: imported {', '.join(r['lazy_modules_loaded'])} at startup")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'benchmark': 'startup', 'python': sys.version.split()[0],
+                       'budget_ms': args.budget_ms, 'results': results}, f, indent=2)
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
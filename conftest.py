@@ -3,8 +3,17 @@
 This repo is primarily a JavaScript project and may run pytest without the
 pytest-cov plugin installed. We accept common coverage CLI flags so
 `pytest --cov=./` still runs instead of failing on argument parsing.
+
+The Python agent modules live in `agent/` and import each other as
+top-level modules (the agent runs as `python agent/ai_sdr_agent.py`), so
+that directory is put on sys.path for the tests.
 """
 
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agent'))
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -0,0 +1,92 @@
+-- ============================================
+-- Migration: Expiring leases for concurrent agent workers
+-- ============================================
+-- Used by agent/leases.py (AISDRAgent._leases).
+--
+-- One row per leased resource:
+--   org:<org_id>         org-wide maintenance (bounce / reply scans); held
+--                        for the run and renewed from the heartbeat
+--   sender:<email>       a sender inbox; only its holder sends from it,
+--                        so parallel workers split the sender pool
+--   lead:<id>, prospect:<id>, followup:<id>
+--                        a claimed work item; not renewed, expires after
+--                        the claim TTL so the send's DB writes have landed
+--                        before any other worker can pick it up
+--
+-- A lease is free when it doesn't exist or has expired.  claim_leases()
+-- takes every free (or already own) resource from the list in one
+-- INSERT ... ON CONFLICT statement, so concurrent workers never get the
+-- same resource.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS agent_leases (
+  resource TEXT PRIMARY KEY,
+  org_id UUID,
+  holder TEXT NOT NULL,
+  expires_at TIMESTAMPTZ NOT NULL,
+  acquired_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  renewed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_agent_leases_holder ON agent_leases (holder);
+CREATE INDEX IF NOT EXISTS idx_agent_leases_expires_at ON agent_leases (expires_at);
+
+-- Claim the free resources among p_resources; returns the ones now held by p_holder
+CREATE OR REPLACE FUNCTION claim_leases(
+  p_holder TEXT,
+  p_resources TEXT[],
+  p_ttl_seconds INT DEFAULT 300,
+  p_org_id UUID DEFAULT NULL
+)
+RETURNS SETOF TEXT
+LANGUAGE sql
+VOLATILE
+AS $$
+  INSERT INTO agent_leases AS l (resource, org_id, holder, expires_at)
+  SELECT DISTINCT r, p_org_id, p_holder, now() + make_interval(secs => p_ttl_seconds)
+  FROM unnest(p_resources) AS r
+  ON CONFLICT (resource) DO UPDATE
+    SET holder = EXCLUDED.holder,
+        org_id = EXCLUDED.org_id,
+        expires_at = EXCLUDED.expires_at,
+        renewed_at = now(),
+        acquired_at = CASE WHEN l.holder = EXCLUDED.holder THEN l.acquired_at ELSE now() END
+    WHERE l.expires_at < now() OR l.holder = EXCLUDED.holder
+  RETURNING l.resource;
+$$;
+
+-- Extend p_holder's leases on p_resources; returns the ones still held
+CREATE OR REPLACE FUNCTION renew_leases(
+  p_holder TEXT,
+  p_resources TEXT[],
+  p_ttl_seconds INT DEFAULT 300
+)
+RETURNS SETOF TEXT
+LANGUAGE sql
+VOLATILE
+AS $$
+  UPDATE agent_leases
+  SET expires_at = now() + make_interval(secs => p_ttl_seconds), renewed_at = now()
+  WHERE holder = p_holder AND resource = ANY(p_resources)
+  RETURNING resource;
+$$;
+
+-- Drop p_holder's leases (all of them when p_resources is NULL)
+CREATE OR REPLACE FUNCTION release_leases(
+  p_holder TEXT,
+  p_resources TEXT[] DEFAULT NULL
+)
+RETURNS INT
+LANGUAGE sql
+VOLATILE
+AS $$
+  WITH released AS (
+    DELETE FROM agent_leases
+    WHERE holder = p_holder AND (p_resources IS NULL OR resource = ANY(p_resources))
+    RETURNING 1
+  )
+  SELECT COUNT(*)::int FROM released;
+$$;
+
+-- Expired rows are harmless (claims overwrite them); prune occasionally
+DELETE FROM agent_leases WHERE expires_at < now() - interval '1 day';
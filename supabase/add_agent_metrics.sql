@@ -0,0 +1,42 @@
+-- ============================================
+-- Migration: Per-run timing spans from the autonomous agent
+-- ============================================
+-- Written by agent/ai_sdr_agent.py (AgentResources.report_spans) at the end
+-- of `auto`, each `daemon` cycle and `orchestrate`: one row per span
+-- (agent/spans.py) with the run's count, total and percentiles, e.g.
+--   span = 'llm_generate', count = 42, total_seconds = 63.1, p95_seconds = 2.5
+-- Spans: contact_lookup, apollo_verify, elv_verify, llm_generate,
+-- gmail_send, header_fetch, db_write, reply_scan, bounce_scan,
+-- followup_scan.  Percentiles are histogram bucket upper bounds; the
+-- buckets themselves are kept in `histogram` ({"bounds": [...], "counts": [...]},
+-- the last count being slower than every bound).
+--
+-- Without this table the agent only prints the report.  Set
+-- SDR_WRITE_METRICS=0 to skip the write.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS agent_metrics (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  org_id UUID,
+  run_id TEXT,
+  run_started_at TIMESTAMPTZ NOT NULL,
+  run_seconds NUMERIC,
+  span TEXT NOT NULL,
+  count INT NOT NULL DEFAULT 0,
+  total_seconds NUMERIC,
+  mean_seconds NUMERIC,
+  p50_seconds NUMERIC,
+  p95_seconds NUMERIC,
+  max_seconds NUMERIC,
+  histogram JSONB,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_agent_metrics_run ON agent_metrics (run_started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_agent_metrics_org_span ON agent_metrics (org_id, span, run_started_at DESC);
+
+-- Example: where the last week's time went
+--   SELECT span, SUM(count) AS calls, ROUND(SUM(total_seconds) / 3600, 2) AS hours,
+--          MAX(p95_seconds) AS worst_p95
+--   FROM agent_metrics WHERE run_started_at > now() - interval '7 days'
+--   GROUP BY span ORDER BY hours DESC;
@@ -0,0 +1,13 @@
+-- ============================================
+-- Migration: Agent status snapshot on the heartbeat
+-- ============================================
+-- The autonomous agent publishes its heartbeat from a background thread
+-- (agent/heartbeat.py) and includes a small status snapshot:
+--   {"phase": "sending", "loop_count": 12, "sent": 34, "followups_sent": 5,
+--    "updated_at": "..."}
+-- The agent falls back to last_heartbeat only when this column is missing.
+-- ============================================
+
+ALTER TABLE agent_settings ADD COLUMN IF NOT EXISTS agent_status JSONB;
+
+COMMENT ON COLUMN agent_settings.agent_status IS 'Latest status snapshot published with the agent heartbeat (phase, loop_count, sent)';
@@ -0,0 +1,47 @@
+-- ============================================
+-- Migration: Case-insensitive suppression lookups
+-- ============================================
+-- Used by agent/ai_sdr_agent.py (match_addresses) to confirm Bloom filter
+-- hits of the emailed / bounced suppression indexes.
+--
+-- outreach_log.contact_email and activity_log.bounced_email keep whatever
+-- casing the address had when it was written (John@Acme.com), while the
+-- index and contact_database usually hold it lowercased.  A plain in_()
+-- filter misses those rows and the contact is emailed again, so both
+-- lookups compare lower(column) on an expression index instead.
+--
+-- Both functions return the matching addresses lowercased.  Until this is
+-- applied the agent falls back to (unindexed) ilike filters.
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_outreach_log_lower_contact_email
+  ON outreach_log (lower(contact_email));
+
+CREATE INDEX IF NOT EXISTS idx_activity_log_lower_bounced_email
+  ON activity_log (lower(bounced_email))
+  WHERE activity_type = 'email_bounced' AND bounced_email IS NOT NULL;
+
+-- Addresses from p_emails that were ever sent to
+CREATE OR REPLACE FUNCTION match_emailed_addresses(p_emails TEXT[])
+RETURNS SETOF TEXT
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT DISTINCT lower(contact_email)
+  FROM outreach_log
+  WHERE lower(contact_email) = ANY(ARRAY(SELECT lower(e) FROM unnest(p_emails) AS e));
+$$;
+
+-- Addresses from p_emails that bounced (for p_org_id, or any org when NULL)
+CREATE OR REPLACE FUNCTION match_bounced_addresses(p_emails TEXT[], p_org_id UUID DEFAULT NULL)
+RETURNS SETOF TEXT
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT DISTINCT lower(bounced_email)
+  FROM activity_log
+  WHERE activity_type = 'email_bounced'
+    AND bounced_email IS NOT NULL
+    AND lower(bounced_email) = ANY(ARRAY(SELECT lower(e) FROM unnest(p_emails) AS e))
+    AND (p_org_id IS NULL OR org_id = p_org_id);
+$$;
@@ -0,0 +1,77 @@
+-- ============================================
+-- Migration: Set-based follow-up due computation
+-- ============================================
+-- Used by AISDRAgent.process_followups.
+--
+-- Replaces loading every initial and follow-up outreach_log row into the
+-- agent, plus one outreach_log query per follow-up #2 candidate and one
+-- leads query per candidate, with a single window-function query.
+--
+-- One row per outreach thread — keyed by (lower(contact_email), lower(website)) —
+-- that is due, oldest first:
+--   original             initial outreach_log row (followup_number = 0)
+--   next_followup_number 1 when the initial email is >= p_fu1_days old and
+--                        there is no follow-up yet; 2 when the latest
+--                        follow-up #1 is >= p_fu2_days old and there is no #2
+--   lead                 leads row for original.lead_id (NULL if none)
+-- Threads with a recorded reply (replied_at) or bounce are never due.
+-- p_org_id limits the threads to one org (NULL: all orgs).
+--
+-- agent/followup_due.py implements the same contract in Python.
+-- ============================================
+
+-- Earlier versions also took p_limit
+DROP FUNCTION IF EXISTS get_due_followups(int, int, uuid, int);
+
+CREATE OR REPLACE FUNCTION get_due_followups(
+  p_fu1_days int DEFAULT 3,
+  p_fu2_days int DEFAULT 5,
+  p_org_id uuid DEFAULT NULL
+)
+RETURNS TABLE (
+  original jsonb,
+  next_followup_number int,
+  lead jsonb
+)
+LANGUAGE sql
+STABLE
+AS $$
+  WITH keyed AS (
+    SELECT
+      o.id,
+      o.lead_id,
+      COALESCE(o.followup_number, 0) AS followup_number,
+      o.sent_at,
+      row_number() OVER w_stage AS rn,
+      max(COALESCE(o.followup_number, 0)) OVER w_thread AS max_fu,
+      max(o.sent_at) FILTER (WHERE o.followup_number = 1) OVER w_thread AS fu1_sent_at,
+      bool_or(o.replied_at IS NOT NULL OR COALESCE(o.bounced, FALSE)) OVER w_thread AS closed
+    FROM outreach_log o
+    WHERE p_org_id IS NULL OR o.org_id = p_org_id
+    WINDOW
+      w_thread AS (PARTITION BY lower(o.contact_email), lower(o.website)),
+      w_stage AS (
+        PARTITION BY lower(o.contact_email), lower(o.website), COALESCE(o.followup_number, 0)
+        ORDER BY o.sent_at, o.id
+      )
+  )
+  SELECT
+    to_jsonb(o) AS original,
+    CASE WHEN k.max_fu = 0 THEN 1 ELSE 2 END AS next_followup_number,
+    to_jsonb(l) AS lead
+  FROM keyed k
+  JOIN outreach_log o ON o.id = k.id
+  LEFT JOIN leads l ON l.id = k.lead_id
+  WHERE k.followup_number = 0
+    AND k.rn = 1
+    AND NOT k.closed
+    AND (
+      (k.max_fu = 0 AND k.sent_at <= now() - make_interval(days => p_fu1_days))
+      OR (k.max_fu = 1 AND k.fu1_sent_at <= now() - make_interval(days => p_fu2_days))
+    )
+  ORDER BY k.sent_at;
+$$;
+
+-- Thread key index for the window partitions
+CREATE INDEX IF NOT EXISTS idx_outreach_log_thread_key
+    ON outreach_log (lower(contact_email), lower(website), followup_number, sent_at);
@@ -0,0 +1,17 @@
+-- ============================================
+-- Migration: Server-assigned insert time on outreach_log
+-- ============================================
+-- The agent refreshes its outreach cache (agent/ai_sdr_agent.py,
+-- _get_outreach_state) by reading only rows inserted since the last one it
+-- saw. sent_at can't serve as that watermark: it is set by the client when
+-- the email goes out, and rows replayed late from the agent's outbox or
+-- written by another worker land with a sent_at well before rows already
+-- read. created_at is assigned by the database at insert time instead.
+--
+-- Existing rows get the migration time, so the next refresh re-reads them
+-- once (harmless: the cache is a set of addresses).
+-- ============================================
+
+ALTER TABLE outreach_log ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS idx_outreach_log_created_at ON outreach_log (created_at);
@@ -0,0 +1,105 @@
+-- ============================================
+-- Migration: Aggregate pipeline stats RPCs
+-- ============================================
+-- Used by `python agent/ai_sdr_agent.py status`.
+--
+-- Replaces ~30 separate count="exact" queries against leads, outreach_log
+-- and prospects, plus one company_crawls count per prospect, with a single
+-- round-trip that groups by status, icp_fit, the prospect stage fields and
+-- followup_number.
+--
+-- Lead and outreach counts are global (matching the agent's status output).
+-- Prospect counts are scoped to p_org_id and returned as NULL when it is NULL.
+-- ============================================
+
+-- Crawled page count per prospect of an org, in one grouped query.
+CREATE OR REPLACE FUNCTION prospect_crawl_counts(p_org_id uuid)
+RETURNS TABLE (
+  prospect_id uuid,
+  crawl_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT p.id AS prospect_id, count(c.id) AS crawl_count
+  FROM prospects p
+  LEFT JOIN company_crawls c ON c.prospect_id = p.id
+  WHERE p.org_id = p_org_id
+  GROUP BY p.id;
+$$;
+
+
+CREATE OR REPLACE FUNCTION agent_pipeline_stats(
+  p_org_id uuid DEFAULT NULL,
+  p_min_crawl_pages int DEFAULT 3,
+  p_stale_days int DEFAULT 90
+)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+  WITH
+  lead_totals AS (
+    SELECT
+      count(*) AS total,
+      count(*) FILTER (WHERE icp_fit = 'HIGH' AND has_contacts) AS high_with_contacts,
+      count(*) FILTER (WHERE icp_fit = 'HIGH' AND has_contacts AND status = 'enriched') AS high_ready
+    FROM leads
+  ),
+  lead_status AS (SELECT status AS k, count(*) AS n FROM leads GROUP BY status),
+  lead_fit AS (SELECT icp_fit AS k, count(*) AS n FROM leads GROUP BY icp_fit),
+  outreach_fu AS (
+    SELECT COALESCE(followup_number, 0)::text AS k, count(*) AS n
+    FROM outreach_log
+    GROUP BY 1
+  ),
+  org_prospects AS (SELECT * FROM prospects WHERE p_org_id IS NOT NULL AND org_id = p_org_id),
+  prospect_status AS (SELECT status AS k, count(*) AS n FROM org_prospects GROUP BY status),
+  prospect_crawl AS (SELECT crawl_status AS k, count(*) AS n FROM org_prospects GROUP BY crawl_status),
+  prospect_analysis AS (SELECT analysis_status AS k, count(*) AS n FROM org_prospects GROUP BY analysis_status),
+  prospect_enrichment AS (SELECT enrichment_status AS k, count(*) AS n FROM org_prospects GROUP BY enrichment_status),
+  prospect_fit AS (SELECT icp_fit AS k, count(*) AS n FROM org_prospects GROUP BY icp_fit),
+  prospect_totals AS (
+    SELECT
+      count(*) AS total,
+      COALESCE(avg(p.confidence_score), 0) AS avg_confidence,
+      count(*) FILTER (
+        WHERE p.last_enriched_at IS NULL
+           OR p.last_enriched_at < now() - make_interval(days => p_stale_days)
+      ) AS stale,
+      count(*) FILTER (WHERE COALESCE(cc.crawl_count, 0) < p_min_crawl_pages) AS under_crawled
+    FROM org_prospects p
+    LEFT JOIN prospect_crawl_counts(p_org_id) cc ON cc.prospect_id = p.id
+  )
+  SELECT jsonb_build_object(
+    'leads', (
+      SELECT jsonb_build_object(
+        'total', lt.total,
+        'high_with_contacts', lt.high_with_contacts,
+        'high_ready', lt.high_ready,
+        'by_status', (SELECT COALESCE(jsonb_object_agg(k, n) FILTER (WHERE k IS NOT NULL), '{}'::jsonb) FROM lead_status),
+        'by_icp_fit', (SELECT COALESCE(jsonb_object_agg(k, n) FILTER (WHERE k IS NOT NULL), '{}'::jsonb) FROM lead_fit)
+      )
+      FROM lead_totals lt
+    ),
+    'outreach', jsonb_build_object(
+      'total', (SELECT COALESCE(sum(n), 0) FROM outreach_fu),
+      'by_followup_number', (SELECT COALESCE(jsonb_object_agg(k, n), '{}'::jsonb) FROM outreach_fu)
+    ),
+    'prospects', CASE WHEN p_org_id IS NULL THEN NULL ELSE (
+      SELECT jsonb_build_object(
+        'total', pt.total,
+        'avg_confidence', pt.avg_confidence,
+        'stale', pt.stale,
+        'under_crawled', pt.under_crawled,
+        'by_status', (SELECT COALESCE(jsonb_object_agg(k, n) FILTER (WHERE k IS NOT NULL), '{}'::jsonb) FROM prospect_status),
+        'crawl_status', (SELECT COALESCE(jsonb_object_agg(k, n) FILTER (WHERE k IS NOT NULL), '{}'::jsonb) FROM prospect_crawl),
+        'analysis_status', (SELECT COALESCE(jsonb_object_agg(k, n) FILTER (WHERE k IS NOT NULL), '{}'::jsonb) FROM prospect_analysis),
+        'enrichment_status', (SELECT COALESCE(jsonb_object_agg(k, n) FILTER (WHERE k IS NOT NULL), '{}'::jsonb) FROM prospect_enrichment),
+        'icp_fit', (SELECT COALESCE(jsonb_object_agg(k, n) FILTER (WHERE k IS NOT NULL), '{}'::jsonb) FROM prospect_fit)
+      )
+      FROM prospect_totals pt
+    ) END
+  );
+$$;
+
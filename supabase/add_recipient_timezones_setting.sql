@@ -0,0 +1,8 @@
+-- Add use_recipient_timezones to agent_settings.
+-- When TRUE (the default) the autonomous agent applies send_hour_start /
+-- send_hour_end / send_days in each recipient's local timezone (inferred from
+-- prospects.timezone / hq_country, lead state / country, or the website TLD;
+-- see agent/recipient_tz.py) instead of in US/Eastern for everyone.
+-- Set FALSE to go back to the single Eastern send window.
+
+ALTER TABLE agent_settings ADD COLUMN IF NOT EXISTS use_recipient_timezones BOOLEAN DEFAULT TRUE;
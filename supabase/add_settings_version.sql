@@ -0,0 +1,35 @@
+-- ============================================
+-- Migration: agent_settings change version
+-- ============================================
+-- The agent caches agent_settings in memory and polls only this counter
+-- (agent/settings_watcher.py); the full row is refetched when it changes.
+--
+-- The trigger bumps settings_version on any edit except the columns the
+-- agent writes itself (heartbeat and status), so dashboard changes such as
+-- pausing the agent are picked up within seconds without the agent's own
+-- heartbeat writes invalidating its cache.
+-- ============================================
+
+ALTER TABLE agent_settings ADD COLUMN IF NOT EXISTS settings_version BIGINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION bump_agent_settings_version()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF (to_jsonb(NEW) - ARRAY['last_heartbeat', 'agent_status', 'settings_version', 'updated_at'])
+     IS DISTINCT FROM
+     (to_jsonb(OLD) - ARRAY['last_heartbeat', 'agent_status', 'settings_version', 'updated_at']) THEN
+    NEW.settings_version := COALESCE(OLD.settings_version, 0) + 1;
+  ELSE
+    NEW.settings_version := OLD.settings_version;
+  END IF;
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_agent_settings_version ON agent_settings;
+CREATE TRIGGER trg_agent_settings_version
+  BEFORE UPDATE ON agent_settings
+  FOR EACH ROW
+  EXECUTE FUNCTION bump_agent_settings_version();
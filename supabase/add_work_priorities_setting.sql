@@ -0,0 +1,9 @@
+-- Add work_priorities to agent_settings.
+-- Optional JSON map of work item kind -> priority for the autonomous agent's
+-- unified send queue (agent/work_queue.py). Higher is sent first; missing
+-- kinds use the defaults:
+--   {"followup": 100, "enriched_lead": 50, "prospect": 50,
+--    "contacted_lead": 20, "contacted_prospect": 20}
+-- NULL (the default) keeps the built-in priorities.
+
+ALTER TABLE agent_settings ADD COLUMN IF NOT EXISTS work_priorities JSONB;
@@ -0,0 +1,43 @@
+from activity_writer import MAX_INSERT_ATTEMPTS, ActivityWriter
+
+
+def test_rows_are_inserted_in_batches_on_flush():
+    calls = []
+    writer = ActivityWriter(calls.append, flush_interval=60, batch_size=2)
+    writer.log_many([{'summary': str(i)} for i in range(5)])
+    assert writer.flush() == 5
+    writer.close()
+    assert [len(batch) for batch in calls] == [2, 2, 1]
+    assert all('created_at' in row for batch in calls for row in batch)
+
+
+def test_full_buffer_flushes_inline():
+    calls = []
+    writer = ActivityWriter(calls.append, flush_interval=60, batch_size=2, max_buffered=4)
+    writer.log_many([{'summary': str(i)} for i in range(4)])
+    assert len(writer) == 0
+    assert sum(len(batch) for batch in calls) == 4
+    writer.close()
+
+
+def test_failed_rows_are_retried_then_dropped():
+    attempts = []
+
+    def insert(rows):
+        attempts.append(len(rows))
+        raise RuntimeError('db down')
+
+    writer = ActivityWriter(insert, flush_interval=60)
+    writer.log({'summary': 'x'})
+    writer.close()
+    assert len(attempts) == MAX_INSERT_ATTEMPTS
+    assert writer.dropped == 1
+    assert len(writer) == 0
+
+
+def test_close_flushes_remaining_rows():
+    calls = []
+    writer = ActivityWriter(calls.append, flush_interval=60)
+    writer.log({'summary': 'last', 'created_at': '2026-01-01T00:00:00+00:00'})
+    writer.close()
+    assert calls == [[{'summary': 'last', 'created_at': '2026-01-01T00:00:00+00:00'}]]
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+
+from admission import DEFAULT_PHASE_SECONDS, MIN_PHASE_SAMPLES, AdmissionControl
+from latency import FOLLOWUP_PHASE, SEND_PHASE, LatencyStats
+
+NOW = datetime(2026, 3, 17, 12, 0, tzinfo=timezone.utc)
+
+
+def _control(stats=None, margin=60):
+    return AdmissionControl(stats or LatencyStats(), margin=margin, now=lambda: NOW)
+
+
+def test_no_deadline_always_admits():
+    assert _control().admit(SEND_PHASE)
+
+
+def test_defaults_are_used_until_enough_samples():
+    stats = LatencyStats()
+    control = _control(stats)
+    for _ in range(MIN_PHASE_SAMPLES - 1):
+        stats.record(SEND_PHASE, 5)
+    assert control.estimate(SEND_PHASE) == DEFAULT_PHASE_SECONDS[SEND_PHASE]
+    stats.record(SEND_PHASE, 5)
+    assert control.estimate(SEND_PHASE) == 5
+
+
+def test_refuses_work_whose_p95_overruns_the_deadline_and_drains():
+    stats = LatencyStats()
+    for seconds in [10] * 18 + [200, 200]:
+        stats.record(SEND_PHASE, seconds)
+    control = _control(stats, margin=30)
+    assert control.estimate(SEND_PHASE) == 200
+    assert control.admit(SEND_PHASE, deadline=NOW + timedelta(seconds=231))
+    assert not control.draining
+    assert not control.admit(SEND_PHASE, deadline=NOW + timedelta(seconds=229))
+    assert control.draining
+    assert control.refused == 1
+    assert 'send' in control.last_refusal
+
+
+def test_phases_are_summed():
+    control = _control(margin=0)
+    budget = DEFAULT_PHASE_SECONDS[SEND_PHASE] + DEFAULT_PHASE_SECONDS[FOLLOWUP_PHASE]
+    assert control.admit(SEND_PHASE, FOLLOWUP_PHASE, deadline=NOW + timedelta(seconds=budget))
+    assert not control.admit(SEND_PHASE, FOLLOWUP_PHASE, deadline=NOW + timedelta(seconds=budget - 1))
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend import BackendError, InMemoryBackend
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def db():
+    backend = InMemoryBackend()
+    backend.seed('leads', [
+        {'id': 'l1', 'website': 'a.com', 'status': 'enriched', 'icp_fit': 'HIGH', 'score': 3},
+        {'id': 'l2', 'website': 'b.com', 'status': 'contacted', 'icp_fit': 'HIGH', 'score': None},
+        {'id': 'l3', 'website': 'c.com', 'status': 'enriched', 'icp_fit': 'LOW', 'score': 7},
+    ])
+    return backend
+
+
+def test_filters_order_and_limit(db):
+    rows = db.table('leads').select('id').in_('icp_fit', ['HIGH', 'MEDIUM']).eq('status', 'enriched').execute().data
+    assert rows == [{'id': 'l1'}]
+    rows = db.table('leads').select('id').order('score', desc=True).limit(2).execute().data
+    assert [r['id'] for r in rows] == ['l2', 'l3']  # NULLS FIRST when descending
+    rows = db.table('leads').select('id').not_.is_('score', 'null').gt('score', 3).execute().data
+    assert rows == [{'id': 'l3'}]
+
+
+def test_or_expressions_use_postgrest_syntax(db):
+    rows = db.table('leads').select('id').or_('website.eq.a.com,score.gte.7').order('id').execute().data
+    assert [r['id'] for r in rows] == ['l1', 'l3']
+    rows = db.table('leads').select('id').or_('score.is.null,status.in.(nope,other)').execute().data
+    assert rows == [{'id': 'l2'}]
+
+
+def test_timestamps_compare_as_instants():
+    db = InMemoryBackend()
+    db.seed('outreach_log', [{'sent_at': (NOW - timedelta(hours=h)).isoformat()} for h in (1, 30)])
+    since = (NOW - timedelta(days=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    assert db.table('outreach_log').select('id', count='exact', head=True).gte('sent_at', since).execute().count == 1
+
+
+def test_writes(db):
+    assert db.table('leads').update({'status': 'replied'}).eq('id', 'l2').execute().data[0]['status'] == 'replied'
+    inserted = db.table('leads').insert({'website': 'd.com'}).execute().data[0]
+    assert inserted['id'] and inserted['created_at']
+    db.table('leads').upsert({'id': 'l1', 'status': 'contacted'}).execute()
+    assert db.table('leads').select('status').eq('id', 'l1').single().execute().data == {'status': 'contacted'}
+    db.table('leads').delete().in_('id', ['l1', 'l3']).execute()
+    assert sorted(r['website'] for r in db.rows('leads')) == ['b.com', 'd.com']
+
+
+def test_round_trips_are_counted(db):
+    db.table('leads').select('*').execute()
+    db.table('leads').update({'status': 'x'}).eq('id', 'l1').execute()
+    assert db.round_trips == 2
+    assert db.calls[('leads', 'update')] == 1
+
+
+def test_errors_match_postgrest(db):
+    with pytest.raises(BackendError, match='PGRST202'):
+        db.rpc('claim_leases', {}).execute()
+    with pytest.raises(BackendError):
+        db.table('leads').select('*').eq('id', 'missing').single().execute()
+    with pytest.raises(BackendError):
+        db.table('no_such_table')
+    db.register_rpc('echo', lambda backend, params: [params['x']])
+    assert db.rpc('echo', {'x': 1}).execute().data == [1]
+
+
+def test_agent_logic_runs_offline(monkeypatch, tmp_path):
+    import ai_sdr_agent
+
+    db = InMemoryBackend()
+    db.seed('agent_settings', [{'id': ai_sdr_agent.AGENT_SETTINGS_ID, 'org_id': 'org1', 'agent_enabled': True}])
+    db.seed('outreach_log', [
+        {'org_id': 'org1', 'sent_at': NOW.isoformat(), 'sender_email': 'a@x.com'},
+        {'org_id': 'org1', 'sent_at': NOW.isoformat(), 'sender_email': 'a@x.com'},
+        {'org_id': 'org2', 'sent_at': NOW.isoformat(), 'sender_email': 'b@x.com'},
+    ])
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, 'SUPABASE_PAGE_SIZE', 1)
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    agent = ai_sdr_agent.AISDRAgent()
+    try:
+        assert agent._get_remaining_today(10) == 8
+        assert agent._get_sender_sent_today('org1') == {'a@x.com': 2}
+    finally:
+        agent.close()
+
+
+def test_indexed_reads_follow_writes():
+    db = InMemoryBackend()
+    db.seed('outreach_log', [{'id': f'{i:04d}', 'org_id': 'o1' if i % 2 else 'o2', 'contact_email': f'c{i % 10}@x.com'}
+                             for i in range(100)])
+    q = db.table('outreach_log')
+    assert len(q.select('id').eq('contact_email', 'c3@x.com').execute().data) == 10
+    db.table('outreach_log').insert({'id': '0042a', 'org_id': 'o1', 'contact_email': 'c3@x.com'}).execute()
+    db.table('outreach_log').update({'contact_email': 'moved@x.com'}).eq('id', '0013').execute()
+    db.table('outreach_log').delete().in_('id', ['0023', '0033']).execute()
+    rows = db.table('outreach_log').select('id').in_('contact_email', ['c3@x.com', 'moved@x.com']).execute().data
+    assert [r['id'] for r in rows] == ['0003', '0013', '0043', '0053', '0063', '0073', '0083', '0093', '0042a']
+
+    # Keyset pages (as stream_rows reads them) see inserts and deletes between pages
+    page = db.table('outreach_log').select('id').eq('org_id', 'o1').gt('id', '0040').order('id').limit(3).execute().data
+    assert [r['id'] for r in page] == ['0041', '0042a', '0043']
+    db.table('outreach_log').delete().eq('id', '0045').execute()
+    db.table('outreach_log').insert({'id': '0044', 'org_id': 'o1'}).execute()
+    page = db.table('outreach_log').select('id').eq('org_id', 'o1').gt('id', '0043').order('id').limit(2).execute().data
+    assert [r['id'] for r in page] == ['0044', '0047']
+    rows = db.table('outreach_log').select('id').or_('contact_email.eq.moved@x.com,id.in.(0001,0002)').execute().data
+    assert [r['id'] for r in rows] == ['0001', '0002', '0013']
+
@@ -0,0 +1,40 @@
+from batch_sizer import (DEFAULT_BATCH_SIZE, SEND_PHASE, SETUP_PHASE, BatchSizer,
+                         adaptive_batch_size)
+from latency import LatencyStats
+
+
+def test_latency_stats_keep_a_rolling_window():
+    stats = LatencyStats(window=20)
+    for value in range(1, 41):
+        stats.record('send', value)
+    assert stats.count('send') == 20
+    assert stats.mean('send') == 30.5
+    assert stats.p95('send') == 39
+    assert stats.percentile('send', 50) == 30
+    assert stats.mean('missing', 1.5) == 1.5
+
+
+def test_default_size_until_both_phases_are_measured():
+    stats = LatencyStats()
+    sizer = BatchSizer(stats)
+    assert sizer.size(100) == DEFAULT_BATCH_SIZE
+    stats.record(SETUP_PHASE, 10)
+    assert sizer.size(3) == 3
+
+
+def test_slow_setup_grows_the_batch_to_amortise_it():
+    # setup 9s, 1s per send: 9 * 0.9 / (0.1 * 1) = 81 sends, capped at MAX_BATCH_SIZE
+    assert adaptive_batch_size(9, 1, remaining=500) == 50
+    assert adaptive_batch_size(2, 1, remaining=500) == 18
+    assert adaptive_batch_size(2, 1, remaining=7) == 7
+
+
+def test_batch_duration_bounds_the_size():
+    stats = LatencyStats()
+    stats.record(SETUP_PHASE, 30)
+    stats.record(SEND_PHASE, 5)
+    sizer = BatchSizer(stats, max_batch_seconds=600)
+    # 2-minute gaps: setup is already a small fraction, and 600s fits 4 sends
+    assert sizer.size(100, gap_seconds=145) == 2
+    assert adaptive_batch_size(300, 150, remaining=100, max_batch_seconds=600) == 4
+    assert adaptive_batch_size(1, 1000, remaining=100) == 1
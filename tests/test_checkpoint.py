@@ -0,0 +1,77 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from checkpoint import CHECKPOINT_MAX_AGE_SECONDS, RunCheckpoint
+
+START = datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc)
+
+
+def _checkpoint(path, now):
+    return RunCheckpoint(str(path), clock=lambda: now[0])
+
+
+def test_state_survives_a_restart(tmp_path):
+    now = [START]
+    path = tmp_path / 'checkpoint.json'
+    first = _checkpoint(path, now)
+    assert not first.resumed
+    first.mark('replies_checked_at')
+    first.set('leads_reply_history_id', '12345')
+    first.record_sender_send('a@x.com')
+    first.record_sender_send('a@x.com')
+    first.park('lead:1')
+    first.save()
+
+    now[0] += timedelta(minutes=10)
+    second = _checkpoint(path, now)
+    assert second.resumed
+    assert second.time('replies_checked_at') == START
+    assert second.get('leads_reply_history_id') == '12345'
+    assert second.sender_sent('a@x.com') == 2
+    assert second.sender_sent('b@x.com') == 0
+    assert second.parked() == {'lead:1'}
+
+
+def test_due_follows_the_interval(tmp_path):
+    now = [START]
+    checkpoint = _checkpoint(tmp_path / 'checkpoint.json', now)
+    assert checkpoint.due('bounces_checked_at', 1800)
+    checkpoint.mark('bounces_checked_at')
+    now[0] += timedelta(minutes=29)
+    assert not checkpoint.due('bounces_checked_at', 1800)
+    now[0] += timedelta(minutes=1)
+    assert checkpoint.due('bounces_checked_at', 1800)
+
+
+def test_day_scoped_state_resets_at_utc_midnight(tmp_path):
+    now = [START]
+    checkpoint = _checkpoint(tmp_path / 'checkpoint.json', now)
+    checkpoint.record_sender_send('a@x.com')
+    checkpoint.park('lead:1')
+    checkpoint.mark('replies_checked_at')
+    now[0] = START.replace(hour=23, minute=59) + timedelta(minutes=2)
+    assert checkpoint.sender_sent('a@x.com') == 0
+    assert checkpoint.parked() == set()
+    assert checkpoint.time('replies_checked_at') == START
+
+
+def test_stale_or_foreign_checkpoints_are_ignored(tmp_path):
+    now = [START]
+    path = tmp_path / 'checkpoint.json'
+    checkpoint = _checkpoint(path, now)
+    checkpoint.mark('replies_checked_at')
+    checkpoint.save()
+    now[0] += timedelta(seconds=CHECKPOINT_MAX_AGE_SECONDS + 1)
+    assert not _checkpoint(path, now).resumed
+
+    path.write_text(json.dumps({'version': 999, 'saved_at': START.isoformat()}))
+    assert not _checkpoint(path, [START]).resumed
+    path.write_text('{not json')
+    assert not _checkpoint(path, [START]).resumed
+
+
+def test_save_leaves_no_temporary_files(tmp_path):
+    checkpoint = _checkpoint(tmp_path / 'cache' / 'checkpoint.json', [START])
+    checkpoint.save()
+    checkpoint.save()
+    assert [p.name for p in (tmp_path / 'cache').iterdir()] == ['checkpoint.json']
@@ -0,0 +1,66 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from control_server import ControlServer
+
+
+def _call(server, path, method='GET', token=None):
+    req = urllib.request.Request(f"http://127.0.0.1:{server.port}{path}", method=method,
+                                 data=b'' if method == 'POST' else None)
+    if token:
+        req.add_header('Authorization', f'Bearer {token}')
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.fixture
+def server():
+    state = {'paused': False}
+
+    def pause():
+        state['paused'] = True
+        return dict(state)
+
+    control = ControlServer({'status': lambda: dict(state), 'pause': pause}, port=0)
+    control.start()
+    yield control
+    control.stop()
+
+
+def test_status_is_readable_with_get(server):
+    assert _call(server, '/status') == (200, {'paused': False})
+
+
+def test_state_changing_commands_need_post(server):
+    assert _call(server, '/pause')[0] == 405
+    assert _call(server, '/status')[1] == {'paused': False}
+    assert _call(server, '/pause', method='POST') == (200, {'paused': True})
+
+
+def test_unknown_command_lists_the_known_ones(server):
+    status, body = _call(server, '/reboot', method='POST')
+    assert status == 404
+    assert body['commands'] == ['pause', 'status']
+
+
+def test_token_is_required_when_configured():
+    control = ControlServer({'status': lambda: {'ok': True}}, port=0, token='s3cret')
+    control.start()
+    try:
+        assert _call(control, '/status')[0] == 401
+        assert _call(control, '/status', token='s3cret') == (200, {'ok': True})
+    finally:
+        control.stop()
+
+
+def test_command_errors_are_reported(server):
+    server.commands['status'] = lambda: 1 / 0
+    status, body = _call(server, '/status')
+    assert status == 500
+    assert 'division' in body['error']
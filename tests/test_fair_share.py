@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+from fair_share import FairShare
+
+NOW = datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc)
+
+
+def _fair(**weights):
+    fair = FairShare()
+    for org_id, weight in weights.items():
+        fair.set_org(org_id, weight)
+    return fair
+
+
+def test_turns_follow_daily_cap_weights():
+    fair = _fair(big=200, small=50)
+    turns = []
+    for _ in range(10):
+        org_id, _ = fair.pick(NOW, {'big': NOW, 'small': NOW})
+        turns.append(org_id)
+        fair.record(org_id, 1)
+    assert turns.count('big') == 8
+    assert turns.count('small') == 2
+
+
+def test_ties_go_to_least_recently_served():
+    fair = _fair(a=50, b=50)
+    first, _ = fair.pick(NOW, {'a': NOW, 'b': NOW})
+    fair.record(first, 0)
+    second, _ = fair.pick(NOW, {'a': NOW, 'b': NOW})
+    assert second != first
+
+
+def test_org_not_yet_eligible_is_skipped_and_sets_wake_time():
+    fair = _fair(a=50, b=50)
+    later = NOW + timedelta(minutes=2)
+    assert fair.pick(NOW, {'a': later, 'b': NOW}) == ('b', NOW)
+    assert fair.pick(NOW, {'a': later, 'b': later + timedelta(minutes=1)}) == (None, later)
+
+
+def test_deferral_applies_until_cleared():
+    fair = _fair(a=50)
+    until = NOW + timedelta(hours=1)
+    fair.defer('a', until)
+    assert fair.pick(NOW, {'a': NOW}) == (None, until)
+    fair.defer('a', None)
+    assert fair.pick(NOW, {'a': NOW}) == ('a', NOW)
+
+
+def test_paused_and_removed_orgs_are_never_picked():
+    fair = _fair(a=50, b=50)
+    fair.remove('b')
+    assert fair.pick(NOW, {'a': None, 'b': NOW}) == (None, None)
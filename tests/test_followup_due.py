@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+
+from followup_due import compute_due_followups
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _row(row_id, email, days_ago, followup_number=0, **extra):
+    return {
+        'id': row_id,
+        'lead_id': extra.pop('lead_id', f"lead-{email}"),
+        'contact_email': email,
+        'website': extra.pop('website', 'brand.com'),
+        'followup_number': followup_number,
+        'sent_at': (NOW - timedelta(days=days_ago)).isoformat(),
+        **extra,
+    }
+
+
+def _due(rows, leads=None):
+    return [(d['original']['id'], d['next_followup_number']) for d in compute_due_followups(rows, leads, NOW)]
+
+
+def test_initial_email_becomes_due_for_followup_1_after_three_days():
+    rows = [_row('a', 'a@x.com', 3), _row('b', 'b@x.com', 2)]
+    assert _due(rows) == [('a', 1)]
+
+
+def test_followup_2_uses_the_original_row_and_waits_five_days():
+    rows = [
+        _row('a0', 'a@x.com', 9), _row('a1', 'A@x.com', 5, followup_number=1),
+        _row('b0', 'b@x.com', 9), _row('b1', 'b@x.com', 4, followup_number=1),
+    ]
+    assert _due(rows) == [('a0', 2)]
+
+
+def test_finished_replied_and_bounced_threads_are_never_due():
+    rows = [
+        _row('a0', 'a@x.com', 20), _row('a1', 'a@x.com', 15, followup_number=1),
+        _row('a2', 'a@x.com', 8, followup_number=2),
+        _row('b0', 'b@x.com', 6, replied_at=NOW.isoformat()),
+        _row('c0', 'c@x.com', 6), _row('c1', 'c@x.com', 6, followup_number=1, bounced=True),
+    ]
+    assert _due(rows) == []
+
+
+def test_one_item_per_thread_with_lead_snapshot_oldest_first():
+    rows = [
+        _row('late', 'a@x.com', 4, lead_id='L1'),
+        _row('early', 'a@x.com', 6, lead_id='L1'),
+        _row('other', 'b@x.com', 10, lead_id=None, website='other.com'),
+    ]
+    due = compute_due_followups(rows, {'L1': {'id': 'L1', 'status': 'contacted'}}, NOW)
+    assert [d['original']['id'] for d in due] == ['other', 'early']
+    assert due[0]['lead'] is None
+    assert due[1]['lead'] == {'id': 'L1', 'status': 'contacted'}
+
+
+def test_no_limit_returns_every_due_thread():
+    rows = [_row(f"r{i}", f"{i}@x.com", 3 + i / 1000) for i in range(750)]
+    assert len(_due(rows)) == 750
+    assert len(compute_due_followups(rows, None, NOW, limit=500)) == 500
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+
+from backend import BackendError, InMemoryBackend
+
+
+def test_followup_is_not_resent_while_its_outbox_insert_fails(monkeypatch, tmp_path):
+    import ai_sdr_agent
+
+    class FailingInserts(InMemoryBackend):
+        def _execute(self, q):
+            if q._table == 'outreach_log' and q._op == 'insert':
+                raise BackendError('timed out')
+            return super()._execute(q)
+
+    db = FailingInserts()
+    db.seed('agent_settings', [{'id': ai_sdr_agent.AGENT_SETTINGS_ID, 'org_id': 'org1', 'agent_enabled': True}])
+    db.seed('outreach_log', [{'id': 'o1', 'org_id': 'org1', 'contact_email': 'CEO@brand.com', 'website': 'brand.com',
+                              'followup_number': 0, 'email_subject': 'Hi',
+                              'sent_at': (datetime.now(timezone.utc) - timedelta(days=4)).isoformat()}])
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, 'SDR_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    monkeypatch.setattr(ai_sdr_agent, 'generate_followup_email', lambda *a: {'body': 'Following up'})
+    agent = ai_sdr_agent.AISDRAgent()
+    sent = []
+    monkeypatch.setattr(agent.gmail, 'send_email', lambda **kw: sent.append(kw['to']) or {'id': f'm{len(sent)}'})
+    monkeypatch.setattr(agent.gmail, 'get_message_headers', lambda msg_id: {})
+    monkeypatch.setattr(agent.gmail, 'get_from_email', lambda: 'me@onsite.com')
+    try:
+        assert agent.process_followups() == 1
+        agent._outbox.replay(force=True)
+        assert agent._outbox.pending(ref='ceo@brand.com') == 1
+
+        # The thread still looks due in outreach_log, but the queued insert holds it back
+        assert agent._due_followup_candidates(datetime.now(timezone.utc)) == []
+        assert agent.process_followups() == 0
+        assert agent._send_followup(db.tables['outreach_log'][0], 1, None) == 'skipped'
+        assert sent == ['CEO@brand.com']
+    finally:
+        agent.close()
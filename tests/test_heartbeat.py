@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from heartbeat import Heartbeat
+
+
+def test_heartbeat_publishes_status_from_background_thread():
+    published = []
+    beat = threading.Event()
+
+    def publish(beat_iso, status):
+        published.append((beat_iso, status, threading.current_thread().name))
+        beat.set()
+
+    hb = Heartbeat(publish, interval=60)
+    hb.update(phase='sending', loop_count=3)
+    hb.incr('sent', 2)
+    hb.start()
+    assert beat.wait(2)
+    hb.stop()
+
+    beat_iso, status, thread_name = published[0]
+    assert thread_name == 'heartbeat'
+    assert status['phase'] == 'sending'
+    assert status['loop_count'] == 3
+    assert status['sent'] == 2
+    assert status['updated_at'] == beat_iso
+
+
+def test_stop_publishes_final_phase_and_errors_do_not_raise():
+    published = []
+    errors = []
+
+    def publish(beat_iso, status):
+        published.append(status)
+        if len(published) == 1:
+            raise RuntimeError('db down')
+
+    hb = Heartbeat(publish, interval=60, on_error=errors.append)
+    hb.start()
+    hb.stop(final_phase='stopped')
+    assert len(errors) == 1
+    assert published[-1]['phase'] == 'stopped'
+
+
+def test_agent_keeps_agent_status_after_transient_errors(monkeypatch, tmp_path):
+    import ai_sdr_agent
+    from backend import BackendError, InMemoryBackend
+
+    class FlakyBackend(InMemoryBackend):
+        def _execute(self, q):
+            if q._table == 'agent_settings' and self.errors:
+                raise self.errors.pop(0)
+            return super()._execute(q)
+
+    db = FlakyBackend()
+    db.errors = []
+    db.seed('agent_settings', [{'id': ai_sdr_agent.AGENT_SETTINGS_ID}])
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    agent = ai_sdr_agent.AISDRAgent()
+    try:
+        db.errors.append(BackendError('timed out'))
+        with pytest.raises(BackendError):
+            agent._publish_heartbeat('t1', {'phase': 'sending'})
+        assert agent._heartbeat_status_column
+        agent._publish_heartbeat('t2', {'phase': 'sending'})
+        assert db.tables['agent_settings'][0]['agent_status'] == {'phase': 'sending'}
+
+        db.errors.append(BackendError("PGRST204: Could not find the 'agent_status' column of 'agent_settings'"))
+        agent._publish_heartbeat('t3', {'phase': 'idle'})
+        assert not agent._heartbeat_status_column
+        assert db.tables['agent_settings'][0]['last_heartbeat'] == 't3'
+    finally:
+        agent.close()
@@ -0,0 +1,106 @@
+from leases import LeaseManager
+
+
+class FakeLeaseTable:
+    """In-memory stand-in for the agent_leases RPCs (expiry is driven by `expire`)."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def expire(self, resource):
+        self.rows.pop(resource, None)
+
+    def rpc(self, name, params):
+        holder = params['p_holder']
+        if name == 'claim_leases':
+            got = []
+            for resource in dict.fromkeys(params['p_resources']):
+                if self.rows.get(resource, holder) == holder:
+                    self.rows[resource] = holder
+                    got.append(resource)
+            return got
+        if name == 'renew_leases':
+            return [r for r in params['p_resources'] if self.rows.get(r) == holder]
+        if name == 'release_leases':
+            for r in params['p_resources']:
+                if self.rows.get(r) == holder:
+                    del self.rows[r]
+            return 1
+        raise AssertionError(name)
+
+
+def test_workers_split_claims_without_overlap():
+    table = FakeLeaseTable()
+    a = LeaseManager(table.rpc, holder='a')
+    b = LeaseManager(table.rpc, holder='b')
+    assert a.claim(['lead:1', 'lead:2']) == {'lead:1', 'lead:2'}
+    assert b.claim(['lead:2', 'lead:3']) == {'lead:3'}
+    assert a.claim(['lead:2']) == {'lead:2'}
+
+
+def test_run_long_leases_renew_release_and_take_over():
+    table = FakeLeaseTable()
+    a = LeaseManager(table.rpc, holder='a')
+    b = LeaseManager(table.rpc, holder='b')
+    assert a.acquire(['sender:x@y.com', 'org:1']) == {'sender:x@y.com', 'org:1'}
+    assert b.acquire(['org:1']) == set()
+
+    # a's org lease expires (e.g. missed renewals); b takes it over
+    table.expire('org:1')
+    assert b.acquire(['org:1']) == {'org:1'}
+    assert a.renew() == 1
+    assert a.held == {'sender:x@y.com'}
+
+    a.release()
+    assert a.held == set()
+    assert b.acquire(['sender:x@y.com']) == {'sender:x@y.com'}
+
+
+def test_missing_rpcs_fall_back_to_single_worker():
+    errors = []
+
+    def rpc(name, params):
+        raise RuntimeError("PGRST202: Could not find the function public.claim_leases")
+
+    leases = LeaseManager(rpc, holder='a', on_error=lambda e, name: errors.append(name))
+    assert leases.claim(['lead:1']) == {'lead:1'}
+    assert leases.acquire(['org:1']) == {'org:1'}
+    assert not leases.enabled
+    assert errors == ['claim_leases']
+
+
+def test_other_rpc_errors_fail_closed():
+    def rpc(name, params):
+        raise ConnectionError('timeout')
+
+    leases = LeaseManager(rpc, holder='a')
+    assert leases.claim(['lead:1']) == set()
+    assert leases.enabled
+
+
+def test_send_loop_releases_unattempted_claims():
+    from types import SimpleNamespace
+
+    import ai_sdr_agent
+    from work_queue import ENRICHED_LEAD, FOLLOWUP, WorkQueue
+
+    table = FakeLeaseTable()
+    worker = SimpleNamespace(_leases=LeaseManager(table.rpc, holder='a'))
+    queue = WorkQueue()
+    for n in range(2):
+        queue.push(FOLLOWUP, f'followup:{n}', {})
+    for n in range(4):
+        queue.push(ENRICHED_LEAD, f'lead:{n}', {})
+
+    items = ai_sdr_agent.AISDRAgent._claimed_items(worker, queue, lambda: 3, None)
+    assert next(items).key == 'followup:0'
+    assert set(table.rows) == {'followup:0', 'followup:1', 'lead:0'}
+    items.close()
+    assert set(table.rows) == {'followup:0'}
+
+    # Senders exhausted: initial sends are dropped without being claimed
+    queue.push(FOLLOWUP, 'followup:2', {})
+    items = ai_sdr_agent.AISDRAgent._claimed_items(worker, queue, lambda: 3, None,
+                                                   accept=lambda item: item.kind == FOLLOWUP)
+    assert [item.key for item in items] == ['followup:2']
+    assert set(table.rows) == {'followup:0', 'followup:2'} and not queue
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend import InMemoryBackend
+
+
+def _patch_agent(monkeypatch, tmp_path, db):
+    import ai_sdr_agent
+
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, 'SDR_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    return ai_sdr_agent
+
+
+@pytest.mark.parametrize('deployed', [True, False])
+def test_each_org_sends_only_its_own_followups(monkeypatch, tmp_path, deployed):
+    from followup_due import compute_due_followups
+
+    db = InMemoryBackend()
+    db.seed('agent_settings', [{'id': f's-{org}', 'org_id': org, 'agent_enabled': True} for org in ('org1', 'org2')])
+    sent_at = (datetime.now(timezone.utc) - timedelta(days=4)).isoformat()
+    db.seed('outreach_log', [
+        {'id': f'o-{org}', 'org_id': org, 'contact_email': f'ceo@{org}.com', 'website': f'{org}.com',
+         'followup_number': 0, 'sent_at': sent_at}
+        for org in ('org1', 'org2')
+    ])
+    if deployed:
+        db.register_rpc('get_due_followups', lambda backend, params: compute_due_followups(
+            backend.tables['outreach_log'], None, datetime.now(timezone.utc),
+            params['p_fu1_days'], params['p_fu2_days'], org_id=params.get('p_org_id')))
+    ai_sdr_agent = _patch_agent(monkeypatch, tmp_path, db)
+
+    orchestrator = ai_sdr_agent.OrgOrchestrator()
+    try:
+        assert orchestrator.refresh_orgs() == 2
+        sent = {}
+        for org_id, agent in orchestrator.agents.items():
+            monkeypatch.setattr(agent, '_send_followup', lambda row, *a, org_id=org_id:
+                                sent.setdefault(org_id, []).append(row['id']) or 'sent')
+            monkeypatch.setattr(agent, '_wait_between_sends', lambda *a: None)
+            assert agent.process_followups() == 1
+        assert sent == {'org1': ['o-org1'], 'org2': ['o-org2']}
+    finally:
+        for agent in orchestrator.agents.values():
+            agent.close()
+        orchestrator.resources.close()
+
+
+def test_orchestrated_batch_counts_own_queued_sends_and_yields_at_gap(monkeypatch, tmp_path):
+    from work_queue import FOLLOWUP, WorkQueue
+
+    db = InMemoryBackend()
+    ai_sdr_agent = _patch_agent(monkeypatch, tmp_path, db)
+    db.seed('agent_settings', [{'id': ai_sdr_agent.AGENT_SETTINGS_ID, 'org_id': 'org1', 'agent_enabled': True}])
+    agent = ai_sdr_agent.AISDRAgent()
+    agent._outbox.close()
+    try:
+        for n, org in enumerate(['org1', 'org1', 'org2']):
+            agent._outbox.record(f'send:{n}', [{'table': 'outreach_log', 'action': 'insert',
+                                                'values': {'org_id': org, 'gmail_message_id': f'm{n}'}}])
+        assert agent._queued_sends('org1') == 2 and agent._queued_sends('org2') == 1
+
+        queue = WorkQueue()
+        for n in range(3):
+            queue.push(FOLLOWUP, f'followup:{n}', {'original': {}, 'next_followup_number': 1})
+        monkeypatch.setattr(agent, '_build_work_queue', lambda *a: queue)
+        monkeypatch.setattr(agent, '_get_outreach_state', lambda: (set(), {}))
+        monkeypatch.setattr(agent, '_load_bounce_suppression', lambda: set())
+        monkeypatch.setattr(agent, '_send_followup', lambda *a: 'sent')
+        # The first send starts the gap; the turn ends instead of sleeping it out
+        result = agent.send_from_queue(count=3, sender_pool=[], yield_at_gap=True)
+        assert (result['sent'], result['followups']) == (1, 1)
+    finally:
+        agent.close()
@@ -0,0 +1,59 @@
+from outbox import MAX_RETRY_BACKOFF_SECONDS, Outbox
+
+INSERT = {'table': 'outreach_log', 'action': 'insert', 'values': {'gmail_message_id': 'm1'},
+          'unique': 'gmail_message_id'}
+UPDATE = {'table': 'leads', 'action': 'update', 'values': {'status': 'contacted'}, 'match': {'id': 'l1'}}
+
+
+def test_ops_are_applied_in_order_and_removed(tmp_path):
+    applied = []
+    outbox = Outbox(str(tmp_path / 'outbox.sqlite3'), lambda op, retry: applied.append((op['table'], retry)))
+    assert outbox.record('send:m1', [INSERT, UPDATE], ref='a@x.com') == 2
+    assert outbox.pending(ref='a@x.com') == 2
+    assert outbox.pending(kind='outreach_log.insert') == 1
+    assert outbox.pending_ops(kind='outreach_log.insert') == [INSERT]
+    assert outbox.replay() == 2
+    assert applied == [('outreach_log', False), ('leads', False)]
+    assert outbox.pending() == 0
+
+
+def test_recording_the_same_key_twice_is_a_no_op(tmp_path):
+    outbox = Outbox(str(tmp_path / 'outbox.sqlite3'), lambda op, retry: None)
+    assert outbox.record('send:m1', [INSERT]) == 1
+    assert outbox.record('send:m1', [INSERT]) == 0
+    assert outbox.pending() == 1
+
+
+def test_failed_ops_back_off_and_retry_with_flag(tmp_path):
+    now = [1000.0]
+    calls = []
+
+    def apply(op, retry):
+        calls.append(retry)
+        if len(calls) == 1:
+            raise RuntimeError('db down')
+
+    outbox = Outbox(str(tmp_path / 'outbox.sqlite3'), apply, clock=lambda: now[0])
+    outbox.record('send:m1', [INSERT])
+    assert outbox.replay() == 0
+    assert outbox.replay() == 0  # still backing off
+    now[0] += MAX_RETRY_BACKOFF_SECONDS
+    assert outbox.replay() == 1
+    assert calls == [False, True]
+
+
+def test_queued_ops_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'outbox.sqlite3')
+
+    def down(op, retry):
+        raise RuntimeError('db down')
+
+    first = Outbox(path, down)
+    first.record('send:m1', [INSERT, UPDATE], ref='a@x.com')
+    first.close()
+    assert first.pending() == 2
+
+    applied = []
+    second = Outbox(path, lambda op, retry: applied.append((op['table'], retry)))
+    assert second.replay(force=True) == 2
+    assert applied == [('outreach_log', True), ('leads', True)]
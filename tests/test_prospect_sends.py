@@ -0,0 +1,28 @@
+from backend import InMemoryBackend
+
+
+def test_prospect_contacts_are_discovered_only_when_attempted(monkeypatch, tmp_path):
+    import ai_sdr_agent
+
+    db = InMemoryBackend()
+    db.seed('agent_settings', [{'id': ai_sdr_agent.AGENT_SETTINGS_ID, 'org_id': 'org1'}])
+    db.seed('prospects', [{'id': f'p{i}', 'org_id': 'org1', 'website': f'brand{i}.com', 'status': 'qualified',
+                           'enrichment_status': 'gold_enriched', 'icp_fit_score': 90 - i} for i in range(300)])
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, 'SDR_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    agent = ai_sdr_agent.AISDRAgent()
+    discovered = []
+    monkeypatch.setattr(agent, 'discover_prospect_contacts', lambda pid: discovered.append(pid) or 0)
+    try:
+        agent._resolve_org_id()  # loads settings
+        trips = db.round_trips
+        qualified, contacted = agent._prospect_candidates(limit=200)
+        assert len(qualified) == 200 and contacted == []
+        assert db.round_trips - trips == 2 and discovered == []
+
+        settings = {'max_contacts_per_lead_per_day': 1}
+        assert agent._send_one_prospect(qualified[0], set(), {}, settings, {}) == 'failed'
+        assert discovered == ['p0']
+    finally:
+        agent.close()
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+from recipient_tz import infer_timezone
+from send_scheduler import SEND_TIMEZONE, SendWindow
+from work_queue import ENRICHED_LEAD, WorkQueue
+
+
+def test_explicit_timezone_wins():
+    row = {'timezone': 'Europe/Berlin', 'hq_country': 'US', 'website': 'shop.co.uk'}
+    assert infer_timezone(row) == 'Europe/Berlin'
+
+
+def test_invalid_timezone_falls_through_to_state_and_country():
+    assert infer_timezone({'timezone': 'Mars/Olympus', 'state': 'CA'}) == 'US/Pacific'
+    assert infer_timezone({'metadata': {'state': 'Texas'}}) == 'US/Central'
+    assert infer_timezone({'hq_country': 'AU'}) == 'Australia/Sydney'
+    assert infer_timezone({'country': 'United Kingdom'}) == 'Europe/London'
+
+
+def test_website_tld_then_default():
+    assert infer_timezone({'website': 'https://www.example.com.au/shop'}) == 'Australia/Sydney'
+    assert infer_timezone({'website': 'example.de'}) == 'Europe/Berlin'
+    assert infer_timezone({'website': 'example.com'}) == SEND_TIMEZONE
+    assert infer_timezone(None) == SEND_TIMEZONE
+
+
+def test_window_is_evaluated_in_recipient_time():
+    now = datetime(2026, 3, 17, 10, 0, tzinfo=timezone.utc)  # Tue 06:00 EDT, 11:00 CET
+    window = SendWindow(now, 9, 17, [1, 2, 3, 4, 5])
+    assert window.is_open('Europe/Berlin')
+    assert not window.is_open('US/Eastern')
+    assert window.opens_at('US/Pacific') == datetime(2026, 3, 17, 16, 0, tzinfo=timezone.utc)
+
+
+def test_deferred_items_report_earliest_opening():
+    queue = WorkQueue()
+    later = datetime(2026, 3, 17, 16, tzinfo=timezone.utc)
+    sooner = datetime(2026, 3, 17, 13, tzinfo=timezone.utc)
+    queue.defer('lead:1', later)
+    queue.defer('lead:2', sooner)
+    queue.defer('lead:2', None)
+    assert not queue.push(ENRICHED_LEAD, 'lead:1', {})
+    assert len(queue) == 0
+    assert queue.deferred == 2
+    assert queue.next_available_at == sooner
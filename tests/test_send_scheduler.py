@@ -0,0 +1,47 @@
+import threading
+from datetime import datetime, timezone
+
+from send_scheduler import (Scheduler, is_within_send_window, next_send_window_start,
+                            next_utc_midnight)
+
+WEEKDAYS = [1, 2, 3, 4, 5]
+
+
+def test_inside_window_returns_now():
+    now = datetime(2026, 3, 17, 15, 30, tzinfo=timezone.utc)  # Tue 11:30 EDT
+    assert is_within_send_window(now, 9, 17, WEEKDAYS)
+    assert next_send_window_start(now, 9, 17, WEEKDAYS) == now
+
+
+def test_before_window_opens_same_day():
+    now = datetime(2026, 3, 17, 11, 0, tzinfo=timezone.utc)  # Tue 07:00 EDT
+    assert next_send_window_start(now, 9, 17, WEEKDAYS) == datetime(2026, 3, 17, 13, 0, tzinfo=timezone.utc)
+
+
+def test_friday_evening_skips_to_monday():
+    now = datetime(2026, 3, 20, 23, 0, tzinfo=timezone.utc)  # Fri 19:00 EDT
+    assert next_send_window_start(now, 9, 17, WEEKDAYS) == datetime(2026, 3, 23, 13, 0, tzinfo=timezone.utc)
+
+
+def test_end_hour_is_inclusive_and_no_days_means_never():
+    now = datetime(2026, 3, 17, 21, 59, tzinfo=timezone.utc)  # Tue 17:59 EDT
+    assert is_within_send_window(now, 9, 17, WEEKDAYS)
+    assert next_send_window_start(now, 9, 17, []) is None
+
+
+def test_next_utc_midnight():
+    now = datetime(2026, 3, 17, 23, 59, tzinfo=timezone.utc)
+    assert next_utc_midnight(now) == datetime(2026, 3, 18, tzinfo=timezone.utc)
+
+
+def test_wake_interrupts_sleep():
+    scheduler = Scheduler(max_sleep=30)
+    threading.Timer(0.05, scheduler.wake, args=('settings changed',)).start()
+    assert scheduler.sleep_until(None) is True
+    assert scheduler.wake_reason == 'settings changed'
+
+
+def test_sleep_is_capped_by_deadline():
+    scheduler = Scheduler(max_sleep=30)
+    now = datetime.now(timezone.utc)
+    assert scheduler.sleep_until(datetime(2100, 1, 1, tzinfo=timezone.utc), deadline=now) is False
@@ -0,0 +1,94 @@
+from settings_watcher import SettingsWatcher
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _watcher(row, version, **kwargs):
+    clock = _Clock()
+    watcher = SettingsWatcher(lambda: dict(row), lambda: version[0], poll_interval=10, clock=clock, **kwargs)
+    return watcher, clock
+
+
+def test_unchanged_version_is_served_from_memory():
+    row = {'agent_enabled': True, 'settings_version': 1}
+    version = [1]
+    watcher, clock = _watcher(row, version)
+
+    assert watcher.get(refresh=True)['agent_enabled'] is True
+    for _ in range(5):
+        clock.now += 11
+        watcher.get(refresh=True)
+    assert watcher.row_fetches == 1
+    assert watcher.version_checks == 5
+
+
+def test_version_change_refetches_and_notifies():
+    row = {'agent_enabled': True, 'settings_version': 1}
+    version = [1]
+    watcher, clock = _watcher(row, version)
+    seen = []
+    watcher.subscribe(seen.append)
+    watcher.get()
+
+    row.update(agent_enabled=False, settings_version=2)
+    version[0] = 2
+    clock.now += 11
+    assert watcher.get(refresh=True)['agent_enabled'] is False
+    assert seen and seen[0]['agent_enabled'] is False
+
+
+def test_checks_are_throttled_within_poll_interval():
+    version = [1]
+    watcher, clock = _watcher({'settings_version': 1}, version)
+    watcher.get()
+    clock.now += 3
+    watcher.get(refresh=True)
+    assert watcher.version_checks == 0
+
+
+def test_without_version_column_heartbeat_changes_do_not_notify():
+    row = {'agent_enabled': True, 'last_heartbeat': 'a'}
+    watcher, clock = _watcher(row, [None])
+    seen = []
+    watcher.subscribe(seen.append)
+    watcher.get()
+
+    row['last_heartbeat'] = 'b'
+    clock.now += 11
+    watcher.get(refresh=True)
+    assert watcher.row_fetches == 2
+    assert seen == []
+
+
+def test_agent_keeps_version_checks_after_transient_errors(monkeypatch, tmp_path):
+    import ai_sdr_agent
+    from backend import BackendError, InMemoryBackend
+
+    class FlakyBackend(InMemoryBackend):
+        def _execute(self, q):
+            if q._table == 'agent_settings' and self.errors:
+                raise self.errors.pop(0)
+            return super()._execute(q)
+
+    db = FlakyBackend()
+    db.errors = []
+    db.seed('agent_settings', [{'id': ai_sdr_agent.AGENT_SETTINGS_ID, 'settings_version': 4}])
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    agent = ai_sdr_agent.AISDRAgent()
+    try:
+        db.errors.append(BackendError('connection reset'))
+        assert agent._fetch_settings_version() is None
+        assert agent._fetch_settings_version() == 4
+
+        db.errors.append(BackendError('42703: column agent_settings.settings_version does not exist'))
+        assert agent._fetch_settings_version() is None
+        assert not agent._settings_version_column
+    finally:
+        agent.close()
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend import TABLES, InMemoryBackend
+from spans import DB_WRITE_SPAN, GMAIL_SEND_SPAN, LLM_SPAN, SpanHistograms
+
+
+def test_histogram_percentiles_and_report():
+    spans = SpanHistograms(bounds=(0.1, 1.0, 10.0))
+    for seconds in [0.05] * 90 + [0.5] * 8 + [3.0, 42.0]:
+        spans.record(LLM_SPAN, seconds)
+    spans.record(GMAIL_SEND_SPAN, 0.2)
+    assert spans.count(LLM_SPAN) == 100
+    assert spans.percentile(LLM_SPAN, 50) == 0.1
+    assert spans.percentile(LLM_SPAN, 95) == 1.0
+    # The open bucket reports the slowest sample, and bounds are capped at it
+    assert spans.percentile(LLM_SPAN, 100) == 42.0
+    assert spans.percentile(GMAIL_SEND_SPAN, 50) == 0.2
+    assert spans.percentile('missing', 50, default=0.0) == 0.0
+
+    summary = spans.summary()
+    assert list(summary) == [LLM_SPAN, GMAIL_SEND_SPAN]
+    assert summary[LLM_SPAN]['buckets'] == [90, 8, 1, 1]
+    assert summary[LLM_SPAN]['max'] == 42.0
+    lines = spans.report(run_seconds=100)
+    assert lines[1].split()[:2] == [LLM_SPAN, '100'] and '54%' in lines[1]
+    spans.reset()
+    assert spans.report() == []
+
+
+def test_span_and_timed_record_on_error():
+    spans = SpanHistograms()
+
+    @spans.timed(DB_WRITE_SPAN)
+    def write(fail):
+        if fail:
+            raise ValueError('boom')
+        return 'ok'
+
+    assert write(False) == 'ok'
+    with pytest.raises(ValueError):
+        write(True)
+    with pytest.raises(KeyError), spans.span(LLM_SPAN):
+        raise KeyError('x')
+    assert spans.count(DB_WRITE_SPAN) == 2 and spans.count(LLM_SPAN) == 1
+
+
+@pytest.mark.parametrize('migrated', [True, False])
+def test_run_report_writes_agent_metrics(monkeypatch, tmp_path, capsys, migrated):
+    import ai_sdr_agent
+
+    db = InMemoryBackend(tables=TABLES if migrated else [t for t in TABLES if t != 'agent_metrics'])
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    ai_sdr_agent.spans.reset()
+    resources = ai_sdr_agent.AgentResources()
+    try:
+        ai_sdr_agent.AISDRAgent._apply_outbox_op(
+            {'table': 'leads', 'action': 'insert', 'values': {'id': 'l1', 'website': 'brand.com'}}, False)
+        run_start = datetime.now(timezone.utc) - timedelta(minutes=5)
+        resources.report_spans(run_start, org_id='org1')
+        resources.report_spans(run_start, org_id='org1')
+    finally:
+        resources.close()
+        ai_sdr_agent.spans.reset()
+
+    out = capsys.readouterr().out
+    assert 'Where the time went' in out and DB_WRITE_SPAN in out
+    if migrated:
+        rows = db.tables['agent_metrics']
+        assert len(rows) == 2 and rows[0]['span'] == DB_WRITE_SPAN and rows[0]['count'] == 1
+        assert rows[0]['org_id'] == 'org1' and rows[0]['run_id'] == resources.leases.holder
+    else:
+        # One failed write, then print-only for the rest of the process
+        assert not resources.metrics_table and out.count('Could not write agent_metrics') == 1
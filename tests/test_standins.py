@@ -0,0 +1,122 @@
+import base64
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from backend import InMemoryBackend
+from standins import ApolloStandIn, ELVStandIn, GmailStandIn
+
+
+@pytest.fixture
+def gmail(monkeypatch):
+    import ai_sdr_agent
+
+    standin = GmailStandIn(address='sam@x.com', seed=1)
+    standin.start()
+    for name, value in standin.env().items():
+        monkeypatch.setattr(ai_sdr_agent, name, value)
+    monkeypatch.setattr(ai_sdr_agent, 'GMAIL_CREDENTIALS',
+                        json.dumps({'client_id': 'c', 'client_secret': 's', 'refresh_token': 'r'}))
+    monkeypatch.setattr(ai_sdr_agent, 'GMAIL_FROM_EMAIL', 'sam@x.com')
+    yield standin
+    standin.stop()
+
+
+def test_gmail_send_read_reply_and_bounce(gmail):
+    import ai_sdr_agent
+
+    service = ai_sdr_agent.GmailService()
+    start = service.history_id()
+    sent = service.send_email('pat@brand.com', 'Creator UGC', 'Hey Pat -')
+    headers = service.get_message_headers(sent['id'])
+    assert headers['threadId'] == sent['threadId'] and headers['Message-ID'].startswith('<')
+    assert gmail.sent()[0]['payload']['headers'][1] == {'name': 'To', 'value': 'pat@brand.com'}
+    assert not service.check_thread_for_replies(sent['threadId'], 'sam@x.com')
+
+    gmail.add_reply(sent['threadId'], 'Pat <pat@brand.com>')
+    gmail.add_bounce('gone@brand.com')
+    assert service.check_thread_for_replies(sent['threadId'], 'sam@x.com')
+    assert service.check_bounces() == ['gone@brand.com']
+    assert sent['threadId'] in service.history_threads(start)
+    assert gmail.calls['token'] == 1 and gmail.calls['messages.send'] == 1
+
+
+def test_gmail_refreshes_expired_token_and_injects_429(gmail):
+    import ai_sdr_agent
+
+    service = ai_sdr_agent.GmailService()
+    assert service.verify() == 'sam@x.com'
+    gmail.expire_tokens()
+    assert service.verify() == 'sam@x.com'
+    assert gmail.calls['token'] == 2
+
+    gmail.fail_next(1, 429)
+    with pytest.raises(urllib.error.HTTPError) as e:
+        service.verify()
+    assert e.value.code == 429 and e.value.headers['Retry-After'] == '1'
+    assert gmail.faults[429] == 1
+
+
+def test_gmail_reply_and_bounce_rates():
+    standin = GmailStandIn(seed=3, reply_rate=0.5, bounce_rate=0.5)
+    standin.start()
+    try:
+        token = json.loads(urllib.request.urlopen(urllib.request.Request(
+            f'{standin.url}/token', data=b'grant_type=refresh_token&refresh_token=r')).read())['access_token']
+        for n in range(10):
+            raw = f'To: p{n}@brand.com\r\nSubject: Hi\r\n\r\nHello'.encode()
+            req = urllib.request.Request(f'{standin.url}/gmail/v1/users/me/messages/send',
+                                         data=json.dumps({'raw': base64.urlsafe_b64encode(raw).decode()}).encode())
+            req.add_header('Authorization', f'Bearer {token}')
+            req.add_header('Content-Type', 'application/json')
+            urllib.request.urlopen(req).read()
+        inbound = [m for m in standin.messages.values() if 'INBOX' in m['labelIds']]
+        assert len(standin.sent()) == 10 and len(inbound) == 10
+    finally:
+        standin.stop()
+
+
+def test_verification_against_apollo_and_elv(monkeypatch):
+    import ai_sdr_agent
+
+    apollo = ApolloStandIn(statuses={'invalid': 1}, latency=0.01)
+    elv = ELVStandIn(statuses={'ok': 1}, error_rate=1.0)
+    apollo.start()
+    elv.start()
+    try:
+        monkeypatch.setattr(ai_sdr_agent, 'supabase', InMemoryBackend())
+        monkeypatch.setattr(ai_sdr_agent, 'APOLLO_API_KEY', 'k')
+        monkeypatch.setattr(ai_sdr_agent, 'ELV_API_KEY', 'k')
+        for name, value in {**apollo.env(), **elv.env()}.items():
+            monkeypatch.setattr(ai_sdr_agent, name, value)
+
+        result = ai_sdr_agent.verify_via_apollo('pat@brand.com', 'Pat', domain='brand.com')
+        assert (result['apollo_status'], result['action']) == ('invalid', 'discard')
+        # An ELV outage fails open, the same as a real network error
+        assert ai_sdr_agent.verify_email('pat@brand.com')['status'] == 'error'
+        elv.error_rate = 0.0
+        assert ai_sdr_agent.verify_email('pat@brand.com')['status'] == 'ok'
+        assert apollo.calls['people.match'] == 1 and elv.faults[500] == 1
+    finally:
+        apollo.stop()
+        elv.stop()
+
+
+def test_apollo_search_then_bulk_match_returns_emails():
+    apollo = ApolloStandIn(statuses={'verified': 1}, people_per_domain=4)
+    apollo.start()
+    try:
+        def post(path, body):
+            req = urllib.request.Request(f'{apollo.url}{path}', data=json.dumps(body).encode())
+            req.add_header('Content-Type', 'application/json')
+            return json.loads(urllib.request.urlopen(req).read())
+
+        people = post('/api/v1/mixed_people/api_search', {'q_organization_domains_list': ['brand.com']})['people']
+        assert len(people) == 4 and all(p['has_email'] for p in people)
+        matches = post('/api/v1/people/bulk_match', {'details': [{'id': p['id']} for p in people[:3]]})['matches']
+        assert [m['email'].endswith('@brand.com') for m in matches] == [True] * 3
+        assert post('/api/v1/people/bulk_match', {'details': [{'id': people[0]['id']}]})['matches'] == matches[:1]
+    finally:
+        apollo.stop()
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+AGENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'agent')
+
+PROBE = """
+import json, sys
+import ai_sdr_agent
+ai_sdr_agent.AISDRAgent.show_status = lambda self: None
+assert ai_sdr_agent.main(['status']) == 0
+print(json.dumps([name for name in ('supabase', 'anthropic', 'pytz') if name in sys.modules]))
+"""
+
+
+def test_agent_starts_without_credentials_or_sdk_imports(tmp_path):
+    env = {k: v for k, v in os.environ.items()
+           if k not in ('SUPABASE_URL', 'SUPABASE_SERVICE_KEY', 'ANTHROPIC_API_KEY', 'GMAIL_OAUTH_CREDENTIALS')}
+    env['SDR_CACHE_DIR'] = str(tmp_path)
+    out = subprocess.run([sys.executable, '-c', PROBE], cwd=str(tmp_path), env=dict(env, PYTHONPATH=AGENT_DIR),
+                         capture_output=True, text=True, check=True).stdout
+    assert json.loads(out.strip().splitlines()[-1]) == []
+
+
+def test_cli_dispatches_to_the_command(monkeypatch, tmp_path):
+    import ai_sdr_agent
+    from backend import InMemoryBackend
+
+    agents, calls = [], []
+
+    class Agent(ai_sdr_agent.AISDRAgent):
+        def __init__(self):
+            super().__init__()
+            agents.append(self)
+
+        def send_batch(self, count=10, **kwargs):
+            calls.append(('send_batch', count))
+
+        def check_replies(self, lookback_days=60):
+            calls.append(('check_replies', lookback_days))
+
+    db = InMemoryBackend()
+    db.seed('agent_settings', [{'id': ai_sdr_agent.AGENT_SETTINGS_ID, 'org_id': 'org1'}])
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, 'SDR_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    monkeypatch.setattr(ai_sdr_agent, 'install_sigterm_exit', lambda: None)
+    monkeypatch.setattr(ai_sdr_agent, 'AISDRAgent', Agent)
+    try:
+        assert ai_sdr_agent.main(['send-batch', '7']) == 0
+        assert ai_sdr_agent.main(['check-replies']) == 0
+        assert ai_sdr_agent.main([]) == 1 and ai_sdr_agent.main(['nope']) == 1
+        assert calls == [('send_batch', 7), ('check_replies', 60)]
+    finally:
+        for agent in agents:
+            agent.close()
@@ -0,0 +1,147 @@
+import pytest
+
+from suppression_index import BloomFilter, SuppressionIndex
+
+
+def _index(source, **kwargs):
+    calls = []
+
+    def lookup(emails):
+        calls.append(list(emails))
+        return [e for e in emails if e.lower() in source]
+
+    return SuppressionIndex(lookup, **kwargs), calls
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"user{i}@example.com" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_hits = sum(f"other{i}@example.com" in bloom for i in range(10_000))
+    assert false_hits < 300
+
+
+def test_bloom_negatives_skip_the_lookup():
+    index, calls = _index(set())
+    index.add_from_source('a@x.com')
+    assert 'b@x.com' not in index
+    assert calls == []
+
+
+def test_positive_hits_are_confirmed_in_one_lookup():
+    source = {'a@x.com', 'b@x.com'}
+    index, calls = _index(source)
+    for email in source:
+        index.add_from_source(email)
+    assert index.suppressed_among(['A@x.com', 'b@x.com', 'c@x.com']) == {'a@x.com', 'b@x.com'}
+    assert len(calls) == 1
+    assert 'A@x.com' in calls[0] and 'a@x.com' in calls[0]
+
+    # Results are cached, so repeating the check costs no lookup.
+    assert index.suppressed_among(['a@x.com']) == {'a@x.com'}
+    assert len(calls) == 1
+
+
+def test_false_positive_does_not_suppress():
+    index, _ = _index(set())
+    index.add_from_source('gone@x.com')  # in the filter, but not in the source any more
+    assert 'gone@x.com' not in index
+
+
+def test_run_local_additions_do_not_need_the_source():
+    index, calls = _index(set())
+    index.add('Skipped@X.com')
+    assert 'skipped@x.com' in index
+    assert calls == []
+
+
+def test_save_and_load_round_trip(tmp_path):
+    source = {f"user{i}@example.com" for i in range(200)}
+    index, _ = _index(source, capacity=1000)
+    for email in source:
+        index.add_from_source(email)
+    index.watermark = '2026-01-01T00:00:00+00:00'
+    path = tmp_path / 'emailed.bloom'
+    index.save(str(path))
+
+    loaded = SuppressionIndex.load(str(path), lambda emails: [e for e in emails if e in source])
+    assert loaded.watermark == index.watermark
+    assert len(loaded) == len(index)
+    assert loaded.suppressed_among(source) == source
+
+
+@pytest.mark.parametrize('deployed', [True, False])
+def test_agent_lookups_ignore_stored_casing(monkeypatch, tmp_path, deployed):
+    import ai_sdr_agent
+    from backend import InMemoryBackend
+
+    db = InMemoryBackend()
+    db.seed('agent_settings', [{'id': ai_sdr_agent.AGENT_SETTINGS_ID, 'org_id': 'org1'}])
+    db.seed('outreach_log', [{'contact_email': 'John@Acme.com'}, {'contact_email': 'jo_hn@acme.com'}])
+    db.seed('activity_log', [
+        {'org_id': 'org1', 'activity_type': 'email_bounced', 'bounced_email': 'Gone@Brand.COM'},
+        {'org_id': 'org2', 'activity_type': 'email_bounced', 'bounced_email': 'other@brand.com'},
+    ])
+    if deployed:
+        def emailed(backend, params):
+            wanted = {e.lower() for e in params['p_emails']}
+            return sorted({r['contact_email'].lower() for r in backend.tables['outreach_log']} & wanted)
+
+        def bounced(backend, params):
+            wanted = {e.lower() for e in params['p_emails']}
+            return [{'match_bounced_addresses': r['bounced_email'].lower()} for r in backend.tables['activity_log']
+                    if r['bounced_email'].lower() in wanted and r['org_id'] == params['p_org_id']]
+
+        db.register_rpc('match_emailed_addresses', emailed)
+        db.register_rpc('match_bounced_addresses', bounced)
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, '_MISSING_RPCS', set())
+    monkeypatch.setattr(ai_sdr_agent, 'SDR_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    agent = ai_sdr_agent.AISDRAgent()
+    try:
+        # Stored casing differs from both spellings the index passes in
+        assert agent._lookup_emailed(['john@acme.com', 'JOHN@ACME.com', 'joxhn@acme.com']) == {'john@acme.com'}
+        assert agent._lookup_bounced(['gone@brand.com', 'GONE@brand.com', 'other@brand.com']) == {'gone@brand.com'}
+        assert ('match_emailed_addresses' in ai_sdr_agent._MISSING_RPCS) != deployed
+    finally:
+        agent.close()
+
+
+@pytest.mark.parametrize('migrated', [True, False])
+def test_outreach_cache_picks_up_rows_written_late(monkeypatch, tmp_path, migrated):
+    from datetime import datetime, timedelta, timezone
+
+    import ai_sdr_agent
+    from backend import BackendError, InMemoryBackend
+
+    class Backend(InMemoryBackend):
+        def _execute(self, q):
+            if not migrated and q._table == 'outreach_log' and 'created_at' in q._columns:
+                raise BackendError('42703: column outreach_log.created_at does not exist')
+            return super()._execute(q)
+
+    now = datetime.now(timezone.utc)
+    db = Backend()
+    db.seed('agent_settings', [{'id': ai_sdr_agent.AGENT_SETTINGS_ID, 'org_id': 'org1'}])
+    db.seed('outreach_log', [{'contact_email': 'first@brand.com', 'website': 'brand.com', 'sent_at': now.isoformat()}])
+    monkeypatch.setattr(ai_sdr_agent, 'supabase', db)
+    monkeypatch.setattr(ai_sdr_agent, 'SDR_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ai_sdr_agent, 'OUTBOX_PATH', str(tmp_path / 'outbox.sqlite3'))
+    agent = ai_sdr_agent.AISDRAgent()
+    try:
+        emailed, _ = agent._get_outreach_state()
+        assert 'first@brand.com' in emailed
+        # Sent an hour ago, but only now replayed from another worker's outbox
+        db.table('outreach_log').insert({'contact_email': 'late@brand.com', 'website': 'shop.com',
+                                         'sent_at': (now - timedelta(hours=1)).isoformat()}).execute()
+        emailed, _ = agent._get_outreach_state()
+        if migrated:
+            assert 'late@brand.com' in emailed
+        else:
+            # Without the column the cache falls back to the sent_at watermark
+            assert agent._resources.outreach_state['watermark_column'] == 'sent_at'
+    finally:
+        agent.close()
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+from work_queue import (CONTACTED_LEAD, ENRICHED_LEAD, FOLLOWUP, WorkQueue,
+                        resolve_priorities)
+
+
+def _ts(day):
+    return datetime(2026, 1, day, tzinfo=timezone.utc)
+
+
+def test_items_drain_by_priority_then_due_time():
+    queue = WorkQueue()
+    queue.push(CONTACTED_LEAD, 'lead:c', {}, _ts(1))
+    queue.push(ENRICHED_LEAD, 'lead:e2', {}, _ts(3))
+    queue.push(ENRICHED_LEAD, 'lead:e1', {}, _ts(2))
+    queue.push(FOLLOWUP, 'followup:1', {}, _ts(5))
+    assert [item.key for item in queue.drain()] == ['followup:1', 'lead:e1', 'lead:e2', 'lead:c']
+
+
+def test_duplicate_keys_are_queued_once():
+    queue = WorkQueue()
+    assert queue.push(ENRICHED_LEAD, 'lead:1', {})
+    assert not queue.push(CONTACTED_LEAD, 'lead:1', {})
+    assert len(queue) == 1
+    assert queue.counts() == {ENRICHED_LEAD: 1}
+
+
+def test_settings_override_priorities():
+    priorities = resolve_priorities('{"followup": 10, "contacted_lead": "90", "bogus": "x"}')
+    queue = WorkQueue(priorities)
+    queue.push(FOLLOWUP, 'followup:1', {})
+    queue.push(CONTACTED_LEAD, 'lead:1', {})
+    assert queue.pop().kind == CONTACTED_LEAD
+    assert priorities[ENRICHED_LEAD] == 50